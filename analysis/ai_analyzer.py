@@ -1,13 +1,21 @@
 import json
-from openai import OpenAI, APIError, RateLimitError
 from config.settings import TradingConfig
+from utils.lazy import lazy_import
+from utils.deadline import remaining_timeout, time_allows, degrade
+from utils.circuit_breaker import CircuitOpenError, get_breaker
+from data.news_archive import get_default_archive
+from data.news_ranker import NewsRelevanceRanker
+
+openai = lazy_import("openai")
 
 class AIAnalyzer:
     """AI analysis class with improved error handling."""
     
     def __init__(self):
-        self.client = OpenAI(http_client=None) if TradingConfig.OPENAI_API_KEY else None
+        self.client = openai.OpenAI(http_client=None) if TradingConfig.OPENAI_API_KEY else None
+        self.breaker = get_breaker("openai")
         self.system_prompt = self._get_system_prompt()
+        self.news_ranker = NewsRelevanceRanker(archive=get_default_archive())
     
     def _get_system_prompt(self):
         """Generates the system prompt for the AI."""
@@ -51,11 +59,16 @@ Please provide the response in JSON format only:
         if not self.client:
             print("Skipping AI analysis because OpenAI API key is missing.")
             return None
+        if not time_allows(TradingConfig.AI_MIN_REMAINING):
+            degrade("ai_decision", "not enough cycle time left for the LLM call")
+            print("Skipping LLM call: cycle deadline is too close.")
+            return None
         
         try:
             analysis_data = self._prepare_analysis_data(market_data, investment_status, selected_coin_info)
             
-            response = self.client.chat.completions.create(
+            response = self.breaker.call(
+                self.client.chat.completions.create,
                 model="gpt-4-turbo",
                 messages=[
                     {"role": "system", "content": self.system_prompt},
@@ -63,13 +76,18 @@ Please provide the response in JSON format only:
                 ],
                 response_format={"type": "json_object"},
                 temperature=0.7,
-                max_tokens=1024
+                max_tokens=1024,
+                timeout=remaining_timeout(TradingConfig.OPENAI_TIMEOUT)
             )
             
             result = json.loads(response.choices[0].message.content)
             return self._validate_response(result)
             
-        except (APIError, RateLimitError) as e:
+        except CircuitOpenError as e:
+            degrade("ai_decision", f"OpenAI circuit open (retry in {e.retry_in:.0f}s)")
+            print("Skipping LLM call: OpenAI circuit is open.")
+        except (openai.APIError, openai.RateLimitError) as e:
+            degrade("ai_decision", f"OpenAI error: {e}")
             print(f"OpenAI API error: {e}")
         except json.JSONDecodeError as e:
             print(f"Error parsing AI response JSON: {e}")
@@ -84,27 +102,33 @@ Please provide the response in JSON format only:
             "investment_status": investment_status,
             "selected_coin": selected_coin_info
         }
-        news_headlines = self._extract_news_headlines(market_data)
+        coin_symbol = selected_coin_info.get("symbol") if selected_coin_info else None
+        news_headlines = self._extract_news_headlines(market_data, coin_symbol)
         if news_headlines:
             analysis_data["news_headlines"] = news_headlines
         return analysis_data
 
-    def _extract_news_headlines(self, market_data):
-        """Extracts and formats news headlines from market data."""
+    def _extract_news_headlines(self, market_data, coin_symbol=None):
+        """Extracts the news headlines most relevant to the coin, within the prompt token budget."""
         try:
             news_analysis = market_data.get('news_analysis')
             if not news_analysis or not news_analysis.get('news_items'):
                 return None
             
-            headlines = [
-                {
+            news_items = [item for item in news_analysis['news_items'] if item.get('title')]
+            headlines = self.news_ranker.select(
+                news_items,
+                coin_symbol=coin_symbol,
+                render=lambda item: {
                     "title": item.get('title', ''),
                     "source": item.get('source', ''),
                     "sentiment": item.get('sentiment', 'neutral'),
-                    "sentiment_score": item.get('sentiment_score', 0)
+                    "sentiment_score": item.get('sentiment_score', 0),
+                    "coverage": item.get('cluster_size', 1)
                 }
-                for item in news_analysis['news_items'][:10] if item.get('title')
-            ]
+            )
+            if not headlines:
+                return None
             
             return {
                 "headlines": headlines,
@@ -1,13 +1,18 @@
 # analysis/ai_master.py
 import json
-from openai import OpenAI, APIError, RateLimitError
 from config.settings import TradingConfig
+from utils.lazy import lazy_import
+from utils.deadline import remaining_timeout, time_allows, degrade
+from utils.circuit_breaker import CircuitOpenError, get_breaker
+
+openai = lazy_import("openai")
 
 class AIMasterAnalyzer:
     """AI master analyzer for making comprehensive trading decisions."""
     
     def __init__(self):
-        self.client = OpenAI(http_client=None) if TradingConfig.OPENAI_API_KEY else None
+        self.client = openai.OpenAI(http_client=None) if TradingConfig.OPENAI_API_KEY else None
+        self.breaker = get_breaker("openai")
         self.system_prompt = self._get_master_system_prompt()
     
     def _get_master_system_prompt(self):
@@ -83,7 +88,11 @@ Select the most promising coin:
     "risk_management": {
         "position_size": "Appropriate investment proportion (0.1-0.8)",
         "stop_loss": "Stop-loss criteria (%)",
-        "take_profit": "Take-profit criteria (%)"
+        "take_profit": "Take-profit criteria (%)",
+        "trailing_stop": "Trailing stop from the highest price since entry (%)"
+    },
+    "target_allocation": {
+        "KRW-XXX": "Optional. Target portfolio weight per coin (0-0.8, cash is the remainder). Only listed coins are rebalanced; use 0 to exit a coin. Omit to trade only the selected coin."
     }
 }'''
 
@@ -92,6 +101,10 @@ Select the most promising coin:
         if not self.client:
             print("Skipping AI Master analysis due to missing OpenAI API key.")
             return None
+        if not time_allows(TradingConfig.AI_MIN_REMAINING):
+            degrade("ai_decision", "not enough cycle time left for the LLM call")
+            print("Skipping LLM call: cycle deadline is too close.")
+            return None
         
         try:
             master_data = {
@@ -100,7 +113,8 @@ Select the most promising coin:
                 "investment_status": investment_status
             }
             
-            response = self.client.chat.completions.create(
+            response = self.breaker.call(
+                self.client.chat.completions.create,
                 model="gpt-4-turbo",
                 messages=[
                     {"role": "system", "content": self.system_prompt},
@@ -108,13 +122,18 @@ Select the most promising coin:
                 ],
                 response_format={"type": "json_object"},
                 temperature=0.7,
-                max_tokens=4096
+                max_tokens=4096,
+                timeout=remaining_timeout(TradingConfig.OPENAI_TIMEOUT)
             )
             
             result = json.loads(response.choices[0].message.content)
             return self._validate_master_response(result)
             
-        except (APIError, RateLimitError) as e:
+        except CircuitOpenError as e:
+            degrade("ai_decision", f"OpenAI circuit open (retry in {e.retry_in:.0f}s)")
+            print("Skipping LLM call in AI Master: OpenAI circuit is open.")
+        except (openai.APIError, openai.RateLimitError) as e:
+            degrade("ai_decision", f"OpenAI error: {e}")
             print(f"OpenAI API error in AI Master: {e}")
         except json.JSONDecodeError as e:
             print(f"Error parsing AI Master response JSON: {e}")
@@ -145,10 +164,16 @@ Select the most promising coin:
                 print(f"Invalid confidence in AI Master response: {recommendation.get('confidence')}")
                 return None
             
+            allocation = response.get("target_allocation")
+            if allocation is not None and not self._valid_allocation(allocation):
+                print(f"Ignoring invalid target_allocation in AI Master response: {allocation}")
+                response.pop("target_allocation")
+            
             response.setdefault("risk_management", {
                 "position_size": 0.3,
                 "stop_loss": 15,
-                "take_profit": 25
+                "take_profit": 25,
+                "trailing_stop": 10
             })
             
             return response
@@ -157,6 +182,20 @@ Select the most promising coin:
             print(f"Error validating AI Master response structure: {e}")
             return None
     
+    def _valid_allocation(self, allocation):
+        """Checks that target_allocation maps KRW markets to weights in [0, 1] summing to at most 1."""
+        if not isinstance(allocation, dict) or not allocation:
+            return False
+        try:
+            weights = [float(weight) for weight in allocation.values()]
+        except (TypeError, ValueError):
+            return False
+        return (
+            all(symbol.startswith("KRW-") for symbol in allocation) and
+            all(0 <= weight <= 1 for weight in weights) and
+            sum(weights) <= 1.0001
+        )
+    
     def get_fallback_decision(self, multi_coin_data, investment_status):
         """Provides a fallback decision if the AI analysis fails."""
         try:
@@ -187,7 +226,8 @@ Select the most promising coin:
                 "risk_management": {
                     "position_size": 0.1,
                     "stop_loss": 10,
-                    "take_profit": 15
+                    "take_profit": 15,
+                    "trailing_stop": 7
                 }
             }
         except Exception as e:
@@ -1,8 +1,10 @@
 # analysis/technical_analyzer.py
-import pyupbit
 from config.settings import TradingConfig
+from utils.lazy import lazy_import
 from data.fear_greed import FearGreedAnalyzer
 
+pyupbit = lazy_import("pyupbit")
+
 class TechnicalAnalyzer:
     """A class for performing technical analysis with improved error handling."""
     
@@ -1,22 +1,58 @@
 # config/settings.py
 import os
-from dotenv import load_dotenv
+import threading
+
+_env_lock = threading.Lock()
+_env_loaded = False
+
+
+def load_env():
+    """.env 파일을 환경변수로 로드 (처음 한 번만, import 시점이 아니라 처음 읽을 때)"""
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _env_lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _env_loaded = True
+
+
+class _EnvSetting:
+    """환경변수 설정값 (읽을 때마다 조회, 첫 조회 시 .env 로드)"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        load_env()
+        return os.getenv(self.name)
+
+
+class _DerivedSetting:
+    """다른 설정값으로 계산되는 설정값 (읽을 때 계산)"""
+
+    def __init__(self, func):
+        self.func = func
+
+    def __get__(self, instance, owner):
+        return self.func(owner)
 
-load_dotenv()
 
 class TradingConfig:
     """트레이딩 설정"""
     
-    # API 키
-    UPBIT_ACCESS_KEY = os.getenv("UPBIT_ACCESS_KEY")
-    UPBIT_SECRET_KEY = os.getenv("UPBIT_SECRET_KEY")
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-    SERPAPI_KEY = os.getenv("SERPAPI_KEY")  # 뉴스 분석용
+    # API 키 (.env는 처음 읽을 때 로드)
+    UPBIT_ACCESS_KEY = _EnvSetting("UPBIT_ACCESS_KEY")
+    UPBIT_SECRET_KEY = _EnvSetting("UPBIT_SECRET_KEY")
+    OPENAI_API_KEY = _EnvSetting("OPENAI_API_KEY")
+    SERPAPI_KEY = _EnvSetting("SERPAPI_KEY")  # 뉴스 분석용
     
     # 거래 설정
     TARGET_COIN = "AI_AUTO"  # AI가 자동으로 선택
     MIN_TRADE_AMOUNT = 5000  # 최소 거래 금액 (원)
     MIN_CONFIDENCE = 6  # 최소 신뢰도
+    TRADING_FEE_RATE = 0.0005  # 업비트 KRW 마켓 거래 수수료
     
     # AI 완전 자동화 설정
     AI_FULL_AUTO_MODE = True  # AI 완전 자동화 모드 활성화
@@ -39,10 +75,112 @@ class TradingConfig:
     DAILY_CANDLE_COUNT = 30
     HOURLY_CANDLE_COUNT = 24
     FNG_DATA_LIMIT = 7  # 공포탐욕지수 조회 일수
+    FNG_PUBLISH_GRACE = 300  # 발표 시각 이후 갱신까지 여유 시간 (초)
+    FNG_RETRY_INTERVAL = 600  # 조회 실패 시 재시도 간격 (초)
     
     # 시스템 설정
     TRADE_INTERVAL = 30  # 거래 주기 (초)
+    ANALYTICS_HISTORY_SIZE = 2880  # 포트폴리오 지표 이력 길이 (30초 주기 기준 24시간)
+    MAX_SINGLE_COIN_EXPOSURE = 0.8  # 단일 코인 최대 비중
+    
+    # 스케줄러 설정 (작업별 실행 주기, 초) - AI 사이클은 TRADE_INTERVAL
+    PRICE_REFRESH_INTERVAL = 5  # 전체 코인 시세 갱신
+    CANDLE_CHECK_INTERVAL = 60  # 캔들 마감 확인 (분 경계에 맞춰 실행)
+    CANDLE_CLOSE_GRACE = 5  # 캔들 마감 후 재조회까지 여유 시간
+    CANDLE_LIVE_TTL = 10  # 진행 중인 마지막 봉 재조회 주기 (마감된 봉은 캐시)
+    FNG_CHECK_INTERVAL = 3600  # 공포탐욕지수 갱신 확인 (발표는 하루 1회)
+    NEWS_REFRESH_INTERVAL = 600  # 뉴스 재수집 주기 (그 사이에는 마지막 분석 재사용)
+    AI_TRIGGER_PRICE_MOVE = 0.02  # 직전 AI 사이클 대비 이만큼 움직이면 AI 사이클 즉시 실행
+    AI_TRIGGER_MIN_GAP = 10  # 즉시 실행 사이 최소 간격
+    
+    # 파이프라인 설정 (수집/분석/결정/실행 단계를 겹쳐 실행)
+    PIPELINE_ENABLED = True  # 다음 사이클 수집을 현재 사이클 LLM 결정과 동시에 진행
+    PIPELINE_MAX_DECISION_AGE = 60  # 수집 후 이 시간(초)이 지난 결정은 실행하지 않음
+    PIPELINE_MAX_PRICE_DRIFT = 0.01  # 수집 시점 대비 선택 코인 가격 변동 허용 범위
+    PIPELINE_STOP_TIMEOUT = 5  # 종료 시 진행 중인 단계 대기 시간 (초)
+    
+    # 주문 사전 리스크 한도
+    RISK_LIMITS = {
+        "min_notional": MIN_TRADE_AMOUNT,  # 최소 주문 금액 (원)
+        "max_order_krw": 5_000_000,  # 1회 최대 주문 금액 (원)
+        "max_coin_exposure": MAX_SINGLE_COIN_EXPOSURE,  # 주문 후 단일 코인 최대 비중
+        "max_daily_turnover": 20_000_000  # 일일 최대 거래 금액 (원)
+    }
     REQUEST_TIMEOUT = 10  # API 요청 타임아웃 (초)
+    ACCOUNT_SNAPSHOT_MAX_AGE = 30  # 계좌 스냅샷 최대 유지 시간 (초)
+    LEDGER_RECONCILE_INTERVAL = 300  # 원장-거래소 잔고 대조 주기 (초)
+    
+    # 시세 조회 설정
+    VALUATION_DEADLINE = 3.0  # 보유 코인 평가 시세 조회 전체 마감 (초)
+    PRICE_HEDGE_DELAY = 0.3  # 응답 지연 시 헤지 요청을 추가로 보내는 간격 (초)
+    PRICE_MAX_ATTEMPTS = 3  # 마켓당 최대 요청 수
+    PRICE_STALE_MAX_AGE = 300  # 대체용 마지막 시세 최대 허용 나이 (초)
+    
+    # 사이클 시간 예산 (외부 호출은 남은 시간만큼만 대기, 부족하면 보강 데이터부터 생략)
+    CYCLE_DEADLINE = 60  # 수집~실행 전체 예산 (초)
+    DEADLINE_MIN_TIMEOUT = 1.0  # 마감이 임박해도 호출 1건에 주는 최소 타임아웃 (초)
+    COIN_DATA_TIMEOUT = 15  # 전체 코인 데이터 수집 최대 대기 (초)
+    NEWS_MIN_REMAINING = 30  # 남은 시간이 이보다 적으면 뉴스 수집 생략 (초)
+    OPENAI_TIMEOUT = 45  # LLM 호출 타임아웃 (초)
+    AI_MIN_REMAINING = 10  # 남은 시간이 이보다 적으면 LLM 대신 기본 결정 사용 (초)
+    
+    # 외부 API 서킷 브레이커 (장애 중인 출처는 타임아웃을 기다리지 않고 바로 캐시/기본값 사용)
+    CIRCUIT_WINDOW = 20  # 실패율/지연 비율 계산에 쓰는 최근 호출 수
+    CIRCUIT_MIN_CALLS = 5  # 차단 판단에 필요한 최소 호출 수
+    CIRCUIT_FAILURE_RATE = 0.5  # 이 비율 이상 실패하면 차단
+    CIRCUIT_SLOW_CALL_RATE = 0.5  # 이 비율 이상 지연되면 차단
+    CIRCUIT_OPEN_SECONDS = 60  # 차단 유지 시간 (초, 이후 시험 호출)
+    CIRCUIT_HALF_OPEN_CALLS = 1  # 차단 해제 전 성공해야 하는 시험 호출 수
+    CIRCUIT_OVERRIDES = {  # 엔드포인트별 설정 (slow_call_seconds: 지연 호출 기준 초)
+        "fear_greed": {"min_calls": 2, "slow_call_seconds": 5, "open_seconds": 600},
+        "serpapi": {"min_calls": 3, "slow_call_seconds": 8, "open_seconds": 300},
+        "openai": {"min_calls": 3, "slow_call_seconds": 30, "open_seconds": 120}
+    }
+    
+    # 주문 추적 설정
+    ORDER_POLL_INITIAL = 0.2  # 첫 체결 조회 간격 (초)
+    ORDER_POLL_BACKOFF = 1.5  # 조회 간격 증가 배수
+    ORDER_POLL_MAX = 2.0  # 최대 조회 간격 (초)
+    ORDER_CONFIRM_TIMEOUT = 5.0  # 주문 후 체결 확인 대기 시간 (초)
+    ORDER_TRACK_TIMEOUT = 600  # 주문 추적 최대 시간 (초)
+    ORDER_HISTORY_SIZE = 200  # 보관할 완료 주문 수
+    
+    # 분할 주문 실행 설정
+    EXECUTION_SLICE_THRESHOLD = 1_000_000  # 이 금액(원)을 넘는 주문은 분할 실행 (0이면 사용 안 함)
+    EXECUTION_ALGO = "depth"  # 분할 알고리즘: twap / pov / depth
+    EXECUTION_SLICE_INTERVAL = 10  # 자식 주문 간격 (초)
+    EXECUTION_MAX_DURATION = 300  # 분할 실행 최대 시간 (초)
+    EXECUTION_TWAP_SLICES = 5  # TWAP 분할 횟수
+    EXECUTION_PARTICIPATION_RATE = 0.1  # POV 참여율 (최근 1분 거래대금 대비)
+    EXECUTION_MAX_IMPACT_BPS = 20  # 호가 깊이 계산 시 허용 가격 충격 (bp)
+    EXECUTION_DEPTH_FRACTION = 0.3  # 허용 범위 호가 잔량 중 자식 주문 1건 최대 비율
+    
+    # 모의 거래소 설정 (--test 모드)
+    PAPER_INITIAL_KRW = 1_000_000  # 모의 거래소 초기 KRW 잔고
+    
+    # 보호 주문(손절/익절/트레일링 스탑) 감시 설정
+    PROTECTIVE_MONITOR_ENABLED = True  # AI 사이클과 별도로 보호 주문 감시
+    PROTECTIVE_POLL_INTERVAL = 1.0  # 보유 코인 시세 조회 간격 (초)
+    PROTECTIVE_EXIT_COOLDOWN = 30  # 청산 후 같은 코인 재발동 방지 시간 (초)
+    PROTECTIVE_DEFAULT_RULE = {"stop_loss": 15, "take_profit": 25, "trailing_stop": 10}  # AI 규칙이 없는 보유 코인 기준 (%)
+    
+    # 리밸런싱 설정 (AI가 target_allocation을 제시한 경우)
+    REBALANCE_ENABLED = True  # 목표 비중 리밸런싱 사용 여부
+    REBALANCE_DRIFT_THRESHOLD = 0.02  # 목표 비중과 차이가 총자산의 이 비율 미만이면 주문하지 않음
+    REBALANCE_MAX_CONCURRENCY = 4  # 동시에 제출할 최대 주문 수
+    REBALANCE_ORDERS_PER_SECOND = 8  # 초당 주문 요청 제한 (업비트 주문 API 기준)
+    REBALANCE_ORDER_TIMEOUT = 10  # 주문별 체결 확인 대기 시간 (초)
+    
+    # 다중 트레이더 실행 설정 (--supervisor)
+    SUPERVISOR_FEED_MAX_AGE = 15  # 공유 시세가 이보다 오래되면 직접 조회 (초)
+    SUPERVISOR_METRICS_INTERVAL = 30  # 트레이더 프로세스의 지표 보고 주기 (초)
+    SUPERVISOR_REPORT_INTERVAL = 60  # 집계 지표 출력 주기 (초)
+    SUPERVISOR_MAX_RESTARTS = 3  # 비정상 종료된 트레이더 재시작 최대 횟수
+    SUPERVISOR_STOP_TIMEOUT = 15  # 종료 시 트레이더 프로세스 대기 시간 (초)
+    
+    # 시작 시간 예산 (--startup-bench, 초과 시 종료 코드 1)
+    STARTUP_IMPORT_BUDGET_MS = 300  # 새 인터프리터에서 main import 시간
+    STARTUP_INIT_BUDGET_MS = 1000  # 컴포넌트 초기화 시간 (지연 import 제외)
     
     # 공포탐욕지수 임계값
     FNG_THRESHOLDS = {
@@ -53,9 +191,50 @@ class TradingConfig:
     }
     
     # 뉴스 분석 설정
-    NEWS_ANALYSIS_ENABLED = bool(SERPAPI_KEY)  # SerpAPI 키가 있을 때만 활성화
+    NEWS_ANALYSIS_ENABLED = _DerivedSetting(lambda cls: bool(cls.SERPAPI_KEY))  # SerpAPI 키가 있을 때만 활성화
     NEWS_WEIGHT = 0.3  # 뉴스 감성의 거래 결정 가중치 (0.0 ~ 1.0)
+    NEWS_PROMPT_TOKEN_BUDGET = 400  # LLM 프롬프트에 넣을 뉴스 헤드라인 토큰 예산
+    NEWS_PROMPT_MAX_ITEMS = 10  # 프롬프트에 넣을 최대 뉴스 수
+
+    # 로컬 저장소 설정 (logs 볼륨 아래에 두어 컨테이너 재시작 후에도 유지)
+    DATA_STORE_DIR = os.path.join("logs", "store")
+    NEWS_ARCHIVE_FILE = "news_archive.jsonl"
     
+    # 체크포인트 설정 (재시작 시 캐시/지표/보호 규칙/열린 주문 복원)
+    CHECKPOINT_ENABLED = True
+    CHECKPOINT_FILE = "checkpoint.json.gz"
+    CHECKPOINT_INTERVAL = 60  # 저장 주기 (초, 종료 시에도 저장)
+    CHECKPOINT_MAX_AGE = 6 * 3600  # 이보다 오래된 체크포인트는 복원하지 않음 (초)
+
+    # 로그 기록 설정 (매매 스레드 대신 백그라운드 스레드가 모아서 기록)
+    LOG_QUEUE_SIZE = 10000  # 기록 대기열 최대 길이
+    LOG_BATCH_SIZE = 500  # 한 번에 기록하는 최대 로그 수
+    LOG_FLUSH_INTERVAL = 0.5  # 배치가 차지 않아도 기록하는 주기 (초)
+    LOG_FSYNC_POLICY = "interval"  # none: OS에 맡김 / batch: 배치마다 / interval: LOG_FSYNC_INTERVAL마다
+    LOG_FSYNC_INTERVAL = 5.0  # interval 정책의 fsync 최소 간격 (초)
+    LOG_DEBUG_DROP_RATIO = 0.8  # 대기열이 이 비율 이상 차면 디버그 로그는 버림
+    LOG_PUT_TIMEOUT = 1.0  # 대기열이 가득 찼을 때 거래/에러 로그 대기 시간 (초, 초과 시 직접 기록)
+    LOG_CLOSE_TIMEOUT = 5.0  # 종료 시 남은 로그 기록 대기 시간 (초)
+
+    # 코인별 뉴스 언급 키워드 (소문자, 여러 단어는 구문 일치)
+    COIN_KEYWORDS = {
+        "KRW-BTC": ["bitcoin", "btc"],
+        "KRW-ETH": ["ethereum", "ether", "eth"],
+        "KRW-XRP": ["xrp", "ripple"],
+        "KRW-ADA": ["cardano", "ada"],
+        "KRW-SOL": ["solana"],
+        "KRW-DOGE": ["dogecoin", "doge"],
+        "KRW-AVAX": ["avalanche", "avax"],
+        "KRW-DOT": ["polkadot"],
+        "KRW-MATIC": ["polygon", "matic"],
+        "KRW-LINK": ["chainlink"],
+        "KRW-UNI": ["uniswap"],
+        "KRW-LTC": ["litecoin", "ltc"],
+        "KRW-BCH": ["bitcoin cash", "bch"],
+        "KRW-ATOM": ["cosmos", "atom"],
+        "KRW-NEAR": ["near protocol"]
+    }
+
     @classmethod
     def validate(cls):
         """설정 유효성 검사"""
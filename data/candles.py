@@ -0,0 +1,157 @@
+# data/candles.py
+import time
+import threading
+from config.settings import TradingConfig
+from utils.lazy import lazy_import
+
+pyupbit = lazy_import("pyupbit")
+pd = lazy_import("pandas")
+
+# pyupbit interval -> 캔들 길이 (초)
+INTERVAL_SECONDS = {
+    "minute1": 60,
+    "minute3": 180,
+    "minute5": 300,
+    "minute10": 600,
+    "minute15": 900,
+    "minute30": 1800,
+    "minute60": 3600,
+    "minute240": 14400,
+    "day": 86400,
+}
+
+
+def _frame_to_dict(df):
+    """OHLCV DataFrame → JSON 직렬화 가능한 dict"""
+    return {
+        "index": [ts.isoformat() for ts in df.index],
+        "index_name": df.index.name,
+        "columns": list(df.columns),
+        "data": df.values.tolist()
+    }
+
+
+def _frame_from_dict(data):
+    index = pd.DatetimeIndex(pd.to_datetime(data["index"]), name=data.get("index_name"))
+    return pd.DataFrame(data["data"], index=index, columns=data["columns"])
+
+
+def candle_close_time(interval, now=None):
+    """현재 진행 중인 캔들의 마감 시각 (epoch 초)
+
+    업비트 캔들은 UTC 기준으로 나뉜다 (일봉은 KST 09:00 = UTC 00:00 마감).
+    """
+    now = now or time.time()
+    length = INTERVAL_SECONDS[interval]
+    return (int(now) // length + 1) * length
+
+
+class CandleStore:
+    """마켓/봉 단위 OHLCV 캐시 - 캔들이 마감될 때만 전체를 다시 조회
+
+    같은 봉 구간 안에서는 마감된 봉을 캐시에서 돌려주고, 진행 중인 마지막
+    봉만 CANDLE_LIVE_TTL마다 1개씩 다시 받아 교체한다.
+    """
+
+    def __init__(self, market=None):
+        self.market = market or pyupbit
+        self._lock = threading.Lock()
+        self._frames = {}  # (ticker, interval) -> (df, count, valid_until, live_at)
+        self.fetch_count = 0
+        self.live_fetch_count = 0
+
+    def get(self, ticker, interval="day", count=200):
+        """OHLCV 조회 (캔들 마감 전이면 캐시 + 마지막 봉 갱신, 더 긴 count 요청이면 재조회)"""
+        key = (ticker, interval)
+        with self._lock:
+            entry = self._frames.get(key)
+        if entry is not None:
+            df, cached_count, valid_until, live_at = entry
+            now = time.time()
+            if cached_count >= count and now < valid_until:
+                if now - live_at >= TradingConfig.CANDLE_LIVE_TTL:
+                    df = self._refresh_live(key, entry)
+                return df.iloc[-count:] if len(df) > count else df
+        return self._fetch(ticker, interval, count)
+
+    def _fetch(self, ticker, interval, count):
+        df = self.market.get_ohlcv(ticker, count=count, interval=interval)
+        self.fetch_count += 1
+        if df is not None and len(df):
+            # 마감 직후 거래소 반영 지연을 감안해 약간 뒤까지 유효
+            valid_until = candle_close_time(interval) + TradingConfig.CANDLE_CLOSE_GRACE
+            with self._lock:
+                self._frames[(ticker, interval)] = (df, count, valid_until, time.time())
+        return df
+
+    def _refresh_live(self, key, entry):
+        """진행 중인 마지막 봉만 다시 조회해 교체 (실패하면 캐시 그대로)"""
+        ticker, interval = key
+        df, count, valid_until, _ = entry
+        try:
+            live = self.market.get_ohlcv(ticker, count=1, interval=interval)
+        except Exception as e:
+            print(f"[WARNING] 진행 중 캔들 갱신 실패 ({ticker} {interval}): {e}")
+            return df
+        self.live_fetch_count += 1
+        if live is None or not len(live):
+            return df
+        if live.index[-1] > df.index[-1]:
+            # 마감 여유 시간 중 새 봉이 시작됨 - 전체 재조회
+            refreshed = self._fetch(ticker, interval, count)
+            return refreshed if refreshed is not None and len(refreshed) else df
+        if live.index[-1] == df.index[-1]:
+            # 호출한 쪽이 들고 있는 DataFrame은 건드리지 않고 새로 만듦
+            df = pd.concat([df.iloc[:-1], live[df.columns]])
+        with self._lock:
+            self._frames[key] = (df, count, valid_until, time.time())
+        return df
+
+    def snapshot_state(self):
+        """체크포인트용 상태"""
+        with self._lock:
+            frames = list(self._frames.items())
+        return [
+            {"ticker": ticker, "interval": interval, "count": count, "valid_until": valid_until,
+             "frame": _frame_to_dict(df)}
+            for (ticker, interval), (df, count, valid_until, _) in frames
+        ]
+
+    def restore_state(self, state):
+        """체크포인트 복원 (마감 전 캔들은 재조회 없이 사용, 지난 캔들은 다음 조회 때 갱신)
+
+        진행 중인 마지막 봉은 저장 시점 값이므로 첫 조회 때 다시 받는다.
+        """
+        for entry in state:
+            key = (entry["ticker"], entry["interval"])
+            frame = _frame_from_dict(entry["frame"])
+            with self._lock:
+                self._frames.setdefault(key, (frame, entry["count"], entry["valid_until"], 0.0))
+
+    def refresh_closed(self):
+        """마감된 캔들이 있는 항목만 다시 조회 (스케줄러 작업, 갱신 수 반환)"""
+        now = time.time()
+        with self._lock:
+            expired = [(key, count) for key, (_, count, valid_until, _) in self._frames.items() if now >= valid_until]
+        refreshed = 0
+        for (ticker, interval), count in expired:
+            try:
+                if self._fetch(ticker, interval, count) is not None:
+                    refreshed += 1
+            except Exception as e:
+                print(f"[WARNING] 캔들 갱신 실패 ({ticker} {interval}): {e}")
+        return refreshed
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_candle_store():
+    """프로세스 공용 캔들 저장소"""
+    global _default_store
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = CandleStore()
+    return _default_store
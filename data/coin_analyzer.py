@@ -1,23 +1,41 @@
 # data/coin_analyzer.py
-import pyupbit
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
 from config.settings import TradingConfig
+from utils.lazy import lazy_import
 from data.news_analyzer import NewsAnalyzer
+from data.candles import get_default_candle_store
+from data.price_table import fetch_prices, get_price_table
+from utils.cycle_cache import cycle_cached, submit_in_context
+from utils.deadline import current_deadline, degrade
+
+pyupbit = lazy_import("pyupbit")
 
 class CoinAnalyzer:
     """A class for analyzing and selecting coins based on market data and news."""
 
-    def __init__(self, serpapi_key=None):
+    def __init__(self, serpapi_key=None, news_analyzer=None, candles=None, market=None, price_table=None):
         self.supported_coins = TradingConfig.SUPPORTED_COINS
-        self.news_analyzer = NewsAnalyzer(serpapi_key) if serpapi_key else None
+        if news_analyzer is None and serpapi_key:
+            news_analyzer = NewsAnalyzer(serpapi_key)
+        self.news_analyzer = news_analyzer
+        self.candles = candles or get_default_candle_store()
+        # Price source (pyupbit, the paper exchange or the supervisor's shared feed)
+        self.market = market or pyupbit
+        self.price_table = price_table or get_price_table()
 
     def get_comprehensive_coin_data(self):
         """Collects and analyzes data for all supported coins in parallel."""
         print(f"Analyzing {len(self.supported_coins)} coins...")
         analyzed_coins = {}
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_coin = {executor.submit(self.analyze_coin, coin): coin for coin in self.supported_coins}
-            for future in as_completed(future_to_coin):
+        deadline = current_deadline()
+        # Coins still loading when the cycle budget runs out are left out of this cycle
+        timeout = deadline.timeout(TradingConfig.COIN_DATA_TIMEOUT) if deadline else None
+        # One batch request fills the price table so each coin below reads its price from it
+        fetch_prices(self.supported_coins, market=self.market, table=self.price_table)
+        executor = ThreadPoolExecutor(max_workers=10)
+        try:
+            future_to_coin = {submit_in_context(executor, self.analyze_coin, coin): coin for coin in self.supported_coins}
+            for future in as_completed(future_to_coin, timeout=timeout):
                 coin_symbol = future_to_coin[future]
                 try:
                     data = future.result()
@@ -25,6 +43,11 @@ class CoinAnalyzer:
                         analyzed_coins[coin_symbol] = data
                 except Exception as e:
                     print(f"Error analyzing {coin_symbol}: {e}")
+        except FuturesTimeout:
+            missing = [coin for coin in self.supported_coins if coin not in analyzed_coins]
+            degrade("coin_data", f"{len(missing)} coins not analyzed in time: {', '.join(missing)}")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
         
         return {
             "coins_data": analyzed_coins,
@@ -33,14 +56,15 @@ class CoinAnalyzer:
             }
         }
 
+    @cycle_cached(key=lambda self, coin_symbol: coin_symbol)
     def analyze_coin(self, coin_symbol):
         """Analyzes a single coin, calculating performance metrics."""
         try:
-            df = pyupbit.get_ohlcv(coin_symbol, count=30, interval='day')
+            df = self.candles.get(coin_symbol, interval='day', count=30)
             if df is None or len(df) < 30:
                 return None
 
-            current_price = pyupbit.get_current_price(coin_symbol)
+            current_price = self._current_price(coin_symbol)
             if not current_price:
                 return None
 
@@ -69,6 +93,14 @@ class CoinAnalyzer:
             print(f"Failed to analyze {coin_symbol}: {e}")
             return None
 
+    def _current_price(self, coin_symbol):
+        """Reads the price from the shared price table, fetching it through the injected market if it is missing or old."""
+        price = self.price_table.get(coin_symbol, max_age=TradingConfig.PRICE_REFRESH_INTERVAL)
+        if price is None:
+            prices, _ = fetch_prices([coin_symbol], market=self.market, table=self.price_table)
+            price = prices.get(coin_symbol)
+        return price
+
     def _calculate_performance_score(self, price_1d, price_7d, volume_24h, avg_volume, volatility, symbol):
         """Calculates a weighted performance score for a coin."""
         score = 0
@@ -107,6 +139,7 @@ class CoinAnalyzer:
         best_coin = max(final_scores.items(), key=lambda x: x[1]['final_score'])
         return self._format_selection_result(best_coin, performance_analysis, trending_coins, final_scores)
 
+    @cycle_cached(key=lambda self: ())
     def get_trending_coins_from_news(self):
         """Extracts trending coins from news headlines."""
         if not self.news_analyzer:
@@ -1,6 +1,15 @@
 # data/fear_greed.py
-import requests
+import os
+import json
+import time
+import threading
 from config.settings import TradingConfig
+from utils.lazy import lazy_import
+from utils.cycle_cache import cycle_cached
+from utils.deadline import remaining_timeout
+from utils.circuit_breaker import CircuitOpenError, get_breaker
+
+requests = lazy_import("requests")
 
 class FearGreedIndexAPI:
     """공포탐욕지수 API 클래스"""
@@ -8,41 +17,177 @@ class FearGreedIndexAPI:
     def __init__(self):
         self.base_url = "https://api.alternative.me/fng/"
         self.timeout = TradingConfig.REQUEST_TIMEOUT
+        self.breaker = get_breaker("fear_greed")
     
     def get_data(self, limit=None):
-        """공포탐욕지수 데이터 수집"""
+        """공포탐욕지수 데이터 수집 (limit=0이면 전체 이력, 차단 중이면 바로 None - 저장소 이력으로 대체)"""
         try:
-            limit = limit or TradingConfig.FNG_DATA_LIMIT
-            url = f"{self.base_url}?limit={limit}"
-            
-            response = requests.get(url, timeout=self.timeout)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('metadata', {}).get('error') is None:
-                    return data
+            limit = TradingConfig.FNG_DATA_LIMIT if limit is None else limit
+            return self.breaker.call(self._fetch, limit)
             
-            print(f"공포탐욕지수 API 오류: {response.status_code}")
+        except CircuitOpenError as e:
+            print(f"공포탐욕지수 API 호출 생략: {e}")
             return None
-            
         except requests.exceptions.RequestException as e:
             print(f"공포탐욕지수 API 요청 오류: {e}")
             return None
         except Exception as e:
             print(f"공포탐욕지수 데이터 처리 오류: {e}")
             return None
+    
+    def _fetch(self, limit):
+        """API 1회 호출 (오류 응답은 예외로 올려 차단기에 실패로 기록)"""
+        url = f"{self.base_url}?limit={limit}"
+        response = requests.get(url, timeout=remaining_timeout(self.timeout))
+        response.raise_for_status()
+        data = response.json()
+        if data.get('metadata', {}).get('error') is not None:
+            raise ValueError(f"API 오류 응답: {data['metadata']['error']}")
+        return data
+
+class FearGreedStore:
+    """공포탐욕지수 일 단위 로컬 저장소
+
+    지수는 하루 한 번 발표되므로 전체 이력을 디스크에 보관하고, API가 알려주는
+    다음 발표 시각(time_until_update)이 지난 뒤에만 새로 조회한다.
+    """
+    
+    DAY_SECONDS = 86400
+    
+    def __init__(self, path=None, api=None):
+        self.path = path or os.path.join(TradingConfig.DATA_STORE_DIR, "fear_greed.json")
+        self.api = api or FearGreedIndexAPI()
+        self._lock = threading.Lock()
+        self._history = {}  # timestamp(int) -> API 항목
+        self.next_update_at = 0
+        self._load()
+    
+    def _load(self):
+        """디스크에서 이력 로드"""
+        try:
+            if not os.path.exists(self.path):
+                return
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            for item in stored.get("data", []):
+                self._history[int(item["timestamp"])] = item
+            self.next_update_at = stored.get("next_update_at", 0)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"공포탐욕지수 저장소 로드 오류: {e}")
+    
+    def _save(self):
+        """이력을 디스크에 저장 (임시 파일 후 교체)"""
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"next_update_at": self.next_update_at, "data": self._sorted_items()}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"공포탐욕지수 저장소 저장 오류: {e}")
+    
+    def _sorted_items(self):
+        """최신순 항목 리스트"""
+        return [self._history[ts] for ts in sorted(self._history, reverse=True)]
+    
+    def _merge(self, fng_data, now):
+        """API 응답을 이력에 병합하고 다음 갱신 시각 계산"""
+        items = fng_data.get("data") or []
+        for item in items:
+            entry = {k: v for k, v in item.items() if k != "time_until_update"}
+            self._history[int(item["timestamp"])] = entry
+        
+        time_until_update = items[0].get("time_until_update") if items else None
+        if time_until_update:
+            # 발표 직후 반영 지연을 고려해 여유 시간 추가
+            self.next_update_at = now + int(time_until_update) + TradingConfig.FNG_PUBLISH_GRACE
+        else:
+            next_day = (int(now) // self.DAY_SECONDS + 1) * self.DAY_SECONDS
+            self.next_update_at = next_day + TradingConfig.FNG_PUBLISH_GRACE
+    
+    def needs_refresh(self, limit, now=None):
+        now = now or time.time()
+        return now >= self.next_update_at or len(self._history) < limit
+    
+    def refresh(self, limit=None, now=None):
+        """누락된 일수만큼만 API에서 조회해 저장소 갱신"""
+        now = now or time.time()
+        limit = TradingConfig.FNG_DATA_LIMIT if limit is None else limit
+        
+        if self._history:
+            missing_days = int((now - max(self._history)) // self.DAY_SECONDS) + 1
+            fetch_limit = max(missing_days, 1) if len(self._history) >= limit else limit
+        else:
+            fetch_limit = limit
+        
+        fng_data = self.api.get_data(limit=fetch_limit)
+        if not fng_data or not fng_data.get("data"):
+            # 실패 시 잠시 후 재시도 (매 호출마다 API를 두드리지 않도록)
+            self.next_update_at = now + TradingConfig.FNG_RETRY_INTERVAL
+            return False
+        
+        self._merge(fng_data, now)
+        self._save()
+        return True
+    
+    def get_data(self, limit=None):
+        """FearGreedIndexAPI.get_data와 같은 형태로 최신 limit일 데이터 반환 (0이면 저장된 전체)"""
+        limit = TradingConfig.FNG_DATA_LIMIT if limit is None else limit
+        with self._lock:
+            if self.needs_refresh(limit):
+                self.refresh(limit)
+            
+            if not self._history:
+                return None
+            return {
+                "name": "Fear and Greed Index",
+                "data": self._sorted_items()[:limit] if limit else self._sorted_items(),
+                "metadata": {"error": None}
+            }
+    
+    def backfill(self):
+        """전체 이력을 한 번에 받아 저장 (백테스트용)"""
+        with self._lock:
+            fng_data = self.api.get_data(limit=0)
+            if not fng_data or not fng_data.get("data"):
+                return 0
+            self._merge(fng_data, time.time())
+            self._save()
+            return len(self._history)
+    
+    def get_history(self, start=None, end=None):
+        """기간 내 (timestamp, value) 리스트 (오래된 순)"""
+        return [
+            (ts, int(self._history[ts]["value"]))
+            for ts in sorted(self._history)
+            if (start is None or ts >= start) and (end is None or ts <= end)
+        ]
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+def get_default_store():
+    """프로세스 공용 공포탐욕지수 저장소"""
+    global _default_store
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = FearGreedStore()
+    return _default_store
 
 class FearGreedAnalyzer:
     """공포탐욕지수 분석 클래스"""
     
-    def __init__(self):
-        self.api = FearGreedIndexAPI()
+    def __init__(self, store=None):
+        self.store = store or get_default_store()
+        self.api = self.store.api
         self.thresholds = TradingConfig.FNG_THRESHOLDS
     
+    @cycle_cached(key=lambda self, fng_data=None: None if fng_data else ())
     def analyze_trend(self, fng_data=None):
         """공포탐욕지수 트렌드 분석"""
         if not fng_data:
-            fng_data = self.api.get_data()
+            fng_data = self.store.get_data()
         
         if not fng_data or not fng_data.get('data'):
             return None
@@ -1,23 +1,39 @@
 # data/market_data.py
-import pyupbit
 import time
 from config.settings import TradingConfig
+from utils.lazy import lazy_import
 from data.fear_greed import FearGreedAnalyzer
 from data.news_analyzer import NewsAnalyzer
+from data.candles import get_default_candle_store
+from utils.cycle_cache import cycle_cached
+
+pyupbit = lazy_import("pyupbit")
 
 class MarketDataCollector:
     """A class for collecting market data, with caching for current price."""
     
-    def __init__(self, target_coin=None):
+    def __init__(self, target_coin=None, fng_analyzer=None, news_analyzer=None, candles=None, market=None):
         self.target_coin = target_coin or TradingConfig.TARGET_COIN
         self.daily_count = TradingConfig.DAILY_CANDLE_COUNT
         self.hourly_count = TradingConfig.HOURLY_CANDLE_COUNT
-        self.fng_analyzer = FearGreedAnalyzer()
-        self.news_analyzer = NewsAnalyzer(TradingConfig.SERPAPI_KEY) if TradingConfig.NEWS_ANALYSIS_ENABLED else None
+        # Shared analyzers/stores are injected by the component container
+        self.fng_analyzer = fng_analyzer or FearGreedAnalyzer()
+        self.candles = candles or get_default_candle_store()
+        if news_analyzer is None and TradingConfig.NEWS_ANALYSIS_ENABLED:
+            news_analyzer = NewsAnalyzer(TradingConfig.SERPAPI_KEY)
+        self.news_analyzer = news_analyzer
+        # Price/orderbook source (pyupbit, the paper exchange or the supervisor's shared feed)
+        self.market = market or pyupbit
         
         # Cache for current price to avoid redundant API calls
         self._price_cache = {"price": None, "timestamp": 0}
 
+    def set_target_coin(self, target_coin):
+        """Switches the coin this collector reports on without rebuilding it."""
+        if target_coin != self.target_coin:
+            self.target_coin = target_coin
+            self._price_cache = {"price": None, "timestamp": 0}
+
     def get_current_price(self, coin_symbol=None, force_refresh=False):
         """Retrieves the current price, using a cache to avoid redundant API calls."""
         target = coin_symbol or self.target_coin
@@ -28,7 +44,7 @@ class MarketDataCollector:
             return self._price_cache["price"]
 
         try:
-            current_price = pyupbit.get_current_price(target)
+            current_price = self.market.get_current_price(target)
             if current_price:
                 # Update cache
                 self._price_cache["price"] = current_price
@@ -38,24 +54,17 @@ class MarketDataCollector:
             print(f"Error fetching current price: {e}")
             return self._price_cache["price"] # Return cached price on error if available
     
+    @cycle_cached(key=lambda self, coin_symbol=None: coin_symbol or self.target_coin)
     def get_ohlcv_data(self, coin_symbol=None):
         """OHLCV 데이터 수집"""
         try:
             target = coin_symbol or self.target_coin
             
-            # 일봉 데이터
-            daily_df = pyupbit.get_ohlcv(
-                target, 
-                count=self.daily_count, 
-                interval='day'
-            )
+            # 일봉 데이터 (캔들 마감 시에만 재조회)
+            daily_df = self.candles.get(target, interval='day', count=self.daily_count)
             
             # 시간봉 데이터  
-            hourly_df = pyupbit.get_ohlcv(
-                target, 
-                count=self.hourly_count, 
-                interval='minute60'
-            )
+            hourly_df = self.candles.get(target, interval='minute60', count=self.hourly_count)
             
             return {
                 "daily": daily_df,
@@ -70,20 +79,21 @@ class MarketDataCollector:
         """현재 가격 조회 (fallback method)"""
         try:
             target = coin_symbol or self.target_coin
-            price = pyupbit.get_current_price(target)
+            price = self.market.get_current_price(target)
             if price is None or price == 0:
                 time.sleep(1)
-                price = pyupbit.get_current_price(target)
+                price = self.market.get_current_price(target)
             return price
         except Exception as e:
             print(f"현재 가격 조회 오류: {e}")
             return None
     
+    @cycle_cached(key=lambda self, coin_symbol=None: coin_symbol or self.target_coin)
     def get_orderbook(self, coin_symbol=None):
         """호가 정보 조회"""
         try:
             target = coin_symbol or self.target_coin
-            return pyupbit.get_orderbook(ticker=target)
+            return self.market.get_orderbook(ticker=target)
         except Exception as e:
             print(f"호가 정보 조회 오류: {e}")
             return None
@@ -130,7 +140,7 @@ class MarketDataCollector:
         """간단한 가격 데이터 (백업용)"""
         try:
             df = pyupbit.get_ohlcv(self.target_coin, count=days, interval='day')
-            current_price = pyupbit.get_current_price(self.target_coin)
+            current_price = self.market.get_current_price(self.target_coin)
             
             return {
                 "df": df,
@@ -1,8 +1,17 @@
 # data/news_analyzer.py
 import re
-import requests
+import time
+import threading
 from datetime import datetime, timedelta
 from config.settings import TradingConfig
+from utils.lazy import lazy_import
+from data.news_archive import get_default_archive
+from data.news_dedup import NearDuplicateDetector
+from utils.cycle_cache import cycle_cached
+from utils.deadline import current_deadline, remaining_timeout, time_allows, degrade
+from utils.circuit_breaker import OPEN, CircuitOpenError, get_breaker
+
+requests = lazy_import("requests")
 
 class NewsAPI:
     """SerpAPI를 이용한 Google News 데이터 수집"""
@@ -11,6 +20,15 @@ class NewsAPI:
         self.api_key = api_key
         self.base_url = "https://serpapi.com/search"
         self.timeout = TradingConfig.REQUEST_TIMEOUT
+        self.breaker = get_breaker("serpapi")
+    
+    def _search(self, params):
+        """SerpAPI 1회 호출 (차단 중이면 CircuitOpenError, 오류 응답은 예외로 올려 실패로 기록)"""
+        def request():
+            response = requests.get(self.base_url, params=params, timeout=remaining_timeout(self.timeout))
+            response.raise_for_status()
+            return response.json()
+        return self.breaker.call(request)
     
     def get_bitcoin_news(self, limit=10):
         """비트코인 관련 최신 뉴스 수집"""
@@ -24,15 +42,12 @@ class NewsAPI:
                 "num": limit
             }
             
-            response = requests.get(self.base_url, params=params, timeout=self.timeout)
+            data = self._search(params)
+            return self._parse_news_results(data)
             
-            if response.status_code == 200:
-                data = response.json()
-                return self._parse_news_results(data)
-            else:
-                print(f"뉴스 API 오류: {response.status_code}")
-                return None
-                
+        except CircuitOpenError as e:
+            print(f"뉴스 API 호출 생략: {e}")
+            return None
         except requests.exceptions.RequestException as e:
             print(f"뉴스 API 요청 오류: {e}")
             return None
@@ -52,15 +67,12 @@ class NewsAPI:
                 "api_key": self.api_key
             }
             
-            response = requests.get(self.base_url, params=params, timeout=self.timeout)
+            data = self._search(params)
+            return self._parse_news_results(data)
             
-            if response.status_code == 200:
-                data = response.json()
-                return self._parse_news_results(data)
-            else:
-                print(f"비즈니스 뉴스 API 오류: {response.status_code}")
-                return None
-                
+        except CircuitOpenError as e:
+            print(f"비즈니스 뉴스 API 호출 생략: {e}")
+            return None
         except Exception as e:
             print(f"비즈니스 뉴스 수집 오류: {e}")
             return None
@@ -76,15 +88,12 @@ class NewsAPI:
                 "api_key": self.api_key
             }
             
-            response = requests.get(self.base_url, params=params, timeout=self.timeout)
+            data = self._search(params)
+            return self._parse_news_results(data)
             
-            if response.status_code == 200:
-                data = response.json()
-                return self._parse_news_results(data)
-            else:
-                print(f"기술 뉴스 API 오류: {response.status_code}")
-                return None
-                
+        except CircuitOpenError as e:
+            print(f"기술 뉴스 API 호출 생략: {e}")
+            return None
         except Exception as e:
             print(f"기술 뉴스 수집 오류: {e}")
             return None
@@ -140,12 +149,19 @@ class NewsAPI:
             print(f"뉴스 파싱 오류: {e}")
             return []
 
+# 프로세스 공용 종합 뉴스 분석 결과 (NEWS_REFRESH_INTERVAL 동안 재사용)
+_analysis_cache = {"result": None, "fetched_at": 0.0}
+_analysis_cache_lock = threading.Lock()  # 캐시 확인/교체에만 사용 (수집 중에는 잡지 않음)
+_analysis_in_flight = threading.Event()  # 수집은 한 번에 하나만
+
 class NewsAnalyzer:
     """뉴스 감성 분석 및 시장 영향도 분석"""
     
-    def __init__(self, serpapi_key=None):
+    def __init__(self, serpapi_key=None, archive=None):
         self.news_api = NewsAPI(serpapi_key) if serpapi_key else None
         self.sentiment_keywords = self._load_sentiment_keywords()
+        self.archive = archive if archive is not None else get_default_archive()
+        self.duplicate_detector = NearDuplicateDetector()
     
     def _load_sentiment_keywords(self):
         """감성 분석용 키워드 정의"""
@@ -192,6 +208,9 @@ class NewsAnalyzer:
                 }
                 analyzed_news.append(analyzed_item)
             
+            # 분석된 기사 보관 (백테스트/대시보드 조회용)
+            self._archive_news(analyzed_news)
+            
             # 전체 감성 점수 계산
             if sentiment_scores:
                 avg_sentiment = sum(sentiment_scores) / len(sentiment_scores)
@@ -216,6 +235,20 @@ class NewsAnalyzer:
             print(f"뉴스 감성 분석 오류: {e}")
             return None
     
+    def _archive_news(self, analyzed_news):
+        """분석된 뉴스를 로컬 보관소에 추가"""
+        try:
+            if self.archive is not None:
+                self.archive.add_articles(analyzed_news)
+        except Exception as e:
+            print(f"뉴스 보관 오류: {e}")
+    
+    def get_coin_sentiment(self, coin_symbol, window_hours=24):
+        """보관소 기준 코인별 기간 감성 조회 (SerpAPI 호출 없음)"""
+        if self.archive is None:
+            return None
+        return self.archive.coin_sentiment(coin_symbol, window_hours * 3600)
+    
     def _calculate_sentiment_score(self, text):
         """텍스트 감성 점수 계산"""
         try:
@@ -260,7 +293,8 @@ class NewsAnalyzer:
             
             for i, news_item in enumerate(analyzed_news):
                 # 최근 뉴스일수록 높은 가중치 (첫 번째부터 순서대로 감소)
-                weight = 1.0 / (i + 1)
+                # 유사 기사 군집은 대표 1건에 군집 크기 가중치만 반영
+                weight = news_item.get("cluster_weight", 1.0) / (i + 1)
                 weighted_score += news_item["sentiment_score"] * weight
                 total_weight += weight
             
@@ -283,12 +317,82 @@ class NewsAnalyzer:
         else:
             return {"signal": "neutral", "strength": "중립", "factor": 0}
     
-    def get_comprehensive_news_analysis(self):
-        """종합적인 뉴스 분석"""
+    @cycle_cached(key=lambda self, force_refresh=False: None if force_refresh else ())
+    def get_comprehensive_news_analysis(self, force_refresh=False):
+        """종합적인 뉴스 분석 (NEWS_REFRESH_INTERVAL 이내면 마지막 결과 재사용)"""
         if not self.news_api:
             print("SerpAPI 키가 설정되지 않았습니다.")
             return None
         
+        # 뉴스는 보강 데이터이므로 사이클 시간이 부족하면 가장 먼저 생략 (잠금 대기 전에 확인)
+        if not time_allows(TradingConfig.NEWS_MIN_REMAINING):
+            return self._degraded_result("남은 시간 부족으로 뉴스 수집 생략")
+        
+        # 캐시 잠금은 수집에 필요한 시간(NEWS_MIN_REMAINING)을 남기는 만큼만 대기
+        deadline = current_deadline()
+        wait = -1 if deadline is None else max(0.0, deadline.remaining() - TradingConfig.NEWS_MIN_REMAINING)
+        if not _analysis_cache_lock.acquire(timeout=wait):
+            return self._degraded_result("뉴스 캐시 잠금 대기 시간 초과")
+        try:
+            cached = _analysis_cache["result"]
+            age = time.time() - _analysis_cache["fetched_at"]
+            if not force_refresh and cached is not None and age < TradingConfig.NEWS_REFRESH_INTERVAL:
+                return cached
+            
+            stale = "이전 분석 사용" if cached is not None else "뉴스 없이 진행"
+            
+            # SerpAPI 장애로 차단 중이면 타임아웃을 기다리지 않고 마지막 결과 사용
+            if self.news_api.breaker.state == OPEN:
+                degrade("news", f"SerpAPI 차단 중 ({stale})")
+                return cached
+            
+            # 다른 스레드가 이미 수집 중이면 기다리지 않고 마지막 결과 사용
+            if _analysis_in_flight.is_set():
+                degrade("news", f"다른 스레드가 수집 중 ({stale})")
+                return cached
+            _analysis_in_flight.set()
+        finally:
+            _analysis_cache_lock.release()
+        
+        # SerpAPI 호출은 잠금 밖에서 (수집 중에도 다른 스레드는 캐시를 바로 읽음)
+        result = None
+        try:
+            result = self._collect_news_analysis()
+        finally:
+            with _analysis_cache_lock:
+                if result is not None:
+                    _analysis_cache["result"] = result
+                    _analysis_cache["fetched_at"] = time.time()
+                _analysis_in_flight.clear()
+        # 수집 실패 시 마지막 결과 사용
+        return result if result is not None else cached
+    
+    def _degraded_result(self, reason):
+        """수집을 생략할 때 마지막 결과 반환 (잠금 없이 읽음 - 값 교체는 참조 1개 대입)"""
+        cached = _analysis_cache["result"]
+        if cached is not None and time.time() - _analysis_cache["fetched_at"] < TradingConfig.NEWS_REFRESH_INTERVAL:
+            return cached
+        degrade("news", f"{reason} ({'이전 분석 사용' if cached is not None else '뉴스 없이 진행'})")
+        return cached
+    
+    def snapshot_state(self):
+        """체크포인트용 상태 (마지막 종합 분석과 수집 시각)"""
+        with _analysis_cache_lock:
+            return dict(_analysis_cache)
+
+    def restore_state(self, state):
+        """체크포인트 복원 - 재수집 주기 안이면 재시작 후 첫 사이클도 SerpAPI를 호출하지 않음"""
+        with _analysis_cache_lock:
+            if _analysis_cache["result"] is None and state.get("result") is not None:
+                _analysis_cache["result"] = state["result"]
+                _analysis_cache["fetched_at"] = state.get("fetched_at", 0.0)
+
+    def refresh_news(self):
+        """스케줄러용 뉴스 갱신"""
+        return self.get_comprehensive_news_analysis(force_refresh=True)
+    
+    def _collect_news_analysis(self):
+        """뉴스 수집 + 중복 제거 + 감성 분석"""
         try:
             # 다양한 카테고리 뉴스 수집
             bitcoin_news = self.news_api.get_bitcoin_news(limit=15)
@@ -307,14 +411,8 @@ class NewsAnalyzer:
             if not all_news:
                 return None
             
-            # 중복 제거 (제목 기준)
-            seen_titles = set()
-            unique_news = []
-            for news_item in all_news:
-                title = news_item.get("title", "")
-                if title and title not in seen_titles:
-                    seen_titles.add(title)
-                    unique_news.append(news_item)
+            # 유사 제목 중복 제거 (재배포 기사는 대표 1건 + cluster_size)
+            unique_news = self.duplicate_detector.collapse(all_news)
             
             # 감성 분석 실행
             analysis_result = self.analyze_news_sentiment(unique_news)
@@ -324,7 +422,8 @@ class NewsAnalyzer:
                     "bitcoin_news_count": len(bitcoin_news) if bitcoin_news else 0,
                     "business_news_count": len(business_news) if business_news else 0,
                     "tech_news_count": len(tech_news) if tech_news else 0,
-                    "total_collected": len(unique_news)
+                    "total_collected": len(unique_news),
+                    "duplicates_collapsed": len([n for n in all_news if n.get("title")]) - len(unique_news)
                 }
             
             return analysis_result
@@ -0,0 +1,232 @@
+# data/news_archive.py
+import os
+import re
+import json
+import time
+import bisect
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+from config.settings import TradingConfig
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset([
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "in", "is", "it", "its", "of", "on", "or", "that", "the", "this", "to", "was",
+    "were", "will", "with", "after", "over", "into", "new", "says", "said"
+])
+
+# SerpAPI google_news 날짜 형식 (예: "11/14/2024, 08:00 AM, +0000 UTC")
+_DATE_FORMATS = [
+    "%m/%d/%Y, %I:%M %p, %z UTC",
+    "%m/%d/%Y, %I:%M %p, %z",
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%d"
+]
+
+
+def tokenize(text):
+    """텍스트를 소문자 토큰 리스트로 분리 (불용어 제거)"""
+    if not text:
+        return []
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def article_id(news_item):
+    """링크(없으면 제목) 기준 기사 고유 ID"""
+    key = news_item.get("link") or news_item.get("title", "")
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def parse_news_date(date_str, default=None):
+    """뉴스 날짜 문자열을 epoch 초로 변환 (실패 시 default)"""
+    if date_str:
+        for fmt in _DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(date_str.strip(), fmt)
+                if parsed.tzinfo is None:
+                    parsed = parsed.replace(tzinfo=timezone.utc)
+                return parsed.timestamp()
+            except ValueError:
+                continue
+    return default
+
+
+def detect_coins(text, coin_keywords=None):
+    """텍스트에서 언급된 코인 심볼 목록 추출"""
+    coin_keywords = coin_keywords or TradingConfig.COIN_KEYWORDS
+    tokens = tokenize(text)
+    token_set = set(tokens)
+    joined = f" {' '.join(tokens)} "
+
+    coins = []
+    for symbol, keywords in coin_keywords.items():
+        for keyword in keywords:
+            if (" " in keyword and f" {keyword} " in joined) or keyword in token_set:
+                coins.append(symbol)
+                break
+    return coins
+
+
+class NewsArchive:
+    """append-only JSONL 뉴스 보관소와 용어/코인 역색인"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(TradingConfig.DATA_STORE_DIR, TradingConfig.NEWS_ARCHIVE_FILE)
+        self._lock = threading.Lock()
+        self._articles = {}       # id -> 기사 레코드
+        self._term_index = {}     # term -> set(id)
+        self._coin_index = {}     # coin -> ([published_at], [id]) 시간순 정렬
+        self._load()
+
+    def __len__(self):
+        return len(self._articles)
+
+    def __contains__(self, news_id):
+        return news_id in self._articles
+
+    def _load(self):
+        """기존 보관 파일을 한 줄씩 읽어 색인 재구성"""
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        self._index(json.loads(line))
+                    except (json.JSONDecodeError, KeyError):
+                        continue  # 손상된 줄은 건너뜀 (비정상 종료 시 마지막 줄)
+        except OSError as e:
+            print(f"뉴스 보관소 로드 오류: {e}")
+
+    def _index(self, record):
+        """레코드를 메모리 색인에 등록"""
+        news_id = record["id"]
+        if news_id in self._articles:
+            return False
+
+        self._articles[news_id] = record
+        for term in set(tokenize(f"{record.get('title', '')} {record.get('snippet', '')}")):
+            self._term_index.setdefault(term, set()).add(news_id)
+
+        published_at = record.get("published_at") or record.get("collected_at", 0)
+        for coin in record.get("coins", []):
+            timestamps, ids = self._coin_index.setdefault(coin, ([], []))
+            pos = bisect.bisect_right(timestamps, published_at)
+            timestamps.insert(pos, published_at)
+            ids.insert(pos, news_id)
+        return True
+
+    def add_articles(self, analyzed_news, collected_at=None):
+        """감성 분석된 뉴스 목록을 보관소에 추가 (신규 기사 수 반환)"""
+        if not analyzed_news:
+            return 0
+
+        collected_at = collected_at or time.time()
+        new_records = []
+
+        with self._lock:
+            for item in analyzed_news:
+                if not item.get("title"):
+                    continue
+                record = {
+                    "id": article_id(item),
+                    "title": item.get("title", ""),
+                    "snippet": item.get("snippet", ""),
+                    "source": item.get("source", ""),
+                    "link": item.get("link", ""),
+                    "type": item.get("type", ""),
+                    "published_at": parse_news_date(item.get("date"), default=collected_at),
+                    "collected_at": collected_at,
+                    "sentiment_score": item.get("sentiment_score", 0),
+                    "sentiment": item.get("sentiment", "neutral"),
+                    "coins": detect_coins(f"{item.get('title', '')} {item.get('snippet', '')}")
+                }
+                if self._index(record):
+                    new_records.append(record)
+
+            if new_records:
+                try:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        for record in new_records:
+                            f.write(json.dumps(record, ensure_ascii=True) + "\n")
+                except OSError as e:
+                    print(f"뉴스 보관소 저장 오류: {e}")
+
+        return len(new_records)
+
+    def get_article(self, news_id):
+        return self._articles.get(news_id)
+
+    def coin_articles(self, coin_symbol, window, now=None):
+        """코인의 최근 window(초 또는 timedelta) 내 기사 목록 (최신순)"""
+        if isinstance(window, timedelta):
+            window = window.total_seconds()
+        now = now or time.time()
+
+        # add_articles(백그라운드 뉴스 갱신)가 색인을 바꾸는 도중의 값을 읽지 않도록 잠금
+        with self._lock:
+            timestamps, ids = self._coin_index.get(coin_symbol, ([], []))
+            start = bisect.bisect_left(timestamps, now - window)
+            end = bisect.bisect_right(timestamps, now)
+            return [self._articles[news_id] for news_id in reversed(ids[start:end])]
+
+    def coin_sentiment(self, coin_symbol, window, now=None):
+        """코인의 기간 내 뉴스 감성 요약"""
+        articles = self.coin_articles(coin_symbol, window, now)
+        if not articles:
+            return None
+
+        scores = [a.get("sentiment_score", 0) for a in articles]
+        return {
+            "coin": coin_symbol,
+            "article_count": len(articles),
+            "average_sentiment": round(sum(scores) / len(scores), 3),
+            "positive_count": len([a for a in articles if a.get("sentiment") == "positive"]),
+            "negative_count": len([a for a in articles if a.get("sentiment") == "negative"]),
+            "latest_headline": articles[0].get("title", "")
+        }
+
+    def search(self, term, limit=20):
+        """용어(여러 단어는 AND)가 포함된 기사 목록 (최신순)"""
+        terms = tokenize(term)
+        if not terms:
+            return []
+
+        with self._lock:
+            postings = [self._term_index.get(t, set()) for t in terms]
+            postings.sort(key=len)
+            matched = set(postings[0])
+            for posting in postings[1:]:
+                matched &= posting
+                if not matched:
+                    return []
+            articles = [self._articles[news_id] for news_id in matched]
+
+        articles.sort(key=lambda a: a.get("published_at") or 0, reverse=True)
+        return articles[:limit]
+
+    def document_frequency(self, term):
+        """용어가 등장한 기사 수"""
+        with self._lock:
+            return len(self._term_index.get(term, ()))
+
+
+_default_archive = None
+_default_archive_lock = threading.Lock()
+
+
+def get_default_archive():
+    """프로세스 공용 뉴스 보관소 (최초 호출 시 파일에서 색인 로드)"""
+    global _default_archive
+    if _default_archive is None:
+        with _default_archive_lock:
+            if _default_archive is None:
+                _default_archive = NewsArchive()
+    return _default_archive
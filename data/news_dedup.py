@@ -0,0 +1,111 @@
+# data/news_dedup.py
+import math
+import random
+import hashlib
+from data.news_archive import tokenize
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _hash32(text):
+    """안정적인 32비트 해시 (프로세스 간 동일)"""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=4).digest(), "big")
+
+
+def shingles(text):
+    """단어 unigram + bigram 슁글 집합 (짧은 헤드라인용)"""
+    tokens = tokenize(text)
+    features = set(tokens)
+    features.update(f"{tokens[i]} {tokens[i + 1]}" for i in range(len(tokens) - 1))
+    return features
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateDetector:
+    """MinHash + LSH 밴드 버킷 기반 유사 기사 군집화
+
+    서명을 bands개 구간으로 나누어 버킷에 넣고, 같은 버킷에 들어온 후보끼리만
+    실제 Jaccard 유사도를 비교하므로 전체 비용은 기사 수에 거의 선형이다.
+    bands=16, rows=2 이면 유사도 약 0.25 이상부터 후보로 잡히고
+    threshold(기본 0.5) 이상만 같은 군집으로 묶인다.
+    """
+
+    def __init__(self, threshold=0.5, bands=16, rows=2, seed=1):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(bands * rows)
+        ]
+
+    def signature(self, features):
+        """MinHash 서명"""
+        hashes = [_hash32(f) for f in features]
+        if not hashes:
+            return None
+        return [
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._perms
+        ]
+
+    def cluster(self, news_items, text_key="title"):
+        """유사 기사 군집 목록 반환 (입력 순서 기준 인덱스 리스트)"""
+        parent = list(range(len(news_items)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        feature_sets = [shingles(item.get(text_key, "")) for item in news_items]
+        buckets = {}
+
+        for i, features in enumerate(feature_sets):
+            sig = self.signature(features)
+            if sig is None:
+                continue
+
+            candidates = set()
+            for band in range(self.bands):
+                key = (band, tuple(sig[band * self.rows:(band + 1) * self.rows]))
+                bucket = buckets.setdefault(key, [])
+                candidates.update(bucket)
+                bucket.append(i)
+
+            for j in candidates:
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j and jaccard(features, feature_sets[j]) >= self.threshold:
+                    # 먼저 나온 기사를 대표로 유지
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+
+        clusters = {}
+        for i in range(len(news_items)):
+            clusters.setdefault(find(i), []).append(i)
+        return sorted(clusters.values(), key=lambda members: members[0])
+
+    def collapse(self, news_items, text_key="title"):
+        """군집별 대표 기사 1개만 남기고 cluster_size/cluster_weight 부여"""
+        items = [item for item in news_items if item.get(text_key)]
+        collapsed = []
+
+        for members in self.cluster(items, text_key):
+            representative = dict(items[members[0]])
+            representative["cluster_size"] = len(members)
+            # 같은 기사 재배포 수는 로그 스케일로만 반영 (5건 -> 약 2.6배)
+            representative["cluster_weight"] = round(1 + math.log(len(members)), 3)
+            if len(members) > 1:
+                representative["duplicate_sources"] = [
+                    items[i].get("source", "") for i in members[1:]
+                ]
+            collapsed.append(representative)
+
+        return collapsed
@@ -0,0 +1,105 @@
+# data/news_ranker.py
+import math
+import json
+from config.settings import TradingConfig
+from data.news_archive import tokenize
+
+# 모든 코인 프로필에 공통으로 들어가는 시장 전반 키워드
+MARKET_TERMS = [
+    "crypto", "cryptocurrency", "blockchain", "bitcoin", "etf", "sec", "exchange",
+    "token", "stablecoin", "defi", "regulation", "halving", "mining", "fed",
+    "rate", "rates", "inflation", "upbit", "binance", "coinbase"
+]
+
+
+def estimate_tokens(obj):
+    """LLM 토큰 수 근사치 (JSON 직렬화 길이 / 4)"""
+    return math.ceil(len(json.dumps(obj, ensure_ascii=False)) / 4)
+
+
+class NewsRelevanceRanker:
+    """BM25 기반 코인별 뉴스 관련도 순위 (오프라인)
+
+    IDF는 뉴스 보관소의 문서 빈도를 우선 사용하고, 보관소가 작으면
+    현재 뉴스 묶음에서 계산한다.
+    """
+
+    def __init__(self, archive=None, k1=1.2, b=0.75, min_archive_docs=50):
+        self.archive = archive
+        self.k1 = k1
+        self.b = b
+        self.min_archive_docs = min_archive_docs
+
+    def query_profile(self, coin_symbol=None):
+        """코인별 질의 가중치 {term: weight}"""
+        profile = {term: 1.0 for term in MARKET_TERMS}
+        keywords = TradingConfig.COIN_KEYWORDS.get(coin_symbol, []) if coin_symbol else []
+        for keyword in keywords:
+            for term in tokenize(keyword):
+                profile[term] = 3.0
+        return profile
+
+    def _idf_source(self, docs):
+        """(문서 수, 문서 빈도 함수) 반환"""
+        if self.archive is not None and len(self.archive) >= self.min_archive_docs:
+            return len(self.archive), self.archive.document_frequency
+
+        df = {}
+        for tokens in docs:
+            for term in set(tokens):
+                df[term] = df.get(term, 0) + 1
+        return len(docs), lambda term: df.get(term, 0)
+
+    def score(self, news_items, coin_symbol=None):
+        """각 뉴스의 BM25 점수 리스트"""
+        docs = [tokenize(f"{item.get('title', '')} {item.get('snippet', '')}") for item in news_items]
+        if not docs:
+            return []
+
+        n_docs, doc_freq = self._idf_source(docs)
+        avg_len = sum(len(d) for d in docs) / len(docs) or 1
+        profile = self.query_profile(coin_symbol)
+
+        scores = []
+        for tokens in docs:
+            tf = {}
+            for term in tokens:
+                if term in profile:
+                    tf[term] = tf.get(term, 0) + 1
+
+            norm = self.k1 * (1 - self.b + self.b * len(tokens) / avg_len)
+            total = 0.0
+            for term, freq in tf.items():
+                df = doc_freq(term)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                total += profile[term] * idf * freq * (self.k1 + 1) / (freq + norm)
+            scores.append(total)
+        return scores
+
+    def select(self, news_items, coin_symbol=None, token_budget=None, max_items=None, render=None):
+        """관련도 상위 뉴스를 토큰 예산 안에서 선택 (관련도 0인 뉴스 제외)
+
+        render: 프롬프트에 실제로 들어갈 형태로 변환하는 함수 (예산 계산용)
+        """
+        token_budget = token_budget or TradingConfig.NEWS_PROMPT_TOKEN_BUDGET
+        max_items = max_items or TradingConfig.NEWS_PROMPT_MAX_ITEMS
+        render = render or (lambda item: item)
+
+        scores = self.score(news_items, coin_symbol)
+        ranked = sorted(
+            (pair for pair in zip(scores, range(len(news_items))) if pair[0] > 0),
+            key=lambda pair: (-pair[0], pair[1])
+        )
+
+        selected = []
+        used_tokens = 0
+        for relevance, index in ranked:
+            rendered = render(news_items[index])
+            cost = estimate_tokens(rendered)
+            if used_tokens + cost > token_budget:
+                continue
+            selected.append({**rendered, "relevance": round(relevance, 2)})
+            used_tokens += cost
+            if len(selected) >= max_items:
+                break
+        return selected
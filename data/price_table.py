@@ -0,0 +1,192 @@
+# data/price_table.py
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from config.settings import TradingConfig
+from utils.deadline import remaining_timeout
+from utils.lazy import lazy_import
+
+pyupbit = lazy_import("pyupbit")
+
+
+class PriceTable:
+    """마켓별 마지막 확인 시세 (스레드 안전)
+
+    subscribe()로 등록한 콜백은 시세가 들어올 때마다 갱신한 스레드에서 바로
+    호출되므로 가볍게 유지해야 한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._prices = {}  # ticker -> (price, timestamp)
+        self._listeners = []
+
+    def subscribe(self, callback):
+        """시세 갱신 구독: callback(ticker, price, timestamp)"""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def update(self, ticker, price, timestamp=None):
+        if price is None or price <= 0:
+            return
+        price, timestamp = float(price), timestamp or time.time()
+        with self._lock:
+            self._prices[ticker] = (price, timestamp)
+        for callback in self._listeners:
+            try:
+                callback(ticker, price, timestamp)
+            except Exception as e:
+                print(f"[WARNING] 시세 구독 처리 오류: {e}")
+
+    def update_many(self, prices, timestamp=None):
+        timestamp = timestamp or time.time()
+        for ticker, price in prices.items():
+            self.update(ticker, price, timestamp)
+
+    def get(self, ticker, max_age=None):
+        """시세 반환 (max_age 초보다 오래됐으면 None)"""
+        entry = self.get_entry(ticker)
+        if entry is None:
+            return None
+        price, timestamp = entry
+        if max_age is not None and time.time() - timestamp > max_age:
+            return None
+        return price
+
+    def get_entry(self, ticker):
+        with self._lock:
+            return self._prices.get(ticker)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._prices)
+
+    def restore_state(self, state):
+        """체크포인트 복원 (구독자에게 알리지 않고, 더 새 시세가 있으면 유지)"""
+        with self._lock:
+            for ticker, (price, timestamp) in state.items():
+                current = self._prices.get(ticker)
+                if current is None or current[1] < timestamp:
+                    self._prices[ticker] = (float(price), timestamp)
+
+
+_default_table = PriceTable()
+
+
+def get_price_table():
+    """프로세스 공용 시세 테이블"""
+    return _default_table
+
+
+def _valid(price):
+    return price is not None and price > 0
+
+
+def _batch_fetch(tickers, market):
+    """여러 마켓 시세 일괄 조회 ({ticker: price})"""
+    prices = market.get_current_price(tickers if len(tickers) > 1 else tickers[0])
+    if isinstance(prices, dict):
+        return prices
+    return {tickers[0]: prices}
+
+
+def fetch_prices(tickers, deadline=None, hedge_delay=None, max_attempts=None, table=None, market=None):
+    """시세 일괄 조회 + 실패 마켓만 병렬 헤지 재시도 + 오래된 시세 대체
+
+    전체 소요 시간은 deadline(초)을 넘지 않는다. 재시도는 응답이 hedge_delay
+    안에 오지 않으면 같은 마켓에 요청을 하나 더 띄우는 방식이며, 먼저 온
+    유효한 응답을 사용한다. 끝까지 실패한 마켓은 시세 테이블의 마지막 값
+    (PRICE_STALE_MAX_AGE 이내)을 쓰고 stale 목록에 표시한다.
+
+    market: get_current_price를 제공하는 시세 출처 (기본 pyupbit, 모의 거래소 등)
+
+    반환: (prices, stale_tickers)
+    """
+    deadline = deadline if deadline is not None else remaining_timeout(TradingConfig.VALUATION_DEADLINE)
+    hedge_delay = hedge_delay if hedge_delay is not None else TradingConfig.PRICE_HEDGE_DELAY
+    max_attempts = max_attempts or TradingConfig.PRICE_MAX_ATTEMPTS
+    table = table or _default_table
+    market = market or pyupbit
+
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return {}, []
+
+    started = time.monotonic()
+    end_at = started + deadline
+    prices = {}
+
+    try:
+        prices = {t: float(p) for t, p in _batch_fetch(tickers, market).items() if t in tickers and _valid(p)}
+    except Exception as e:
+        print(f"[WARNING] Batch price fetch failed: {e}")
+    table.update_many(prices)
+
+    failed = [t for t in tickers if t not in prices]
+    if failed and time.monotonic() < end_at:
+        prices.update(_hedged_fetch(failed, end_at, hedge_delay, max_attempts, table, market))
+
+    stale = []
+    for ticker in tickers:
+        if ticker in prices:
+            continue
+        cached = table.get(ticker, max_age=TradingConfig.PRICE_STALE_MAX_AGE)
+        if cached is not None:
+            prices[ticker] = cached
+            stale.append(ticker)
+
+    return prices, stale
+
+
+def _hedged_fetch(tickers, end_at, hedge_delay, max_attempts, table, market):
+    """실패 마켓 병렬 재시도 (마켓당 최대 max_attempts개 요청)"""
+    pool = ThreadPoolExecutor(max_workers=min(len(tickers) * max_attempts, 16))
+    results = {}
+    attempts = {t: 0 for t in tickers}
+    last_launch = {}
+    pending = {}  # future -> ticker
+
+    def launch(ticker):
+        attempts[ticker] += 1
+        last_launch[ticker] = time.monotonic()
+        pending[pool.submit(market.get_current_price, ticker)] = ticker
+
+    try:
+        for ticker in tickers:
+            launch(ticker)
+
+        while pending and time.monotonic() < end_at:
+            timeout = min(hedge_delay, max(0.0, end_at - time.monotonic()))
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                ticker = pending.pop(future)
+                if ticker in results:
+                    continue
+                try:
+                    price = future.result()
+                except Exception:
+                    price = None
+                if _valid(price):
+                    results[ticker] = float(price)
+                    table.update(ticker, price)
+
+            # 응답이 없거나 실패한 마켓은 헤지 요청 추가
+            now = time.monotonic()
+            for ticker in tickers:
+                if ticker in results or attempts[ticker] >= max_attempts:
+                    continue
+                in_flight = ticker in pending.values()
+                if not in_flight or now - last_launch[ticker] >= hedge_delay:
+                    launch(ticker)
+
+            for future in [f for f, t in pending.items() if t in results]:
+                pending.pop(future)
+    finally:
+        # 마감 이후 응답은 기다리지 않음
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return results
@@ -0,0 +1,121 @@
+# data/shared_feed.py
+import struct
+import time
+from multiprocessing import shared_memory
+from config.settings import TradingConfig
+from utils.lazy import lazy_import
+
+pyupbit = lazy_import("pyupbit")
+
+# 헤더: 쓰기 순번(홀수면 쓰는 중), 마지막 기록 시각 / 마켓 슬롯: 시세, 시각
+_HEADER = struct.Struct("<Qd")
+_SLOT = struct.Struct("<dd")
+
+
+class SharedPriceFeed:
+    """프로세스 간 공유 메모리 시세판 (기록 프로세스 1개, 읽기 프로세스 여러 개)
+
+    마켓 목록 순서대로 고정 크기 슬롯을 두고, 쓰기 순번(seqlock)으로 읽는
+    쪽이 쓰는 도중의 값을 읽지 않도록 한다. 읽기는 락 없이 메모리 복사만 한다.
+    """
+
+    def __init__(self, tickers, name=None, create=False):
+        self.tickers = list(tickers)
+        self._index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        size = _HEADER.size + _SLOT.size * len(self.tickers)
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self._owner = create
+        if create:
+            self.shm.buf[:size] = bytes(size)
+
+    @classmethod
+    def create(cls, tickers):
+        return cls(tickers, create=True)
+
+    @classmethod
+    def attach(cls, name, tickers):
+        return cls(tickers, name=name)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write(self, prices, timestamp=None):
+        """시세 기록 ({ticker: price}, 목록에 없는 마켓은 무시)"""
+        timestamp = timestamp or time.time()
+        buf = self.shm.buf
+        sequence, _ = _HEADER.unpack_from(buf, 0)
+        _HEADER.pack_into(buf, 0, sequence + 1, timestamp)
+        for ticker, price in prices.items():
+            index = self._index.get(ticker)
+            if index is not None and price:
+                _SLOT.pack_into(buf, _HEADER.size + index * _SLOT.size, float(price), timestamp)
+        _HEADER.pack_into(buf, 0, sequence + 2, timestamp)
+
+    def read(self, retries=100):
+        """{ticker: (price, timestamp)} (기록된 적 없는 마켓 제외)"""
+        buf = self.shm.buf
+        for _ in range(retries):
+            before, _ = _HEADER.unpack_from(buf, 0)
+            if before % 2:
+                time.sleep(0)
+                continue
+            data = bytes(buf[_HEADER.size:_HEADER.size + _SLOT.size * len(self.tickers)])
+            after, _ = _HEADER.unpack_from(buf, 0)
+            if before == after:
+                result = {}
+                for i, ticker in enumerate(self.tickers):
+                    price, timestamp = _SLOT.unpack_from(data, i * _SLOT.size)
+                    if price > 0:
+                        result[ticker] = (price, timestamp)
+                return result
+        return {}
+
+    @property
+    def updated_at(self):
+        return _HEADER.unpack_from(self.shm.buf, 0)[1]
+
+    def close(self):
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+class SharedFeedMarket:
+    """공유 시세판을 우선 쓰는 시세 출처 (pyupbit 대체)
+
+    get_current_price는 공유 시세가 SUPERVISOR_FEED_MAX_AGE 이내면 그대로
+    쓰고, 없거나 오래된 마켓만 직접 조회한다. 캔들/호가 등 나머지 조회는
+    fallback(기본 pyupbit)으로 넘긴다.
+    """
+
+    def __init__(self, feed, fallback=None, max_age=None):
+        self.feed = feed
+        self.fallback = fallback or pyupbit
+        self.max_age = max_age or TradingConfig.SUPERVISOR_FEED_MAX_AGE
+        self.hits = 0
+        self.misses = 0
+
+    def get_current_price(self, ticker):
+        tickers = [ticker] if isinstance(ticker, str) else list(ticker)
+        snapshot = self.feed.read()
+        now = time.time()
+        prices = {
+            t: snapshot[t][0] for t in tickers
+            if t in snapshot and now - snapshot[t][1] <= self.max_age
+        }
+        missing = [t for t in tickers if t not in prices]
+        self.hits += len(prices)
+        self.misses += len(missing)
+        if missing:
+            fetched = self.fallback.get_current_price(missing if len(missing) > 1 else missing[0])
+            if not isinstance(fetched, dict):
+                fetched = {missing[0]: fetched}
+            prices.update({t: p for t, p in fetched.items() if p})
+
+        if isinstance(ticker, str):
+            return prices.get(ticker)
+        return prices
+
+    def __getattr__(self, name):
+        return getattr(self.fallback, name)
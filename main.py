@@ -1,26 +1,65 @@
+import os
+import re
 import time
 import sys
-import pyupbit
+import subprocess
 from config.settings import TradingConfig
-from data.market_data import MarketDataCollector
-from data.coin_analyzer import CoinAnalyzer
+from utils.lazy import lazy_import
 from analysis.ai_master import AIMasterAnalyzer
 from analysis.ai_analyzer import AIAnalyzer
-from trading.portfolio import PortfolioManager
-from trading.executor import TradeExecutor
 from utils.logger import TradingLogger
+from utils.cycle_cache import CycleCache
+from utils.scheduler import Scheduler
+from utils.pipeline import Pipeline, Stage
+from utils.checkpoint import CheckpointManager
+from utils.deadline import Deadline
+from utils.circuit_breaker import breaker_states, open_breakers
+from data.fear_greed import get_default_store
+from data.price_table import fetch_prices, get_price_table
+from trading.components import ComponentContainer
+from trading.ledger import PositionLedger
+from trading.analytics import PortfolioAnalytics
+from trading.paper_exchange import PaperExchange
+
+pyupbit = lazy_import("pyupbit")
 
 class BaseTrader:
     """Base class for traders, handling common initialization and the main trading loop."""
     
-    def __init__(self):
-        """Initializes the trader, validates config, and sets up Upbit client and logger."""
+    def __init__(self, market=None, log_dir="logs"):
+        """Initializes the trader, validates config, and sets up Upbit client and logger.
+
+        market replaces pyupbit as the price source (e.g. the supervisor's shared price feed).
+        """
         TradingConfig.validate()
         self.upbit = pyupbit.Upbit(
             TradingConfig.UPBIT_ACCESS_KEY, 
             TradingConfig.UPBIT_SECRET_KEY
         )
-        self.logger = TradingLogger()
+        self.logger = TradingLogger(log_dir)
+        self.components = ComponentContainer(self.upbit, market or pyupbit, PositionLedger(), self.logger)
+        self._bind_components()
+
+    def _bind_components(self):
+        """Exposes the container's exchange-bound components as trader attributes."""
+        c = self.components
+        self.upbit = c.upbit
+        self.market = c.market
+        self.account = c.account
+        self.ledger = c.ledger
+        self.risk_engine = c.risk_engine
+        self.order_tracker = c.order_tracker
+        self.execution_engine = c.execution_engine
+        self.protective_monitor = c.protective_monitor
+        self.rebalancer = c.rebalancer
+
+    def use_paper_exchange(self, exchange=None):
+        """Routes balances, prices and orders to an in-process paper exchange."""
+        exchange = exchange or PaperExchange.live(TradingConfig.PAPER_INITIAL_KRW)
+        # Paper fills are not written to the real ledger file; data caches are kept
+        self.components.use_exchange(exchange, exchange, PositionLedger(os.devnull))
+        self._bind_components()
+        return exchange
 
     def run_continuous(self): #여기서 실행!
         """Runs the trading bot in a continuous loop."""
@@ -28,16 +67,79 @@ class BaseTrader:
         print(f"Starting Auto-Trading in {mode} mode.")
         print("Press Ctrl+C to stop.")
         
+        self.checkpoint = self._build_checkpoint() if TradingConfig.CHECKPOINT_ENABLED else None
+        if self.checkpoint is not None:
+            self.checkpoint.restore()
+        if TradingConfig.PROTECTIVE_MONITOR_ENABLED:
+            self.protective_monitor.start()
+        self.scheduler = self._build_scheduler()
         try:
-            while True:
-                self.run_single_cycle()
-                self.logger.print_session_footer(TradingConfig.TRADE_INTERVAL)
-                time.sleep(TradingConfig.TRADE_INTERVAL)
+            self.scheduler.run()
         except KeyboardInterrupt:
             self._handle_keyboard_interrupt()
         except Exception as e:
             self.logger.log_error(f"A critical error occurred in the main loop: {e}")
             print(f"A critical error occurred: {e}")
+        finally:
+            # Let an in-flight AI cycle finish its orders before saving state
+            if not self.scheduler.wait_idle("ai_cycle", TradingConfig.CYCLE_DEADLINE):
+                print("[WARNING] AI cycle still running at shutdown")
+            if self.checkpoint is not None:
+                self.checkpoint.save()
+
+    def _build_checkpoint(self):
+        """Registers the in-memory state that should survive a restart."""
+        checkpoint = CheckpointManager()
+        c = self.components
+        checkpoint.register("candles", c.candles.snapshot_state, c.candles.restore_state)
+        checkpoint.register("prices", c.price_table.snapshot, c.price_table.restore_state)
+        checkpoint.register("orders", self.order_tracker.snapshot_state, self.order_tracker.restore_state)
+        checkpoint.register("protective", self.protective_monitor.snapshot_state,
+                            self.protective_monitor.restore_state)
+        if c.news_analyzer is not None:
+            checkpoint.register("news", c.news_analyzer.snapshot_state, c.news_analyzer.restore_state)
+        return checkpoint
+
+    def _build_scheduler(self):
+        """Registers each data source at its own cadence, plus the AI cycle on its interval or on trigger."""
+        scheduler = Scheduler()
+        scheduler.add("prices", self._refresh_prices, TradingConfig.PRICE_REFRESH_INTERVAL, background=True)
+        scheduler.add("candles", self.components.candles.refresh_closed, TradingConfig.CANDLE_CHECK_INTERVAL,
+                      background=True, align=True, offset=TradingConfig.CANDLE_CLOSE_GRACE)
+        scheduler.add("fear_greed", self.components.fng_store.get_data, TradingConfig.FNG_CHECK_INTERVAL,
+                      background=True)
+        if self.components.news_analyzer is not None:
+            scheduler.add("news", self.components.news_analyzer.refresh_news, TradingConfig.NEWS_REFRESH_INTERVAL, background=True)
+        if getattr(self, "checkpoint", None) is not None:
+            scheduler.add("checkpoint", self.checkpoint.save, TradingConfig.CHECKPOINT_INTERVAL, background=True,
+                          run_immediately=False)
+        # Off the loop thread so a slow cycle doesn't hold up price refreshes or move triggers;
+        # the scheduler never starts a task that is still running, so cycles never overlap
+        scheduler.add("ai_cycle", self._scheduled_cycle, TradingConfig.TRADE_INTERVAL, policy="skip",
+                      background=True)
+        self._cycle_prices = {}
+        self._cycle_started_at = 0
+        return scheduler
+
+    def _scheduled_cycle(self):
+        """Runs one AI cycle and remembers the prices it saw, for move-based triggers."""
+        self._cycle_prices = {ticker: price for ticker, (price, _) in get_price_table().snapshot().items()}
+        self._cycle_started_at = time.monotonic()
+        self.run_cycle()
+        self.logger.print_session_footer(TradingConfig.TRADE_INTERVAL)
+
+    def _refresh_prices(self):
+        """Refreshes all supported coin prices and triggers an early AI cycle on a large move."""
+        prices, _ = fetch_prices(TradingConfig.SUPPORTED_COINS, market=self.market)
+        if time.monotonic() - self._cycle_started_at < TradingConfig.AI_TRIGGER_MIN_GAP:
+            return
+        for ticker, price in prices.items():
+            reference = self._cycle_prices.get(ticker)
+            if reference and abs(price / reference - 1) >= TradingConfig.AI_TRIGGER_PRICE_MOVE:
+                print(f"[INFO] {ticker} moved {price / reference - 1:+.2%} since the last cycle, running AI cycle now")
+                self._cycle_started_at = time.monotonic()
+                self.scheduler.trigger("ai_cycle")
+                return
 
     def _handle_keyboard_interrupt(self):
         """Handles graceful shutdown on keyboard interrupt."""
@@ -49,66 +151,234 @@ class BaseTrader:
             print(f"Successful Trades: {summary['successful_trades']}")
             print(f"Buys: {summary['buy_count']}, Sells: {summary['sell_count']}")
 
+    def run_cycle(self):
+        """Runs one cycle inside a cycle cache so repeated data calls are fetched once."""
+        self.account.invalidate()  # 사이클 시작 시 잔고 1회 재조회
+        with CycleCache() as cache, Deadline(TradingConfig.CYCLE_DEADLINE) as deadline:
+            self._reconcile_ledger()
+            result = self.run_single_cycle()
+        stats = cache.stats()
+        if stats["saved_calls"]:
+            print(f"[INFO] Cycle cache: {stats['executed']} calls executed, {stats['saved_calls']} saved")
+        self._report_deadline(deadline)
+        return result
+
+    def _report_deadline(self, deadline):
+        """Records the cycle's time use and circuit breaker states, and logs any stages that were skipped or cut short."""
+        self.last_cycle_budget = deadline.summary()
+        self.last_cycle_budget["circuits"] = breaker_states()
+        if deadline.degraded:
+            stages = "; ".join(f"{d['stage']}: {d['reason']}" for d in deadline.degraded)
+            self.logger.log_warning(f"Cycle degraded ({deadline.elapsed:.1f}s of {deadline.budget}s): {stages}")
+        tripped = open_breakers()
+        if tripped:
+            print(f"[INFO] Circuit open, using cached/fallback data: {', '.join(tripped)}")
+
+    def _reconcile_ledger(self):
+        """Periodically checks the local ledger against the balance snapshot."""
+        try:
+            adjusted = self.ledger.reconcile(self.account)
+            if adjusted:
+                self.logger.log_warning(f"Ledger reconciled with exchange balances: {', '.join(adjusted)}")
+        except Exception as e:
+            self.logger.log_warning(f"Ledger reconcile failed: {e}")
+
     def run_single_cycle(self):
         """Executes a single trading cycle. Must be implemented by subclasses."""
         raise NotImplementedError("run_single_cycle must be implemented by a subclass.")
 
     def run_test_mode(self):
-        """Runs a single cycle in test mode without executing trades."""
-        print("Running in test mode...")
-        self.run_single_cycle()
+        """Runs a single cycle in test mode against the paper exchange, so no real orders are placed."""
+        print(f"Running in test mode (paper exchange, {TradingConfig.PAPER_INITIAL_KRW:,.0f} KRW)...")
+        self.use_paper_exchange()
+        self.run_cycle()
 
 class AIFullAutoTrader(BaseTrader):
     """AI-powered trader that automatically selects coins and makes all trading decisions."""
 
-    def __init__(self):
-        super().__init__()
-        self.coin_analyzer = CoinAnalyzer(TradingConfig.SERPAPI_KEY)
+    def __init__(self, market=None, log_dir="logs"):
+        super().__init__(market, log_dir)
+        self.coin_analyzer = self.components.coin_analyzer
         self.ai_master = AIMasterAnalyzer()
+        self.analytics = PortfolioAnalytics()
+        self.pipeline = self._build_pipeline() if TradingConfig.PIPELINE_ENABLED else None
+        self._cycle_count = 0
+        self._last_execution_at = 0
+        self.last_decision = None
 
     def run_single_cycle(self): #이곳에서 실행!
         """Executes a single full-auto AI trading cycle."""
         try:
             self.logger.print_session_header()
-            print("AI Full-Auto Mode: Analyzing market...")
-
-            comprehensive_data = self.coin_analyzer.get_comprehensive_coin_data()
-            if not comprehensive_data:
-                self.logger.log_error("Failed to collect comprehensive market data.")
-                return False
-
-            self.coin_analyzer.print_market_summary(comprehensive_data)
-
-            portfolio_manager = PortfolioManager(self.upbit)
-            investment_status = self._get_comprehensive_investment_status(portfolio_manager)
-            if not investment_status:
-                self.logger.log_error("Failed to get comprehensive investment status.")
-                self.logger.log_debug("Investment status was None or empty.")
-                return False
-            self._print_investment_summary(investment_status)
+            context = self._collect_stage({"cycle": None, "pipelined": False})
+            context = context and self._analyze_stage(context)
+            context = context and self._decide_stage(context)
+            return bool(context) and self._execute_stage(context)
+        except Exception as e:
+            self.logger.log_error(f"Error in AI full auto cycle: {e}")
+            return False
 
-            print("\nAI Master is making a decision...")
-            ai_decision = self._get_ai_decision(comprehensive_data, investment_status)
-            if not ai_decision:
+    def _collect_stage(self, context):
+        """Collects market data for all coins and the portfolio status."""
+        print("AI Full-Auto Mode: Analyzing market...")
+        comprehensive_data = self.coin_analyzer.get_comprehensive_coin_data()
+        if not comprehensive_data:
+            self.logger.log_error("Failed to collect comprehensive market data.")
+            return None
+
+        self.coin_analyzer.print_market_summary(comprehensive_data)
+
+        portfolio_manager = self.components.portfolio
+        investment_status = self._get_comprehensive_investment_status(portfolio_manager)
+        if not investment_status:
+            self.logger.log_error("Failed to get comprehensive investment status.")
+            self.logger.log_debug("Investment status was None or empty.")
+            return None
+
+        context.update({
+            "collected_at": time.time(),
+            "comprehensive_data": comprehensive_data,
+            "investment_status": investment_status,
+            "portfolio_manager": portfolio_manager
+        })
+        return context
+
+    def _analyze_stage(self, context):
+        """Updates portfolio metrics and prints the portfolio summary."""
+        self._update_portfolio_metrics(context["investment_status"], context["comprehensive_data"])
+        self._print_investment_summary(context["investment_status"])
+        return context
+
+    def _decide_stage(self, context):
+        """Asks the AI Master for a decision on the collected data."""
+        print("\nAI Master is making a decision...")
+        # A pipelined decision may start late in its cycle's deadline (it waited behind the previous
+        # LLM call); if the LLM is skipped or fails there, drop the cycle rather than act on a fallback
+        pipelined = context.get("pipelined", False)
+        ai_decision = self._get_ai_decision(context["comprehensive_data"], context["investment_status"],
+                                            allow_fallback=not pipelined)
+        if not ai_decision:
+            if pipelined:
+                self.logger.log_warning(f"Dropping cycle {context['cycle']}: no AI decision within its deadline")
+            else:
                 self.logger.log_error("AI Master failed to make a decision.")
+            return None
+        self._print_ai_decision(ai_decision)
+        # Stop-loss/take-profit/trailing rules are enforced between cycles by the protective monitor;
+        # they apply to the selected coin only, other holdings keep PROTECTIVE_DEFAULT_RULE
+        symbol = ai_decision.get("selected_coin", {}).get("symbol")
+        if symbol:
+            self.protective_monitor.set_rules(ai_decision.get("risk_management"), market=symbol)
+        self.last_decision = {"decision": ai_decision, "decided_at": time.time(), "collected_at": context["collected_at"]}
+        context["ai_decision"] = ai_decision
+        return context
+
+    def _execute_stage(self, context):
+        """Executes the decision; pipelined decisions are re-validated against fresh data first."""
+        ai_decision = context["ai_decision"]
+        if context.get("pipelined"):
+            valid, reason = self._revalidate_decision(context)
+            if not valid:
+                self.logger.log_warning(f"Discarding cycle {context['cycle']} decision: {reason}")
+                self._log_ai_cycle(context["comprehensive_data"], context["investment_status"], ai_decision, False)
                 return False
-            self._print_ai_decision(ai_decision)
 
-            success = self._execute_ai_decision(ai_decision, portfolio_manager)
-            self._log_ai_cycle(comprehensive_data, investment_status, ai_decision, success)
-            return success
-        except Exception as e:
-            self.logger.log_error(f"Error in AI full auto cycle: {e}")
-            return False
+        success = self._execute_ai_decision(ai_decision, context["portfolio_manager"])
+        if ai_decision.get("recommendation", {}).get("action") != "hold" or ai_decision.get("target_allocation"):
+            self._last_execution_at = time.time()
+        self._log_ai_cycle(context["comprehensive_data"], context["investment_status"], ai_decision, success)
+        return success
+
+    def _revalidate_decision(self, context):
+        """Checks a pipelined decision against the freshest snapshot before acting on it."""
+        age = time.time() - context["collected_at"]
+        if age > TradingConfig.PIPELINE_MAX_DECISION_AGE:
+            return False, f"it is based on data {age:.0f}s old"
+        if self._last_execution_at > context["collected_at"]:
+            return False, "the portfolio changed after its data was collected"
+
+        symbol = context["ai_decision"].get("selected_coin", {}).get("symbol")
+        seen_price = context["comprehensive_data"]["coins_data"].get(symbol, {}).get("current_price")
+        self.account.invalidate()
+        prices, _ = fetch_prices([symbol], market=self.market)
+        current_price = prices.get(symbol)
+        if seen_price and current_price:
+            drift = current_price / seen_price - 1
+            if abs(drift) > TradingConfig.PIPELINE_MAX_PRICE_DRIFT:
+                return False, f"{symbol} moved {drift:+.2%} since collection"
+        return True, None
+
+    def _build_pipeline(self):
+        """Collect -> analyze -> decide -> execute, each stage on its own thread with a bounded queue."""
+        return Pipeline([
+            Stage("collect", self._pipeline_collect, maxsize=1, policy="drop_new"),
+            Stage("analyze", self._within_deadline(self._analyze_stage), maxsize=1, policy="block"),
+            # Only the freshest collected data waits for the LLM
+            Stage("decide", self._within_deadline(self._decide_stage), maxsize=1, policy="drop_oldest"),
+            Stage("execute", self._pipeline_execute, maxsize=1, policy="block")
+        ], name="cycle")
+
+    @staticmethod
+    def _within_deadline(stage):
+        """Runs a pipeline stage under the deadline its cycle started with."""
+        def run(context):
+            with context["deadline"]:
+                return stage(context)
+        return run
+
+    def _pipeline_collect(self, cycle):
+        self.logger.print_session_header()
+        self.account.invalidate()
+        deadline = Deadline(TradingConfig.CYCLE_DEADLINE)
+        with CycleCache(), deadline:
+            self._reconcile_ledger()
+            return self._collect_stage({"cycle": cycle, "pipelined": True, "deadline": deadline})
+
+    def _pipeline_execute(self, context):
+        with CycleCache(), context["deadline"]:
+            self._execute_stage(context)
+        self._report_deadline(context["deadline"])
+        return None
+
+    def _build_checkpoint(self):
+        """Adds the analytics history and the last AI decision to the checkpoint."""
+        checkpoint = super()._build_checkpoint()
+        checkpoint.register("analytics", self.analytics.snapshot_state, self.analytics.restore_state)
+        checkpoint.register("decision", self._decision_state, self._restore_decision_state)
+        return checkpoint
+
+    def _decision_state(self):
+        return {"last_decision": self.last_decision, "last_execution_at": self._last_execution_at}
+
+    def _restore_decision_state(self, state):
+        self.last_decision = self.last_decision or state.get("last_decision")
+        self._last_execution_at = max(self._last_execution_at, state.get("last_execution_at", 0))
+
+    def _scheduled_cycle(self):
+        """Feeds the pipeline when enabled; otherwise runs the cycle inline."""
+        if self.pipeline is None:
+            return super()._scheduled_cycle()
+        self.pipeline.start()
+        self._cycle_count += 1
+        if not self.pipeline.submit(self._cycle_count):
+            print("[INFO] Previous collection still queued, skipping this tick")
+            return
+        self._cycle_prices = {ticker: price for ticker, (price, _) in get_price_table().snapshot().items()}
+        self._cycle_started_at = time.monotonic()
 
-    def _get_ai_decision(self, comprehensive_data, investment_status):
-        """Gets a decision from the AI Master, with a fallback."""
+    def _handle_keyboard_interrupt(self):
+        if self.pipeline is not None:
+            self.pipeline.stop(timeout=TradingConfig.PIPELINE_STOP_TIMEOUT)
+        super()._handle_keyboard_interrupt()
+
+    def _get_ai_decision(self, comprehensive_data, investment_status, allow_fallback=True):
+        """Gets a decision from the AI Master, with a fallback unless allow_fallback is False."""
         ai_decision = self.ai_master.analyze_and_decide(
             comprehensive_data["coins_data"],
             investment_status,
             comprehensive_data["market_context"]
         )
-        if not ai_decision:
+        if not ai_decision and allow_fallback:
             print("AI analysis failed. Using fallback decision.")
             ai_decision = self.ai_master.get_fallback_decision(
                 comprehensive_data["coins_data"],
@@ -125,14 +395,41 @@ class AIFullAutoTrader(BaseTrader):
             print("Invalid AI decision structure.")
             return False
 
-        trade_executor = TradeExecutor(self.upbit, portfolio_manager, selected_coin)
+        target_allocation = ai_decision.get("target_allocation")
+        if target_allocation and TradingConfig.REBALANCE_ENABLED:
+            return self._rebalance_to(target_allocation, recommendation)
+
+        trade_executor = self.components.executor
+        trade_executor.set_target_coin(selected_coin)
         return trade_executor.execute_trade(recommendation, portfolio_manager.get_investment_status(selected_coin))
 
+    def _rebalance_to(self, target_allocation, recommendation):
+        """Moves the whole portfolio to the AI's target weights in this cycle."""
+        confidence = recommendation.get("confidence", 0)
+        if confidence < TradingConfig.MIN_CONFIDENCE:
+            print(f"Skipping rebalance due to low confidence ({confidence})")
+            return False
+        result = self.rebalancer.rebalance(target_allocation)
+        return result["success"]
+
     def _get_comprehensive_investment_status(self, portfolio_manager):
         """Gathers the investment status across all supported coins."""
         return portfolio_manager.get_comprehensive_investment_status()
 
 
+    def _update_portfolio_metrics(self, investment_status, comprehensive_data):
+        """Updates exposure/risk metrics and attaches a summary for the AI Master."""
+        try:
+            metrics = self.analytics.update(investment_status, comprehensive_data.get("coins_data"))
+            investment_status["portfolio_metrics"] = self.analytics.prompt_summary(metrics)
+            for symbol in metrics["limit_breaches"]:
+                self.logger.log_warning(
+                    f"{symbol} exposure {metrics['exposure'][symbol]:.0%} exceeds the "
+                    f"{TradingConfig.MAX_SINGLE_COIN_EXPOSURE:.0%} single-coin limit"
+                )
+        except Exception as e:
+            self.logger.log_warning(f"Portfolio metrics update failed: {e}")
+
     def _print_investment_summary(self, investment_status):
         """Prints a summary of the current investment portfolio."""
         # This method can be expanded from the original implementation
@@ -141,6 +438,10 @@ class AIFullAutoTrader(BaseTrader):
         print("="*50)
         print(f"KRW Balance: {investment_status['krw_balance']:.0f} KRW")
         print(f"Total Coin Value: {investment_status['total_coin_value']:.0f} KRW")
+        metrics = investment_status.get("portfolio_metrics")
+        if metrics:
+            print(f"Drawdown: {metrics['drawdown']:.2%} (max {metrics['max_drawdown']:.2%}), "
+                  f"Volatility: {metrics['volatility']:.2%}, Sharpe: {metrics['sharpe']}")
         #print(f"Total Assets: {investment_status['total_asset']:.0f} KRW")
 
 
@@ -176,6 +477,7 @@ class AIFullAutoTrader(BaseTrader):
         print(f"- Position Size: {risk_management.get('position_size')}")
         print(f"- Stop-Loss: {risk_management.get('stop_loss')}")
         print(f"- Take-Profit: {risk_management.get('take_profit')}")
+        print(f"- Trailing Stop: {risk_management.get('trailing_stop')}")
 
 
     def _log_ai_cycle(self, comprehensive_data, investment_status, ai_decision, success):
@@ -187,11 +489,11 @@ class AIFullAutoTrader(BaseTrader):
 class SingleCoinTrader(BaseTrader):
     """A trader that focuses on a single cryptocurrency, either fixed or auto-selected."""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, market=None, log_dir="logs"):
+        super().__init__(market, log_dir)
         self.current_coin = None
         self.last_coin_selection_time = 0
-        self.coin_analyzer = CoinAnalyzer(TradingConfig.SERPAPI_KEY) if TradingConfig.NEWS_ANALYSIS_ENABLED else None
+        self.coin_analyzer = self.components.coin_analyzer if TradingConfig.NEWS_ANALYSIS_ENABLED else None
         self.ai_analyzer = AIAnalyzer()
 
     def run_single_cycle(self):
@@ -202,9 +504,10 @@ class SingleCoinTrader(BaseTrader):
             selected_coin = self._select_trading_coin()
             print(f"Trading coin: {selected_coin.replace('KRW-', '')}")
 
-            market_collector = MarketDataCollector(selected_coin)
-            portfolio_manager = PortfolioManager(self.upbit, selected_coin)
-            trade_executor = TradeExecutor(self.upbit, portfolio_manager, selected_coin)
+            self.components.set_target_coin(selected_coin)
+            market_collector = self.components.market_collector
+            portfolio_manager = self.components.portfolio
+            trade_executor = self.components.executor
 
             investment_status = portfolio_manager.get_investment_status()
             if not investment_status:
@@ -232,6 +535,19 @@ class SingleCoinTrader(BaseTrader):
             self.logger.log_error(f"Error in single coin cycle: {e}")
             return False
 
+    def _build_checkpoint(self):
+        """Adds the current coin selection to the checkpoint."""
+        checkpoint = super()._build_checkpoint()
+        checkpoint.register("coin_selection", self._selection_state, self._restore_selection_state)
+        return checkpoint
+
+    def _selection_state(self):
+        return {"current_coin": self.current_coin, "last_coin_selection_time": self.last_coin_selection_time}
+
+    def _restore_selection_state(self, state):
+        self.current_coin = self.current_coin or state.get("current_coin")
+        self.last_coin_selection_time = max(self.last_coin_selection_time, state.get("last_coin_selection_time", 0))
+
     def _select_trading_coin(self):
         """Selects which coin to trade based on configuration or analysis."""
         if not TradingConfig.AUTO_SELECTION_ENABLED or TradingConfig.TARGET_COIN != "AI_AUTO":
@@ -251,9 +567,88 @@ class SingleCoinTrader(BaseTrader):
         coin_info = {"symbol": selected_coin, "name": selected_coin.replace('KRW-', '')}
         return self.ai_analyzer.get_recommendation(market_data, investment_status, coin_info)
 
+def backfill_fear_greed():
+    """Downloads the full Fear & Greed history into the local store (for backtests)."""
+    count = get_default_store().backfill()
+    if count:
+        print(f"Fear & Greed history stored: {count} days")
+    else:
+        print("Fear & Greed backfill failed.")
+
+PROJECT_PACKAGES = ("main", "config", "data", "analysis", "trading", "utils")
+HEAVY_MODULES = ("pyupbit", "pandas", "numpy", "openai", "requests")
+
+def measure_imports():
+    """Imports main in a fresh interpreter with -X importtime and returns {module: cumulative ms}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)", line)
+        if match:
+            times[match.group(2)] = int(match.group(1)) / 1000
+    return times
+
+def measure_initialization():
+    """Times component construction against the paper exchange (no network), including deferred imports."""
+    from config.settings import load_env
+    from trading.components import ComponentContainer
+    steps = [
+        ("config (.env)", load_env),
+        ("components (paper exchange)", lambda: ComponentContainer(
+            PaperExchange(TradingConfig.PAPER_INITIAL_KRW), PaperExchange, PositionLedger(os.devnull))),
+        ("AIMasterAnalyzer", AIMasterAnalyzer),
+        ("PortfolioAnalytics", PortfolioAnalytics),
+    ]
+    steps += [(f"import {name} (deferred)", lambda name=name: __import__(name)) for name in HEAVY_MODULES]
+    times = {}
+    for name, step in steps:
+        started = time.perf_counter()
+        step()
+        times[name] = (time.perf_counter() - started) * 1000
+    return times
+
+def run_startup_benchmark():
+    """Reports import and initialization time per module; returns 1 when over the startup budget."""
+    imports = measure_imports()
+    total_import = imports.get("main", 0.0)
+    print("=== Import time (cold, cumulative ms) ===")
+    project = {name: ms for name, ms in imports.items() if name.split(".")[0] in PROJECT_PACKAGES}
+    for name, ms in sorted(project.items(), key=lambda item: -item[1])[:15]:
+        print(f"{name:<40} {ms:>8.1f}")
+    eager = [name for name in HEAVY_MODULES if name in imports]
+    print(f"Heavy modules loaded eagerly: {', '.join(eager) if eager else 'none'}")
+
+    init = measure_initialization()
+    print("\n=== Initialization (ms) ===")
+    for name, ms in init.items():
+        print(f"{name:<40} {ms:>8.1f}")
+    total_init = sum(ms for name, ms in init.items() if not name.endswith("(deferred)"))
+
+    print(f"\nimport main: {total_import:.1f} ms (budget {TradingConfig.STARTUP_IMPORT_BUDGET_MS} ms)")
+    print(f"initialization: {total_init:.1f} ms (budget {TradingConfig.STARTUP_INIT_BUDGET_MS} ms)")
+    over = total_import > TradingConfig.STARTUP_IMPORT_BUDGET_MS or total_init > TradingConfig.STARTUP_INIT_BUDGET_MS
+    print("Startup budget exceeded." if over else "Startup within budget.")
+    return 1 if over else 0
+
 def main():
     """Main function to run the trading bot."""
     
+    if len(sys.argv) > 1 and sys.argv[1] == '--backfill-fng':
+        backfill_fear_greed()
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == '--startup-bench':
+        sys.exit(run_startup_benchmark())
+
+    if len(sys.argv) > 2 and sys.argv[1] == '--supervisor':
+        # Loaded only in this mode (multiprocessing/shared memory)
+        from trading.supervisor import run_supervisor
+        run_supervisor(sys.argv[2])
+        return
+
     if TradingConfig.AI_FULL_AUTO_MODE:
         trader = AIFullAutoTrader()
     else:
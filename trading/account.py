@@ -0,0 +1,112 @@
+# trading/account.py
+import time
+import threading
+from config.settings import TradingConfig
+
+
+def _to_currency(name):
+    """'KRW-BTC' 같은 마켓 코드를 통화 코드('BTC')로 변환"""
+    return name[4:] if name.startswith('KRW-') else name
+
+
+class AccountSnapshot:
+    """계좌 잔고 스냅샷
+
+    get_balances 한 번으로 모든 통화의 잔고/평균 매수가를 채우고, 주문 제출이나
+    체결로 invalidate()되기 전까지(또는 max_age 초과 전까지) 같은 값을 제공한다.
+    """
+
+    def __init__(self, upbit_client, max_age=None):
+        self.upbit = upbit_client
+        self.max_age = max_age if max_age is not None else TradingConfig.ACCOUNT_SNAPSHOT_MAX_AGE
+        self._lock = threading.RLock()
+        self._balances = None
+        self._by_currency = {}
+        self._pending_orders = {}
+        self._fetched_at = 0
+        self._stale = True
+        self.fetch_count = 0  # 비공개 API 호출 수 (모니터링용)
+
+    @property
+    def is_valid(self):
+        return (
+            self._balances is not None and not self._stale and
+            (time.time() - self._fetched_at) < self.max_age
+        )
+
+    def invalidate(self):
+        """다음 조회 시 새로 받아오도록 표시 (마지막 값은 peek()용으로 유지)"""
+        with self._lock:
+            self._stale = True
+            self._pending_orders = {}
+
+    def refresh(self):
+        """get_balances 1회 호출로 스냅샷 갱신"""
+        with self._lock:
+            balances = self.upbit.get_balances()
+            self.fetch_count += 1
+            if not isinstance(balances, list):
+                raise ValueError(f"잔고 조회 실패: {balances}")
+
+            self._balances = balances
+            self._by_currency = {b['currency']: b for b in balances}
+            self._pending_orders = {}
+            self._fetched_at = time.time()
+            self._stale = False
+            return balances
+
+    def _ensure(self):
+        with self._lock:
+            if not self.is_valid:
+                self.refresh()
+
+    @property
+    def balances(self):
+        """get_balances 원본 형태의 잔고 리스트"""
+        self._ensure()
+        return self._balances
+
+    @property
+    def fetched_at(self):
+        return self._fetched_at
+
+    def peek(self):
+        """API 호출 없이 마지막으로 받은 통화별 잔고 dict 반환 (없으면 None)"""
+        with self._lock:
+            return dict(self._by_currency) if self._balances is not None else None
+
+    def balance(self, currency):
+        """통화(또는 마켓) 잔고 (주문 가능 수량, 없으면 0)"""
+        self._ensure()
+        item = self._by_currency.get(_to_currency(currency))
+        return float(item['balance']) if item else 0.0
+
+    def locked(self, currency):
+        """주문에 묶인 수량"""
+        self._ensure()
+        item = self._by_currency.get(_to_currency(currency))
+        return float(item.get('locked', 0)) if item else 0.0
+
+    def avg_buy_price(self, currency):
+        """평균 매수가 (없으면 None)"""
+        self._ensure()
+        item = self._by_currency.get(_to_currency(currency))
+        return float(item.get('avg_buy_price', 0)) if item else None
+
+    def held_currencies(self):
+        """잔고가 있는 코인 통화 목록 (KRW 제외)"""
+        self._ensure()
+        return [
+            currency for currency, item in self._by_currency.items()
+            if currency != 'KRW' and float(item['balance']) > 0
+        ]
+
+    def pending_orders_count(self, market):
+        """미체결 주문 수 (스냅샷 당 마켓별 1회 조회)"""
+        with self._lock:
+            self._ensure()
+            if market not in self._pending_orders:
+                orders = self.upbit.get_order(market, state="wait")
+                self.fetch_count += 1
+                self._pending_orders[market] = len(orders) if isinstance(orders, list) else 0
+            return self._pending_orders[market]
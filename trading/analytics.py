@@ -0,0 +1,147 @@
+# trading/analytics.py
+import time
+from config.settings import TradingConfig
+from utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+class PortfolioAnalytics:
+    """포트폴리오 지표 계산 (numpy 벡터 연산)
+
+    보유 수량과 시세 이력을 고정 크기 링 버퍼 배열로 유지하므로 매 사이클
+    계산 비용은 보유 코인 수/이력 길이가 늘어나도 일정하다.
+    """
+
+    def __init__(self, symbols=None, capacity=None, sample_interval=None):
+        self.symbols = list(symbols or TradingConfig.SUPPORTED_COINS)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.capacity = capacity or TradingConfig.ANALYTICS_HISTORY_SIZE
+        self.sample_interval = sample_interval or TradingConfig.TRADE_INTERVAL
+
+        n = len(self.symbols)
+        self.holdings = np.zeros(n)
+        self.prices = np.full((self.capacity, n), np.nan)
+        self.equity = np.full(self.capacity, np.nan)
+        self.timestamps = np.zeros(self.capacity)
+        self._pos = 0
+        self._count = 0
+
+    def _ordered(self, buffer):
+        """링 버퍼를 오래된 순으로 정렬한 뷰"""
+        if self._count < self.capacity:
+            return buffer[:self._count]
+        order = (self._pos + np.arange(self.capacity)) % self.capacity
+        return buffer[order]
+
+    def snapshot_state(self):
+        """체크포인트용 상태 (이력은 오래된 순)"""
+        return {
+            "symbols": self.symbols,
+            "holdings": self.holdings.tolist(),
+            "prices": self._ordered(self.prices).tolist(),
+            "equity": self._ordered(self.equity).tolist(),
+            "timestamps": self._ordered(self.timestamps).tolist()
+        }
+
+    def restore_state(self, state):
+        """체크포인트 복원 (코인 목록이 바뀌었으면 복원하지 않음)"""
+        if state.get("symbols") != self.symbols:
+            print("포트폴리오 지표 이력: 코인 목록이 달라 복원하지 않음")
+            return
+        count = min(len(state["equity"]), self.capacity)
+        if count == 0:
+            return
+        self.holdings[:] = state["holdings"]
+        self.prices[:count] = np.array(state["prices"][-count:], dtype=float)
+        self.equity[:count] = state["equity"][-count:]
+        self.timestamps[:count] = state["timestamps"][-count:]
+        self._count = count
+        self._pos = count % self.capacity
+
+    def update(self, investment_status, coins_data=None, timestamp=None):
+        """사이클 상태 반영 후 지표 반환
+
+        investment_status: get_comprehensive_investment_status 결과
+        coins_data: CoinAnalyzer의 코인별 데이터 (보유하지 않은 코인 시세 포함)
+        """
+        price_row = np.full(len(self.symbols), np.nan)
+        for symbol, data in (coins_data or {}).items():
+            if symbol in self.index and data.get("current_price"):
+                price_row[self.index[symbol]] = data["current_price"]
+
+        self.holdings[:] = 0
+        for coin in investment_status.get("held_coins", []):
+            i = self.index.get(coin["symbol"])
+            if i is None:
+                continue
+            self.holdings[i] = coin["balance"]
+            price_row[i] = coin["current_price"]
+
+        cash = investment_status.get("krw_balance", 0)
+        valued = np.nan_to_num(self.holdings * price_row)
+
+        self.prices[self._pos] = price_row
+        self.equity[self._pos] = cash + valued.sum()
+        self.timestamps[self._pos] = timestamp or time.time()
+        self._pos = (self._pos + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+        return self.metrics(cash, valued)
+
+    def metrics(self, cash, valued):
+        """노출도/자산곡선/낙폭/변동성/샤프/상관관계 계산"""
+        equity = self._ordered(self.equity)
+        total = equity[-1] if len(equity) else cash
+        exposure = valued / total if total > 0 else np.zeros_like(valued)
+
+        result = {
+            "equity": float(total),
+            "cash_ratio": float(cash / total) if total > 0 else 1.0,
+            "exposure": {
+                self.symbols[i]: round(float(exposure[i]), 4) for i in np.flatnonzero(exposure > 0)
+            },
+            "samples": int(self._count)
+        }
+
+        # 낙폭
+        running_max = np.maximum.accumulate(equity)
+        drawdown = np.where(running_max > 0, equity / running_max - 1, 0.0)
+        result["drawdown"] = round(float(drawdown[-1]), 4) if len(drawdown) else 0.0
+        result["max_drawdown"] = round(float(drawdown.min()), 4) if len(drawdown) else 0.0
+
+        # 수익률 기반 지표
+        periods_per_year = 365 * 24 * 3600 / self.sample_interval
+        positive_equity = equity[equity > 0]
+        if len(positive_equity) >= 3:
+            returns = np.diff(np.log(positive_equity))
+            std = returns.std(ddof=1)
+            result["volatility"] = round(float(std * np.sqrt(periods_per_year)), 4)
+            result["sharpe"] = round(float(returns.mean() / std * np.sqrt(periods_per_year)), 3) if std > 0 else 0.0
+        else:
+            result["volatility"] = 0.0
+            result["sharpe"] = 0.0
+
+        # 코인 간 상관관계 (결측 없는 코인만)
+        prices = self._ordered(self.prices)
+        if len(prices) >= 3:
+            complete = ~np.isnan(prices).any(axis=0)
+            if complete.sum() >= 2:
+                coin_returns = np.diff(np.log(prices[:, complete]), axis=0)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    corr = np.corrcoef(coin_returns, rowvar=False)
+                result["correlation"] = {
+                    "symbols": [self.symbols[i] for i in np.flatnonzero(complete)],
+                    "matrix": np.round(np.nan_to_num(corr), 3).tolist()
+                }
+
+        # 단일 코인 비중 한도 점검 (마스터 프롬프트의 80% 제한)
+        limit = TradingConfig.MAX_SINGLE_COIN_EXPOSURE
+        result["limit_breaches"] = [
+            self.symbols[i] for i in np.flatnonzero(exposure > limit)
+        ]
+        return result
+
+    def prompt_summary(self, metrics):
+        """LLM 프롬프트용 요약 (상관관계 행렬 제외)"""
+        return {key: value for key, value in metrics.items() if key != "correlation"}
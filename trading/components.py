@@ -0,0 +1,103 @@
+# trading/components.py
+import threading
+from config.settings import TradingConfig
+from utils.lazy import lazy_import
+from utils.logger import TradingLogger
+from data.candles import get_default_candle_store
+from data.coin_analyzer import CoinAnalyzer
+from data.fear_greed import FearGreedAnalyzer, get_default_store
+from data.market_data import MarketDataCollector
+from data.news_analyzer import NewsAnalyzer
+from data.price_table import get_price_table
+from trading.account import AccountSnapshot
+from trading.execution_algos import ExecutionEngine
+from trading.executor import TradeExecutor
+from trading.ledger import PositionLedger
+from trading.orders import OrderTracker, connect_order_events
+from trading.portfolio import PortfolioManager
+from trading.protective_monitor import ProtectiveMonitor
+from trading.rebalancer import Rebalancer
+from trading.risk import PreTradeRiskEngine
+
+pyupbit = lazy_import("pyupbit")
+
+
+class ComponentContainer:
+    """트레이더가 쓰는 컴포넌트를 한 번만 만들어 사이클 간에 재사용
+
+    데이터 쪽(공포탐욕지수, 뉴스, 캔들, 코인 분석, 시장 데이터 수집기)은
+    거래소와 무관하므로 처음에 한 번만 만들고, 거래 쪽(잔고 스냅샷, 원장,
+    리스크 엔진, 주문 추적기, 실행 엔진, 포트폴리오/매매 실행기 등)은
+    거래소 클라이언트에 묶여 있어 use_exchange()로 교체할 때만 다시 만든다.
+    대상 코인이 바뀌면 set_target_coin()으로 기존 객체의 대상만 바꾼다.
+    """
+
+    def __init__(self, upbit_client, market=None, ledger=None, logger=None, target_coin=None):
+        self.logger = logger or TradingLogger()
+        self.target_coin = target_coin or TradingConfig.TARGET_COIN
+        if self.target_coin == "AI_AUTO":
+            self.target_coin = "KRW-BTC"
+
+        # 데이터 컴포넌트 (프로세스 공용 저장소 공유)
+        self.candles = get_default_candle_store()
+        self.price_table = get_price_table()
+        self.fng_store = get_default_store()
+        self.fng_analyzer = FearGreedAnalyzer(self.fng_store)
+        self.news_analyzer = NewsAnalyzer(TradingConfig.SERPAPI_KEY) if TradingConfig.NEWS_ANALYSIS_ENABLED else None
+        self.coin_analyzer = CoinAnalyzer(news_analyzer=self.news_analyzer, candles=self.candles,
+                                          price_table=self.price_table)
+        self.market_collector = MarketDataCollector(
+            self.target_coin, self.fng_analyzer, self.news_analyzer, self.candles
+        )
+
+        self._executors_lock = threading.Lock()
+        self.use_exchange(upbit_client, market, ledger)
+
+    def use_exchange(self, upbit_client, market=None, ledger=None):
+        """거래소 클라이언트에 묶인 컴포넌트를 (다시) 구성"""
+        self.upbit = upbit_client
+        self.market = market or pyupbit
+        # 데이터 컴포넌트는 그대로 두고 시세 출처만 교체
+        self.coin_analyzer.market = self.market
+        self.market_collector.market = self.market
+        self.ledger = ledger if ledger is not None else PositionLedger()
+        self.account = AccountSnapshot(upbit_client)
+        self.risk_engine = PreTradeRiskEngine(self.account, ledger=self.ledger)
+        self.order_tracker = OrderTracker(upbit_client)
+        connect_order_events(self.order_tracker, self.account, self.ledger)
+        self.execution_engine = ExecutionEngine(upbit_client, self.order_tracker, self.ledger, self.market)
+
+        self.portfolio = self._build_portfolio(self.target_coin)
+        self.executor = self._build_executor(self.portfolio, self.target_coin)
+        with self._executors_lock:
+            self._executors = {}
+
+        self.protective_monitor = ProtectiveMonitor(
+            self.account, self.executor_for, self.ledger, self.price_table, self.market
+        )
+        self.rebalancer = Rebalancer(
+            upbit_client, self.account, self.order_tracker, self.risk_engine, self.ledger, self.market
+        )
+
+    def _build_portfolio(self, coin):
+        return PortfolioManager(self.upbit, coin, account=self.account, ledger=self.ledger,
+                                market=self.market, logger=self.logger)
+
+    def _build_executor(self, portfolio, coin):
+        return TradeExecutor(self.upbit, portfolio, coin, self.risk_engine, self.order_tracker,
+                             self.execution_engine)
+
+    def set_target_coin(self, coin):
+        """메인 사이클의 대상 코인 변경 (수집기/포트폴리오/실행기 재생성 없음)"""
+        self.target_coin = coin
+        self.market_collector.set_target_coin(coin)
+        self.executor.set_target_coin(coin)
+
+    def executor_for(self, coin):
+        """코인 고정 매매 실행기 (보호 주문 등 메인 사이클 밖의 스레드용, 코인별 1회 생성)"""
+        with self._executors_lock:
+            executor = self._executors.get(coin)
+            if executor is None:
+                executor = self._build_executor(self._build_portfolio(coin), coin)
+                self._executors[coin] = executor
+            return executor
@@ -0,0 +1,336 @@
+# trading/execution_algos.py
+import time
+import threading
+from config.settings import TradingConfig
+from utils.lazy import lazy_import
+from data.price_table import get_price_table
+
+pyupbit = lazy_import("pyupbit")
+
+ALGORITHMS = ("twap", "pov", "depth")
+
+
+def orderbook_units(orderbook):
+    """pyupbit.get_orderbook 응답에서 호가 단위 목록 추출
+
+    pyupbit 버전에 따라 단일 티커 조회 결과가 dict 또는 [dict]로 온다.
+    """
+    if isinstance(orderbook, list):
+        orderbook = orderbook[0] if orderbook else None
+    if not isinstance(orderbook, dict):
+        return []
+    return orderbook.get("orderbook_units") or []
+
+
+def mid_price(units):
+    if not units:
+        return None
+    return (float(units[0]["ask_price"]) + float(units[0]["bid_price"])) / 2
+
+
+def depth_within(units, side, max_impact_bps):
+    """최우선 호가 대비 max_impact_bps 이내 반대편 잔량 (원)
+
+    매수는 매도 호가(ask), 매도는 매수 호가(bid)를 소진한다.
+    """
+    if not units:
+        return 0.0
+    key = "ask" if side == "bid" else "bid"
+    best = float(units[0][f"{key}_price"])
+    limit = best * (1 + max_impact_bps / 10000) if side == "bid" else best * (1 - max_impact_bps / 10000)
+
+    depth = 0.0
+    for unit in units:
+        price = float(unit[f"{key}_price"])
+        if (side == "bid" and price > limit) or (side == "ask" and price < limit):
+            break
+        depth += price * float(unit[f"{key}_size"])
+    return depth
+
+
+class ParentOrder:
+    """분할 실행 중인 부모 주문 상태"""
+
+    def __init__(self, market, side, algo, krw_amount=None, volume=None, arrival_price=None):
+        self.market = market
+        self.side = side
+        self.algo = algo
+        self.target_krw = krw_amount or 0.0
+        self.target_volume = volume or 0.0
+        self.arrival_price = arrival_price
+        self.started_at = time.time()
+        self.finished_at = None
+        self.state = "running"
+        self.children = []
+        self.executed_volume = 0.0
+        self.executed_krw = 0.0
+        self.paid_fee = 0.0
+        self.final_price = None
+        self.error = None
+        self._cancel = threading.Event()
+        self._thread = None
+
+    @property
+    def remaining_krw(self):
+        return max(0.0, self.target_krw - self.executed_krw)
+
+    @property
+    def remaining_volume(self):
+        return max(0.0, self.target_volume - self.executed_volume)
+
+    @property
+    def avg_price(self):
+        return self.executed_krw / self.executed_volume if self.executed_volume > 0 else None
+
+    @property
+    def fill_ratio(self):
+        if self.side == "bid":
+            return self.executed_krw / self.target_krw if self.target_krw else 0.0
+        return self.executed_volume / self.target_volume if self.target_volume else 0.0
+
+    def apply_child(self, tracked):
+        """체결 확인된 자식 주문 반영"""
+        self.children.append(tracked.to_dict())
+        if tracked.is_filled and tracked.avg_price:
+            self.executed_volume += tracked.executed_volume
+            self.executed_krw += tracked.executed_volume * tracked.avg_price
+            self.paid_fee += tracked.paid_fee
+
+    def cancel(self):
+        self._cancel.set()
+
+    def implementation_shortfall(self):
+        """도착 가격 대비 실행 비용
+
+        체결분: (평균 체결가 - 도착가) x 체결 수량 + 수수료 (매도는 부호 반대)
+        미체결분: 종료 시점 가격 기준 기회비용
+        """
+        if not self.arrival_price:
+            return None
+        sign = 1 if self.side == "bid" else -1
+        execution_cost = 0.0
+        if self.executed_volume > 0:
+            execution_cost = sign * (self.avg_price - self.arrival_price) * self.executed_volume
+        execution_cost += self.paid_fee
+
+        if self.side == "bid":
+            unfilled_volume = self.remaining_krw / self.arrival_price
+        else:
+            unfilled_volume = self.remaining_volume
+        opportunity_cost = 0.0
+        if self.final_price and unfilled_volume > 0:
+            opportunity_cost = sign * (self.final_price - self.arrival_price) * unfilled_volume
+
+        paper_notional = self.target_krw if self.side == "bid" else self.target_volume * self.arrival_price
+        total = execution_cost + opportunity_cost
+        return {
+            "execution_cost": round(execution_cost, 2),
+            "opportunity_cost": round(opportunity_cost, 2),
+            "total": round(total, 2),
+            "bps": round(total / paper_notional * 10000, 2) if paper_notional else None
+        }
+
+    def to_dict(self):
+        return {
+            "market": self.market,
+            "side": self.side,
+            "algo": self.algo,
+            "state": self.state,
+            "arrival_price": self.arrival_price,
+            "avg_price": self.avg_price,
+            "executed_volume": self.executed_volume,
+            "executed_krw": self.executed_krw,
+            "paid_fee": self.paid_fee,
+            "fill_ratio": round(self.fill_ratio, 4),
+            "child_orders": len(self.children),
+            "duration": (self.finished_at or time.time()) - self.started_at,
+            "shortfall": self.implementation_shortfall()
+        }
+
+
+class ExecutionEngine:
+    """큰 주문을 호가 깊이에 맞춘 자식 주문으로 나눠 백그라운드에서 실행
+
+    알고리즘:
+      twap  - 남은 금액을 남은 회차 수로 균등 분할
+      pov   - 최근 1분 거래대금 x 참여율 만큼씩 실행
+      depth - 허용 가격 충격 이내 호가 잔량의 일정 비율만큼씩 실행
+    모든 알고리즘의 자식 주문은 현재 호가 깊이 기준 상한을 넘지 않는다.
+    """
+
+    def __init__(self, upbit_client, order_tracker, ledger=None, market=None):
+        self.upbit = upbit_client
+        self.orders = order_tracker
+        self.ledger = ledger
+        self.market = market or pyupbit
+        self.min_notional = TradingConfig.MIN_TRADE_AMOUNT
+        self._lock = threading.Lock()
+        self._active = {}
+        self._history = []
+
+    def should_slice(self, notional):
+        threshold = TradingConfig.EXECUTION_SLICE_THRESHOLD
+        return bool(threshold) and notional > threshold
+
+    def is_active(self, market):
+        with self._lock:
+            parent = self._active.get(market)
+            return parent is not None and parent.state == "running"
+
+    def cancel(self, market, timeout=None):
+        """진행 중인 부모 주문 취소 후 실행 스레드 종료 대기 (종료됐으면 True)"""
+        with self._lock:
+            parent = self._active.get(market)
+        if parent is None:
+            return True
+        parent.cancel()
+        thread = parent._thread
+        if thread is not None and thread is not threading.current_thread():
+            # 체결 대기 중인 자식 주문이 있으면 그 확인까지 기다림
+            thread.join(timeout if timeout is not None else TradingConfig.ORDER_CONFIRM_TIMEOUT + 1)
+        return not self.is_active(market)
+
+    def active_orders(self):
+        with self._lock:
+            return [parent.to_dict() for parent in self._active.values()]
+
+    def history(self):
+        with self._lock:
+            return list(self._history)
+
+    def submit(self, market, side, krw_amount=None, volume=None, algo=None):
+        """부모 주문 등록 후 백그라운드 실행 시작 (매수는 금액, 매도는 수량)"""
+        algo = algo or TradingConfig.EXECUTION_ALGO
+        if algo not in ALGORITHMS:
+            raise ValueError(f"알 수 없는 실행 알고리즘: {algo}")
+        if self.is_active(market):
+            return None
+
+        units = self._orderbook(market)
+        arrival = mid_price(units) or get_price_table().get(market)
+        parent = ParentOrder(market, side, algo, krw_amount, volume, arrival)
+        with self._lock:
+            self._active[market] = parent
+
+        thread = threading.Thread(target=self._run, args=(parent,), name=f"exec-{market}", daemon=True)
+        parent._thread = thread
+        thread.start()
+        return parent
+
+    def _orderbook(self, market):
+        try:
+            return orderbook_units(self.market.get_orderbook(ticker=market))
+        except Exception as e:
+            print(f"[WARNING] 호가 조회 실패 ({market}): {e}")
+            return []
+
+    def _recent_traded_krw(self, market):
+        """최근 완성된 1분봉 거래대금 (원)"""
+        try:
+            df = self.market.get_ohlcv(market, interval="minute1", count=2)
+            if df is not None and len(df):
+                return float(df["value"].iloc[0])
+        except Exception as e:
+            print(f"[WARNING] 거래대금 조회 실패 ({market}): {e}")
+        return 0.0
+
+    def _child_krw(self, parent, units, remaining_krw, slices_left):
+        """이번 회차 자식 주문 금액 (원)"""
+        depth = depth_within(units, parent.side, TradingConfig.EXECUTION_MAX_IMPACT_BPS)
+        depth_cap = depth * TradingConfig.EXECUTION_DEPTH_FRACTION
+
+        if parent.algo == "twap":
+            size = remaining_krw / max(slices_left, 1)
+        elif parent.algo == "pov":
+            per_minute = self._recent_traded_krw(parent.market)
+            size = per_minute * TradingConfig.EXECUTION_PARTICIPATION_RATE * TradingConfig.EXECUTION_SLICE_INTERVAL / 60
+        else:
+            size = depth_cap
+
+        if depth_cap > 0:
+            size = min(size, depth_cap)
+        size = max(size, self.min_notional)
+        # 남은 금액이 최소 주문 금액 미만으로 남으면 이번에 모두 실행
+        if remaining_krw - size < self.min_notional:
+            size = remaining_krw
+        return size
+
+    def _run(self, parent):
+        interval = TradingConfig.EXECUTION_SLICE_INTERVAL
+        end_at = time.monotonic() + TradingConfig.EXECUTION_MAX_DURATION
+        slices = TradingConfig.EXECUTION_TWAP_SLICES
+        units = []
+
+        try:
+            while not parent._cancel.is_set():
+                units = self._orderbook(parent.market)
+                price = mid_price(units) or get_price_table().get(parent.market) or parent.arrival_price
+                if not price:
+                    parent.error = "시세 없음"
+                    break
+
+                if parent.side == "bid":
+                    remaining_krw = parent.remaining_krw
+                else:
+                    remaining_krw = parent.remaining_volume * price
+                if remaining_krw < self.min_notional:
+                    break
+
+                slices_left = slices - len(parent.children)
+                krw = self._child_krw(parent, units, remaining_krw, slices_left)
+                if not self._place_child(parent, krw, price):
+                    break
+
+                if time.monotonic() + interval > end_at:
+                    break
+                if parent._cancel.wait(interval):
+                    break
+        except Exception as e:
+            parent.error = str(e)
+        finally:
+            self._finish(parent, mid_price(units) or get_price_table().get(parent.market))
+
+    def _place_child(self, parent, krw, price):
+        """자식 주문 1건 실행 및 체결 대기"""
+        if parent.side == "bid":
+            result = self.upbit.buy_market_order(parent.market, krw)
+        else:
+            volume = parent.remaining_volume if krw >= parent.remaining_volume * price else krw / price
+            result = self.upbit.sell_market_order(parent.market, volume)
+
+        if not isinstance(result, dict) or "uuid" not in result:
+            parent.error = f"자식 주문 실패: {result}"
+            return False
+
+        if self.ledger is not None:
+            self.ledger.record_order(result, market=parent.market, side=parent.side)
+        tracked = self.orders.track(result, parent.market, parent.side, arrival_price=parent.arrival_price)
+        tracked = self.orders.wait(tracked.uuid)
+        if tracked is None or not tracked.is_terminal:
+            parent.error = "자식 주문 체결 확인 지연"
+            return False
+        parent.apply_child(tracked)
+        return True
+
+    def _finish(self, parent, final_price):
+        parent.final_price = final_price
+        parent.finished_at = time.time()
+        if parent._cancel.is_set():
+            parent.state = "cancelled"
+        elif parent.fill_ratio >= 0.999:
+            parent.state = "done"
+        else:
+            parent.state = "partial" if parent.executed_volume > 0 else "failed"
+
+        summary = parent.to_dict()
+        with self._lock:
+            self._active.pop(parent.market, None)
+            self._history.append(summary)
+            del self._history[:-TradingConfig.ORDER_HISTORY_SIZE]
+
+        shortfall = summary["shortfall"] or {}
+        label = "매수" if parent.side == "bid" else "매도"
+        print(f"분할 {label} 종료 ({parent.market}, {parent.algo}, {parent.state}): "
+              f"자식 {len(parent.children)}건, 체결률 {parent.fill_ratio:.0%}, "
+              f"IS {shortfall.get('total', 0):,.0f}원 ({shortfall.get('bps')}bp)"
+              + (f" - {parent.error}" if parent.error else ""))
@@ -1,16 +1,33 @@
 # trading/executor.py
 from config.settings import TradingConfig
+from utils.cycle_cache import invalidate_cycle_cache
+from utils.deadline import remaining_timeout
+from trading.risk import PreTradeRiskEngine
+from trading.orders import OrderTracker, connect_order_events
+from trading.execution_algos import ExecutionEngine
+from data.price_table import get_price_table
 
 class TradeExecutor:
     """매매 실행 클래스"""
     
-    def __init__(self, upbit_client, portfolio_manager, target_coin=None):
+    def __init__(self, upbit_client, portfolio_manager, target_coin=None, risk_engine=None, order_tracker=None,
+                 execution_engine=None):
         self.upbit = upbit_client
         self.portfolio = portfolio_manager
         self.target_coin = target_coin or TradingConfig.TARGET_COIN
+        self.risk = risk_engine or PreTradeRiskEngine(portfolio_manager.account, ledger=portfolio_manager.ledger)
+        self.orders = order_tracker or self._create_order_tracker()
+        self.algos = execution_engine or ExecutionEngine(
+            self.upbit, self.orders, portfolio_manager.ledger, portfolio_manager.market
+        )
         self.min_confidence = TradingConfig.MIN_CONFIDENCE
         self.trade_ratios = TradingConfig.TRADE_RATIOS
         self.min_trade_amount = TradingConfig.MIN_TRADE_AMOUNT
+
+    def set_target_coin(self, target_coin):
+        """대상 코인 변경 (포트폴리오 관리자도 함께 변경)"""
+        self.target_coin = target_coin
+        self.portfolio.set_target_coin(target_coin)
     
     def execute_trade(self, recommendation, investment_status):
         """매매 실행"""
@@ -59,57 +76,162 @@ class TradeExecutor:
             krw_balance = investment_status["krw_balance"]
             buy_amount = krw_balance * trade_ratio
             
-            # 매수 가능 여부 확인
-            if not self.portfolio.can_buy(buy_amount):
+            if self.algos.is_active(self.target_coin):
+                print(f"분할 주문 진행 중 ({self.target_coin}) - 신규 매수 건너뜀")
+                return False
+            
+            # 사전 리스크 점검 (캐시된 스냅샷 기준, API 호출 없음)
+            check = self.risk.check_order(self.target_coin, "bid", krw_amount=buy_amount)
+            if not check:
                 print(f"❌ Buy failed - Balance: {krw_balance:,.0f} KRW, Trying: {buy_amount:,.0f} KRW")
-                print(f"   Reason: Insufficient funds or minimum order not met")
+                print(f"   Reason: {'; '.join(check.reasons)}")
                 return False
             
             print(f"매수 실행: {buy_amount:,.0f}원 (보유현금의 {trade_ratio*100:.0f}%)")
             
+            # 큰 주문은 호가 깊이에 맞춰 분할 실행 (백그라운드)
+            if self.algos.should_slice(check.notional):
+                return self._submit_sliced("bid", check, krw_amount=buy_amount)
+            
             # 실제 매수 주문
             result = self.upbit.buy_market_order(self.target_coin, buy_amount)
+            accepted = self._order_accepted(result)
+            if accepted:
+                self.risk.record_order(self.target_coin, "bid", check.notional)
+            order = self._on_order_event(result, "bid")
             
-            if result:
-                print(f"매수 성공: {result}")
-                return True
+            if accepted:
+                print(f"매수 주문 접수: {result['uuid']}")
+                return self._report_fill(order, "매수")
             else:
-                print("매수 실패")
+                print(f"매수 실패: {result}")
                 return False
                 
         except Exception as e:
             print(f"매수 실행 오류: {e}")
             return False
     
-    def _execute_sell(self, investment_status, trade_ratio):
-        """매도 실행"""
+    def exit_position(self, reason, ratio=1.0):
+        """보호 주문 청산 (손절/익절/트레일링 스탑) - 최신 잔고 기준 즉시 매도
+
+        진행 중인 분할 주문은 취소하고, 주문 금액/일일 거래 한도 대신 잔고만 확인한다.
+        """
+        if self.algos.is_active(self.target_coin):
+            print(f"[보호 주문] {self.target_coin} 진행 중인 분할 주문 취소")
+            self.algos.cancel(self.target_coin)
+        self.portfolio.account.invalidate()
+        investment_status = self.portfolio.get_investment_status(self.target_coin)
+        if not investment_status or investment_status["coin_balance"] <= 0:
+            return False
+        print(f"[보호 주문] {self.target_coin} {reason} - 보유분 {ratio*100:.0f}% 매도")
+        return self._execute_sell(investment_status, ratio, allow_slicing=False, reduce_only=True)
+    
+    def _execute_sell(self, investment_status, trade_ratio, allow_slicing=True, reduce_only=False):
+        """매도 실행 (reduce_only: 보호 주문 청산 - 분할 주문 진행 여부와 주문 한도 무시)"""
         try:
             coin_balance = investment_status["coin_balance"]
             coin_value = investment_status["coin_value"]
             sell_amount = coin_balance * trade_ratio
             coin_name = investment_status["coin_currency"]
             
-            # 매도 가능 여부 확인
-            if not self.portfolio.can_sell(sell_amount):
+            if not reduce_only and self.algos.is_active(self.target_coin):
+                print(f"분할 주문 진행 중 ({self.target_coin}) - 신규 매도 건너뜀")
+                return False
+            
+            # 사전 리스크 점검 (캐시된 스냅샷 기준, API 호출 없음)
+            check = self.risk.check_order(self.target_coin, "ask", volume=sell_amount, reduce_only=reduce_only)
+            if not check:
                 print(f"매도 불가 - {coin_name}잔고: {coin_balance:.8f}, 평가액: {coin_value:,.0f}원")
+                print(f"   사유: {'; '.join(check.reasons)}")
                 return False
             
             print(f"매도 실행: {sell_amount:.8f} {coin_name} (보유{coin_name}의 {trade_ratio*100:.0f}%)")
             
+            if allow_slicing and self.algos.should_slice(check.notional):
+                return self._submit_sliced("ask", check, volume=sell_amount)
+            
             # 실제 매도 주문
             result = self.upbit.sell_market_order(self.target_coin, sell_amount)
+            accepted = self._order_accepted(result)
+            if accepted:
+                self.risk.record_order(self.target_coin, "ask", check.notional, sell_amount)
+            order = self._on_order_event(result, "ask")
             
-            if result:
-                print(f"매도 성공: {result}")
-                return True
+            if accepted:
+                print(f"매도 주문 접수: {result['uuid']}")
+                return self._report_fill(order, "매도")
             else:
-                print("매도 실패")
+                print(f"매도 실패: {result}")
                 return False
                 
         except Exception as e:
             print(f"매도 실행 오류: {e}")
             return False
     
+    def _submit_sliced(self, side, check, krw_amount=None, volume=None):
+        """분할 실행 등록 (자식 주문 체결은 주문 추적기를 통해 원장에 반영)"""
+        parent = self.algos.submit(self.target_coin, side, krw_amount=krw_amount, volume=volume)
+        if parent is None:
+            print(f"분할 주문 진행 중 ({self.target_coin})")
+            return False
+        self.risk.record_order(self.target_coin, side, check.notional, volume)
+        self.portfolio.account.invalidate()
+        invalidate_cycle_cache("PortfolioManager.")
+        
+        label = "매수" if side == "bid" else "매도"
+        arrival = f"{parent.arrival_price:,.2f}원" if parent.arrival_price else "N/A"
+        print(f"분할 {label} 시작: {parent.algo} 알고리즘, 도착가 {arrival}, "
+              f"최대 {TradingConfig.EXECUTION_MAX_DURATION}초")
+        return True
+    
+    def _create_order_tracker(self):
+        """기본 주문 추적기 (체결 시 스냅샷 무효화/원장 기록)"""
+        tracker = OrderTracker(self.upbit)
+        connect_order_events(tracker, self.portfolio.account, self.portfolio.ledger)
+        return tracker
+    
+    @staticmethod
+    def _order_accepted(result):
+        """거래소가 주문을 접수했는지 (오류 응답 {"error": ...}에는 uuid가 없음)"""
+        return isinstance(result, dict) and "uuid" in result
+    
+    def _on_order_event(self, result, side):
+        """주문 제출 후 원장 기록, 스냅샷/사이클 캐시 무효화, 체결 추적 시작"""
+        self.portfolio.account.invalidate()
+        invalidate_cycle_cache("PortfolioManager.")
+        
+        if not self._order_accepted(result):
+            return None
+        try:
+            if self.portfolio.ledger is not None:
+                self.portfolio.ledger.record_order(result, market=self.target_coin, side=side)
+            order = self.orders.track(
+                result, self.target_coin, side,
+                arrival_price=get_price_table().get(self.target_coin)
+            )
+            # 체결 확인은 사이클 남은 시간까지만 대기 (이후는 추적기가 계속 확인)
+            return self.orders.wait(order.uuid, remaining_timeout(TradingConfig.ORDER_CONFIRM_TIMEOUT))
+        except Exception as e:
+            print(f"[WARNING] 주문 추적 오류: {e}")
+            return None
+    
+    def _report_fill(self, order, label):
+        """체결 확인 결과 출력 (추적되지 않은 주문과 체결 없이 종료된 주문은 실패 처리)"""
+        if order is None:
+            return False
+        if not order.is_terminal:
+            print(f"{label} 체결 대기 중 (uuid: {order.uuid}) - 백그라운드에서 계속 추적")
+            return True
+        if not order.is_filled:
+            print(f"{label} 미체결 종료 (state: {order.state})")
+            return False
+        
+        slippage = f"{order.slippage_bps:+.1f}bp" if order.slippage_bps is not None else "N/A"
+        latency = f"{order.latency:.2f}s" if order.latency is not None else "N/A"
+        print(f"{label} 체결: {order.executed_volume:.8f} @ {order.avg_price:,.2f}원, "
+              f"수수료 {order.paid_fee:,.0f}원, 지연 {latency}, 슬리피지 {slippage}")
+        return True
+    
     def get_trade_size(self, investment_status, risk_level):
         """거래 크기 계산"""
         try:
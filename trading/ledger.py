@@ -0,0 +1,244 @@
+# trading/ledger.py
+import os
+import json
+import time
+import threading
+from datetime import date
+from config.settings import TradingConfig
+
+
+class Position:
+    """단일 마켓 포지션 (평균 단가 방식)"""
+
+    def __init__(self, market):
+        self.market = market
+        self.volume = 0.0
+        self.cost = 0.0           # 수수료 포함 취득 원가 합계
+        self.realized_pnl = 0.0
+        self.fees = 0.0
+
+    @property
+    def avg_price(self):
+        return self.cost / self.volume if self.volume > 0 else 0.0
+
+    def apply_fill(self, side, volume, price, fee):
+        self.fees += fee
+        if side == "bid":
+            self.volume += volume
+            self.cost += volume * price + fee
+        else:
+            volume = min(volume, self.volume)
+            avg_price = self.avg_price
+            self.realized_pnl += volume * (price - avg_price) - fee
+            self.cost -= avg_price * volume
+            self.volume -= volume
+            if self.volume <= 1e-12:
+                self.volume = 0.0
+                self.cost = 0.0
+
+    def reset(self, volume, avg_price):
+        self.volume = volume
+        self.cost = volume * avg_price
+
+    def to_dict(self, current_price=None):
+        result = {
+            "market": self.market,
+            "volume": self.volume,
+            "avg_price": self.avg_price,
+            "cost": self.cost,
+            "realized_pnl": self.realized_pnl,
+            "fees": self.fees
+        }
+        if current_price:
+            result["unrealized_pnl"] = (current_price - self.avg_price) * self.volume
+        return result
+
+
+class PositionLedger:
+    """주문/체결 이벤트 로그 기반 로컬 포지션 원장
+
+    모든 이벤트는 append-only JSONL로 남기고, 포지션/평균단가/실현손익은
+    이벤트를 적용하며 증분 계산한다. 거래소 잔고와는 주기적으로 비교해
+    수량이 어긋난 마켓만 맞춘다 (reconcile 이벤트).
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(TradingConfig.DATA_STORE_DIR, "ledger.jsonl")
+        self._lock = threading.RLock()
+        self._positions = {}
+        self._orders = {}
+        self._fill_ids = set()
+        self._turnover = {}  # 날짜(YYYY-MM-DD, 로컬) -> 체결 금액 합계 (원)
+        self.last_reconciled_at = 0
+        self._load()
+
+    def _load(self):
+        """이벤트 로그 재생으로 상태 복원"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        self._apply(json.loads(line))
+                    except (json.JSONDecodeError, KeyError):
+                        continue
+        except OSError as e:
+            print(f"원장 로드 오류: {e}")
+
+    def _append(self, event):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(event, ensure_ascii=True) + "\n")
+        except OSError as e:
+            print(f"원장 기록 오류: {e}")
+
+    def _position(self, market):
+        if market not in self._positions:
+            self._positions[market] = Position(market)
+        return self._positions[market]
+
+    def _apply(self, event):
+        event_type = event["type"]
+        if event_type == "order":
+            self._orders[event["uuid"]] = event
+        elif event_type == "fill":
+            if event["fill_id"] in self._fill_ids:
+                return False
+            self._fill_ids.add(event["fill_id"])
+            day = date.fromtimestamp(event.get("ts") or time.time()).isoformat()
+            self._turnover[day] = self._turnover.get(day, 0.0) + event["volume"] * event["price"]
+            self._position(event["market"]).apply_fill(
+                event["side"], event["volume"], event["price"], event.get("fee", 0.0)
+            )
+        elif event_type == "reconcile":
+            self._position(event["market"]).reset(event["volume"], event["avg_price"])
+        return True
+
+    def _record(self, event):
+        with self._lock:
+            if self._apply(event):
+                self._append(event)
+                return True
+            return False
+
+    def record_order(self, order_result, market=None, side=None):
+        """주문 제출 이벤트 기록 (buy/sell_market_order 응답)"""
+        if not isinstance(order_result, dict) or "uuid" not in order_result:
+            return False
+        return self._record({
+            "type": "order",
+            "ts": time.time(),
+            "uuid": order_result["uuid"],
+            "market": order_result.get("market", market),
+            "side": order_result.get("side", side),
+            "ord_type": order_result.get("ord_type"),
+            "price": order_result.get("price"),
+            "volume": order_result.get("volume")
+        })
+
+    def record_fill(self, uuid, market, side, volume, price, fee=0.0, fill_id=None, ts=None):
+        """체결 이벤트 기록 (같은 fill_id는 한 번만 반영)"""
+        return self._record({
+            "type": "fill",
+            "ts": ts or time.time(),
+            "uuid": uuid,
+            "fill_id": fill_id or f"{uuid}:{volume}:{price}",
+            "market": market,
+            "side": side,
+            "volume": float(volume),
+            "price": float(price),
+            "fee": float(fee)
+        })
+
+    def record_order_detail(self, order):
+        """get_order(uuid) 상세 응답의 체결 내역을 반영 (반영된 체결 수 반환)"""
+        if not isinstance(order, dict):
+            return 0
+
+        trades = order.get("trades") or []
+        total_funds = sum(float(t.get("funds", 0)) for t in trades) or 1.0
+        paid_fee = float(order.get("paid_fee", 0) or 0)
+
+        applied = 0
+        for trade in trades:
+            funds = float(trade.get("funds", 0))
+            if self.record_fill(
+                order["uuid"], order["market"], order["side"],
+                trade["volume"], trade["price"],
+                fee=paid_fee * funds / total_funds,
+                fill_id=trade.get("uuid")
+            ):
+                applied += 1
+        return applied
+
+    def position(self, market):
+        with self._lock:
+            position = self._positions.get(market)
+            return position if position and position.volume > 0 else None
+
+    def positions(self):
+        with self._lock:
+            return {m: p for m, p in self._positions.items() if p.volume > 0}
+
+    def totals(self):
+        """전체 마켓 누적 실현손익/수수료 (청산된 포지션 포함)"""
+        with self._lock:
+            return {
+                "realized_pnl": sum(p.realized_pnl for p in self._positions.values()),
+                "fees": sum(p.fees for p in self._positions.values())
+            }
+
+    def daily_turnover(self, day=None):
+        """하루 동안 체결된 매수+매도 금액 합계 (기본: 오늘)"""
+        day = (day or date.today()).isoformat()
+        with self._lock:
+            return self._turnover.get(day, 0.0)
+
+    def get_pnl(self, market, current_price):
+        """마켓별 실현/미실현 손익"""
+        with self._lock:
+            position = self._positions.get(market)
+            return position.to_dict(current_price) if position else None
+
+    def reconcile(self, account, force=False, tolerance=1e-8):
+        """계좌 스냅샷과 수량을 비교해 불일치 마켓만 거래소 값으로 맞춤
+
+        LEDGER_RECONCILE_INTERVAL마다(또는 force) 확인하며, 그 사이에는 원장의
+        체결 기반 수량/평균단가를 그대로 신뢰한다. force=True면 평균단가까지
+        거래소 값으로 맞춘다.
+        """
+        now = time.time()
+        if not force and (now - self.last_reconciled_at) < TradingConfig.LEDGER_RECONCILE_INTERVAL:
+            return []
+
+        adjusted = []
+        with self._lock:
+            markets = set(self._positions) | {f"KRW-{c}" for c in account.held_currencies()}
+            for market in sorted(markets):
+                exchange_volume = account.balance(market) + account.locked(market)
+                position = self._positions.get(market)
+                ledger_volume = position.volume if position else 0.0
+
+                mismatch = abs(exchange_volume - ledger_volume) > tolerance * max(1.0, exchange_volume)
+                if not (mismatch or (force and exchange_volume > 0)):
+                    continue
+
+                self._record({
+                    "type": "reconcile",
+                    "ts": now,
+                    "market": market,
+                    "volume": exchange_volume,
+                    "avg_price": account.avg_buy_price(market) or 0.0,
+                    "ledger_volume": ledger_volume,
+                    "reason": "mismatch" if mismatch else "forced"
+                })
+                adjusted.append(market)
+
+            self.last_reconciled_at = now
+
+        return adjusted
@@ -0,0 +1,241 @@
+# trading/orders.py
+import time
+import threading
+from datetime import datetime
+from config.settings import TradingConfig
+
+TERMINAL_STATES = ("done", "cancel")
+
+
+class TrackedOrder:
+    """추적 중인 주문 상태"""
+
+    def __init__(self, uuid, market, side, arrival_price=None):
+        self.uuid = uuid
+        self.market = market
+        self.side = side
+        self.arrival_price = arrival_price
+        self.submitted_at = time.time()
+        self.state = "wait"
+        self.detail = None
+        self.executed_volume = 0.0
+        self.avg_price = None
+        self.paid_fee = 0.0
+        self.filled_at = None
+        self.poll_count = 0
+        self.error = None
+        self._done = threading.Event()
+        self._next_poll = time.monotonic()
+        self._interval = TradingConfig.ORDER_POLL_INITIAL
+
+    @property
+    def is_terminal(self):
+        return self._done.is_set()
+
+    @property
+    def is_filled(self):
+        return self.executed_volume > 0
+
+    @property
+    def latency(self):
+        """제출부터 마지막 체결까지 걸린 시간 (초)"""
+        return self.filled_at - self.submitted_at if self.filled_at else None
+
+    @property
+    def slippage_bps(self):
+        """도착 가격 대비 불리한 방향 슬리피지 (bp)"""
+        if not self.avg_price or not self.arrival_price:
+            return None
+        diff = self.avg_price - self.arrival_price if self.side == "bid" else self.arrival_price - self.avg_price
+        return diff / self.arrival_price * 10000
+
+    def apply_detail(self, detail):
+        """get_order(uuid) 응답 반영"""
+        self.detail = detail
+        self.state = detail.get("state", self.state)
+        self.paid_fee = float(detail.get("paid_fee") or 0)
+
+        trades = detail.get("trades") or []
+        volume = sum(float(t["volume"]) for t in trades)
+        funds = sum(float(t.get("funds") or float(t["price"]) * float(t["volume"])) for t in trades)
+        self.executed_volume = volume or float(detail.get("executed_volume") or 0)
+        self.avg_price = funds / volume if volume > 0 else None
+
+        times = [_parse_time(t.get("created_at")) for t in trades]
+        times = [t for t in times if t]
+        if self.state in TERMINAL_STATES:
+            # 거래소 체결 시각이 로컬 제출 시각보다 앞서면(시계 차이) 감지 시각 사용
+            self.filled_at = max(times) if times and max(times) >= self.submitted_at else time.time()
+
+    def to_dict(self):
+        return {
+            "uuid": self.uuid,
+            "market": self.market,
+            "side": self.side,
+            "state": self.state,
+            "executed_volume": self.executed_volume,
+            "avg_price": self.avg_price,
+            "paid_fee": self.paid_fee,
+            "arrival_price": self.arrival_price,
+            "latency": self.latency,
+            "slippage_bps": self.slippage_bps
+        }
+
+
+def connect_order_events(tracker, account=None, ledger=None):
+    """주문 종료 이벤트를 계좌 스냅샷 무효화와 원장 체결 기록에 연결"""
+    if account is not None:
+        tracker.subscribe(lambda order: account.invalidate())
+    if ledger is not None:
+        tracker.subscribe(lambda order: ledger.record_order_detail(order.detail) if order.detail else 0)
+
+
+def _parse_time(value):
+    try:
+        return datetime.fromisoformat(value).timestamp() if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+class OrderTracker:
+    """주문 UUID를 종료 상태까지 추적하고 체결 이벤트를 발행
+
+    백그라운드 스레드 하나가 열린 주문들을 적응형 간격(처음엔 짧게, 이후
+    점점 길게)으로 조회한다. 종료되면 구독자에게 TrackedOrder를 전달한다.
+    """
+
+    def __init__(self, upbit_client):
+        self.upbit = upbit_client
+        self._lock = threading.Condition()
+        self._open = {}
+        self._completed = {}
+        self._listeners = []
+        self._thread = None
+        self._stopped = False
+
+    def subscribe(self, callback):
+        """체결(종료) 이벤트 구독: callback(tracked_order)"""
+        self._listeners.append(callback)
+
+    def track(self, order_result, market=None, side=None, arrival_price=None):
+        """주문 응답을 추적 목록에 추가"""
+        if not isinstance(order_result, dict) or "uuid" not in order_result:
+            return None
+
+        order = TrackedOrder(
+            order_result["uuid"],
+            order_result.get("market", market),
+            order_result.get("side", side),
+            arrival_price
+        )
+        with self._lock:
+            self._open[order.uuid] = order
+            self._ensure_thread()
+            self._lock.notify_all()
+        return order
+
+    def wait(self, uuid, timeout=None):
+        """주문이 종료 상태가 될 때까지 대기 (타임아웃 시 현재 상태 반환)"""
+        order = self.get(uuid)
+        if order is not None:
+            order._done.wait(timeout if timeout is not None else TradingConfig.ORDER_CONFIRM_TIMEOUT)
+        return order
+
+    def get(self, uuid):
+        with self._lock:
+            return self._open.get(uuid) or self._completed.get(uuid)
+
+    def open_orders(self):
+        with self._lock:
+            return list(self._open.values())
+
+    def snapshot_state(self):
+        """체크포인트용 상태 (열린 주문만)"""
+        return [
+            {"uuid": o.uuid, "market": o.market, "side": o.side, "arrival_price": o.arrival_price,
+             "submitted_at": o.submitted_at}
+            for o in self.open_orders()
+        ]
+
+    def restore_state(self, state):
+        """재시작 전 열린 주문을 다시 추적 (원장은 체결 ID로 중복 반영을 막음)"""
+        for entry in state:
+            if self.get(entry["uuid"]) is not None:
+                continue
+            order = self.track(entry, entry["market"], entry["side"], entry.get("arrival_price"))
+            if order is not None:
+                order.submitted_at = entry.get("submitted_at", order.submitted_at)
+
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+            self._lock.notify_all()
+
+    def stats(self):
+        """체결 지연/슬리피지 통계"""
+        with self._lock:
+            filled = [o for o in self._completed.values() if o.is_filled]
+        latencies = [o.latency for o in filled if o.latency is not None]
+        slippages = [o.slippage_bps for o in filled if o.slippage_bps is not None]
+        return {
+            "open_orders": len(self._open),
+            "filled_orders": len(filled),
+            "avg_latency": sum(latencies) / len(latencies) if latencies else None,
+            "avg_slippage_bps": sum(slippages) / len(slippages) if slippages else None
+        }
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._poll_loop, name="order-tracker", daemon=True)
+            self._thread.start()
+
+    def _poll_loop(self):
+        while True:
+            with self._lock:
+                while not self._stopped and not self._open:
+                    self._lock.wait()
+                if self._stopped:
+                    return
+                now = time.monotonic()
+                due = [o for o in self._open.values() if o._next_poll <= now]
+                if not due:
+                    next_due = min(o._next_poll for o in self._open.values())
+                    self._lock.wait(max(0.0, next_due - now))
+                    continue
+
+            for order in due:
+                self._poll(order)
+
+    def _poll(self, order):
+        order.poll_count += 1
+        try:
+            detail = self.upbit.get_order(order.uuid)
+            if isinstance(detail, dict) and detail.get("uuid"):
+                order.apply_detail(detail)
+        except Exception as e:
+            order.error = str(e)
+
+        expired = time.time() - order.submitted_at > TradingConfig.ORDER_TRACK_TIMEOUT
+        if order.state in TERMINAL_STATES or expired:
+            self._complete(order)
+            return
+
+        # 적응형 폴링 간격 (지수 증가, 상한 있음)
+        order._interval = min(order._interval * TradingConfig.ORDER_POLL_BACKOFF, TradingConfig.ORDER_POLL_MAX)
+        order._next_poll = time.monotonic() + order._interval
+
+    def _complete(self, order):
+        with self._lock:
+            self._open.pop(order.uuid, None)
+            self._completed[order.uuid] = order
+            # 완료 목록은 최근 것만 유지
+            while len(self._completed) > TradingConfig.ORDER_HISTORY_SIZE:
+                self._completed.pop(next(iter(self._completed)))
+        for callback in self._listeners:
+            try:
+                callback(order)
+            except Exception as e:
+                print(f"[WARNING] 주문 이벤트 처리 오류: {e}")
+        # 구독자 처리(원장 기록 등) 후 대기 중인 호출자를 깨움
+        order._done.set()
@@ -0,0 +1,320 @@
+# trading/paper_exchange.py
+import io
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import threading
+from contextlib import redirect_stdout
+from datetime import datetime, timezone, timedelta
+from config.settings import TradingConfig
+
+KST = timezone(timedelta(hours=9))
+
+
+class SyntheticOrderbook:
+    """기준 가격 주변에 대칭 호가를 생성하는 합성 호가창
+
+    price_source: {market: price} 또는 callable(market) -> price
+    volatility: advance() 1회당 기준 가격 랜덤워크 표준편차 (비율, 0이면 고정)
+    """
+
+    def __init__(self, price_source, spread_bps=5, levels=15, level_notional=2_000_000,
+                 tick_bps=2, volatility=0.0, seed=None):
+        self.price_source = price_source
+        self.spread_bps = spread_bps
+        self.levels = levels
+        self.level_notional = level_notional
+        self.tick_bps = tick_bps
+        self.volatility = volatility
+        self._random = random.Random(seed)
+        self._prices = {}
+
+    def _base_price(self, market):
+        if market not in self._prices:
+            if callable(self.price_source):
+                price = self.price_source(market)
+            else:
+                price = self.price_source.get(market)
+            if not price:
+                return None
+            self._prices[market] = float(price)
+        return self._prices[market]
+
+    def advance(self):
+        """다음 시점으로 이동 (기준 가격 랜덤워크)"""
+        if self.volatility:
+            for market, price in self._prices.items():
+                self._prices[market] = price * (1 + self._random.gauss(0, self.volatility))
+
+    def orderbook(self, market):
+        mid = self._base_price(market)
+        if not mid:
+            return None
+        half_spread = mid * self.spread_bps / 20000
+        tick = mid * self.tick_bps / 10000
+        units = []
+        for i in range(self.levels):
+            ask = mid + half_spread + tick * i
+            bid = mid - half_spread - tick * i
+            units.append({
+                "ask_price": ask,
+                "bid_price": bid,
+                "ask_size": self.level_notional / ask,
+                "bid_size": self.level_notional / bid
+            })
+        return {"market": market, "timestamp": int(time.time() * 1000), "orderbook_units": units}
+
+
+class RecordedOrderbook:
+    """기록된 호가 스냅샷 재생 (pyupbit.get_orderbook 응답을 한 줄씩 담은 JSONL)
+
+    advance()마다 마켓별로 다음 스냅샷으로 넘어가고, 끝에 도달하면 처음부터 반복한다.
+    """
+
+    def __init__(self, snapshots):
+        self._snapshots = {}
+        self._cursor = {}
+        for snapshot in snapshots:
+            if isinstance(snapshot, list):
+                snapshot = snapshot[0] if snapshot else None
+            if isinstance(snapshot, dict) and snapshot.get("orderbook_units"):
+                self._snapshots.setdefault(snapshot["market"], []).append(snapshot)
+        self._cursor = {market: 0 for market in self._snapshots}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.loads(line) for line in f if line.strip())
+
+    def advance(self):
+        for market, cursor in self._cursor.items():
+            self._cursor[market] = (cursor + 1) % len(self._snapshots[market])
+
+    def orderbook(self, market):
+        snapshots = self._snapshots.get(market)
+        if not snapshots:
+            return None
+        return snapshots[self._cursor[market]]
+
+
+class PaperExchange:
+    """프로세스 내 모의 거래소
+
+    PortfolioManager/TradeExecutor/AccountSnapshot/OrderTracker가 쓰는
+    pyupbit.Upbit 메서드와 시세 조회(get_current_price, get_orderbook)를 구현한다.
+    시장가 주문은 호가창을 위에서부터 소진하며 즉시 체결되고, 잔량이 부족하면
+    업비트와 같이 체결분만 남기고 'cancel' 상태가 된다.
+    """
+
+    def __init__(self, initial_krw=None, books=None, fee_rate=None):
+        self.books = books or SyntheticOrderbook({})
+        self.fee_rate = fee_rate if fee_rate is not None else TradingConfig.TRADING_FEE_RATE
+        self.min_order = TradingConfig.MIN_TRADE_AMOUNT
+        self._lock = threading.Lock()
+        self._balances = {}  # currency -> {"balance", "avg_buy_price"}
+        self._orders = {}
+        self.order_count = 0
+        self._credit("KRW", initial_krw if initial_krw is not None else TradingConfig.PAPER_INITIAL_KRW)
+
+    @classmethod
+    def live(cls, initial_krw=None, **kwargs):
+        """실시간 시세(공개 API)를 기준 가격으로 쓰는 모의 거래소"""
+        import pyupbit
+        return cls(initial_krw, SyntheticOrderbook(pyupbit.get_current_price, **kwargs))
+
+    def _credit(self, currency, amount, price=None):
+        item = self._balances.setdefault(currency, {"balance": 0.0, "avg_buy_price": 0.0})
+        if price is not None and amount > 0:
+            total = item["balance"] + amount
+            item["avg_buy_price"] = (item["balance"] * item["avg_buy_price"] + amount * price) / total
+        item["balance"] += amount
+        if currency != "KRW" and item["balance"] <= 1e-10:
+            del self._balances[currency]
+
+    def advance(self):
+        """호가창을 다음 시점으로 이동"""
+        self.books.advance()
+
+    # 시세 조회 (pyupbit 모듈 함수와 같은 형태)
+    def get_orderbook(self, ticker="KRW-BTC"):
+        return self.books.orderbook(ticker)
+
+    def get_current_price(self, ticker="KRW-BTC"):
+        if isinstance(ticker, list):
+            prices = {t: self._mid(t) for t in ticker}
+            return {t: p for t, p in prices.items() if p}
+        return self._mid(ticker)
+
+    def _mid(self, market):
+        book = self.books.orderbook(market)
+        if not book or not book.get("orderbook_units"):
+            return None
+        best = book["orderbook_units"][0]
+        return (float(best["ask_price"]) + float(best["bid_price"])) / 2
+
+    # 계좌 조회 (pyupbit.Upbit 메서드와 같은 형태)
+    def get_balances(self):
+        with self._lock:
+            return [
+                {
+                    "currency": currency,
+                    "balance": f"{item['balance']:.8f}",
+                    "locked": "0",
+                    "avg_buy_price": str(item["avg_buy_price"]),
+                    "avg_buy_price_modified": False,
+                    "unit_currency": "KRW"
+                }
+                for currency, item in self._balances.items()
+            ]
+
+    def get_balance(self, ticker="KRW"):
+        currency = ticker.replace("KRW-", "")
+        with self._lock:
+            return self._balances.get(currency, {}).get("balance", 0.0)
+
+    def get_order(self, ticker_or_uuid, state="wait"):
+        """uuid면 주문 상세, 마켓이면 해당 상태 주문 목록 (시장가는 즉시 체결되므로 대기 주문 없음)"""
+        with self._lock:
+            if ticker_or_uuid in self._orders:
+                return self._orders[ticker_or_uuid]
+        if ticker_or_uuid.startswith("KRW-"):
+            return [] if state == "wait" else [
+                o for o in self._orders.values() if o["market"] == ticker_or_uuid and o["state"] == state
+            ]
+        return {"error": {"name": "order_not_found", "message": "주문을 찾지 못했습니다."}}
+
+    # 주문
+    def buy_market_order(self, ticker, price):
+        return self._market_order(ticker, "bid", funds=float(price))
+
+    def sell_market_order(self, ticker, volume):
+        return self._market_order(ticker, "ask", volume=float(volume))
+
+    def _market_order(self, market, side, funds=None, volume=None):
+        book = self.books.orderbook(market)
+        units = book.get("orderbook_units") if book else None
+        if not units:
+            return {"error": {"name": "market_does_not_exist", "message": f"{market} 호가 없음"}}
+
+        currency = market.replace("KRW-", "")
+        with self._lock:
+            if side == "bid":
+                if funds < self.min_order:
+                    return {"error": {"name": "under_min_total_bid", "message": "최소주문금액 이상으로 주문해주세요"}}
+                if funds * (1 + self.fee_rate) > self._balances.get("KRW", {}).get("balance", 0.0) + 1e-6:
+                    return {"error": {"name": "insufficient_funds_bid", "message": "주문가능한 금액(KRW)이 부족합니다."}}
+            else:
+                held = self._balances.get(currency, {}).get("balance", 0.0)
+                if volume > held + 1e-12:
+                    return {"error": {"name": "insufficient_funds_ask", "message": f"주문가능한 금액({currency})이 부족합니다."}}
+
+            trades = self._match(units, side, funds, volume)
+            filled_volume = sum(t["volume"] for t in trades)
+            filled_funds = sum(t["funds"] for t in trades)
+            fee = filled_funds * self.fee_rate
+
+            if side == "bid":
+                self._credit("KRW", -(filled_funds + fee))
+                if filled_volume > 0:
+                    self._credit(currency, filled_volume, filled_funds / filled_volume)
+                complete = filled_funds >= funds - 1e-6
+            else:
+                self._credit(currency, -filled_volume)
+                self._credit("KRW", filled_funds - fee)
+                complete = filled_volume >= volume - 1e-12
+
+            self.order_count += 1
+            order_id = str(uuid.uuid4())
+            created_at = datetime.now(KST).isoformat(timespec="seconds")
+            detail = {
+                "uuid": order_id,
+                "side": side,
+                "ord_type": "price" if side == "bid" else "market",
+                "price": str(funds) if side == "bid" else None,
+                "state": "done" if complete else "cancel",
+                "market": market,
+                "created_at": created_at,
+                "volume": None if side == "bid" else str(volume),
+                "remaining_volume": None if side == "bid" else str(volume - filled_volume),
+                "executed_volume": str(filled_volume),
+                "paid_fee": str(fee),
+                "trades_count": len(trades),
+                "trades": [
+                    {
+                        "market": market,
+                        "uuid": f"{order_id}-{i}",
+                        "price": str(t["price"]),
+                        "volume": str(t["volume"]),
+                        "funds": str(t["funds"]),
+                        "side": side,
+                        "created_at": created_at
+                    }
+                    for i, t in enumerate(trades)
+                ]
+            }
+            self._orders[order_id] = detail
+
+        # 주문 응답은 접수 시점 형태 (체결 내역은 get_order로 확인)
+        response = {key: detail[key] for key in ("uuid", "side", "ord_type", "price", "market", "created_at", "volume")}
+        response["state"] = "wait"
+        return response
+
+    @staticmethod
+    def _match(units, side, funds=None, volume=None):
+        """호가 단위를 차례로 소진 (매수는 금액, 매도는 수량 기준)"""
+        key = "ask" if side == "bid" else "bid"
+        trades = []
+        for unit in units:
+            price = float(unit[f"{key}_price"])
+            size = float(unit[f"{key}_size"])
+            if side == "bid":
+                if funds <= 1e-9:
+                    break
+                take = min(size, funds / price)
+                funds -= take * price
+            else:
+                if volume <= 1e-12:
+                    break
+                take = min(size, volume)
+                volume -= take
+            if take > 0:
+                trades.append({"price": price, "volume": take, "funds": take * price})
+        return trades
+
+
+def _benchmark(cycles=5000):
+    """모의 거래소 위에서 사이클(상태 조회 → 매매 → 체결 확인) 처리량 측정"""
+    from trading.portfolio import PortfolioManager
+    from trading.executor import TradeExecutor
+    from trading.ledger import PositionLedger
+    from trading.risk import PreTradeRiskEngine
+
+    books = SyntheticOrderbook({"KRW-BTC": 90_000_000, "KRW-ETH": 4_000_000}, volatility=0.001, seed=1)
+    exchange = PaperExchange(TradingConfig.PAPER_INITIAL_KRW, books)
+    # 원장은 파일에 남기지 않음
+    portfolio = PortfolioManager(exchange, "KRW-BTC", ledger=PositionLedger(os.devnull), market=exchange)
+    # 일일 거래 한도는 벤치마크에서 제외
+    risk_engine = PreTradeRiskEngine(portfolio.account, {"max_daily_turnover": None})
+    executor = TradeExecutor(exchange, portfolio, "KRW-BTC", risk_engine)
+    actions = ["buy", "hold", "sell"]
+
+    started = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for i in range(cycles):
+            status = portfolio.get_investment_status()
+            executor.execute_trade({"recommendation": actions[i % 3], "confidence": 9, "risk_level": "low"}, status)
+            exchange.advance()
+    elapsed = time.perf_counter() - started
+    executor.orders.stop()
+
+    with redirect_stdout(io.StringIO()):
+        final = portfolio.get_investment_status()
+    print(f"{cycles} cycles in {elapsed:.2f}s ({cycles / elapsed:,.0f} cycles/s), "
+          f"orders {exchange.order_count}, total {final['total_asset']:,.0f} KRW")
+
+
+if __name__ == "__main__":
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -1,46 +1,48 @@
 # trading/portfolio.py
-import pyupbit
 from config.settings import TradingConfig
+from utils.lazy import lazy_import
 from utils.logger import TradingLogger
+from utils.cycle_cache import cycle_cached
+from trading.account import AccountSnapshot
+from data.price_table import fetch_prices
 import traceback
 
+pyupbit = lazy_import("pyupbit")
+
 class PortfolioManager:
 
     """포트폴리오 관리 클래스"""
     
-    def __init__(self, upbit_client, target_coin=None):
+    def __init__(self, upbit_client, target_coin=None, account=None, ledger=None, market=None, logger=None):
         self.upbit = upbit_client
         self.target_coin = target_coin or TradingConfig.TARGET_COIN
-        self.logger = TradingLogger()
+        self.account = account or AccountSnapshot(upbit_client)
+        self.ledger = ledger
+        self.market = market or pyupbit  # 시세 출처 (모의 거래소 사용 시 교체)
+        self.logger = logger or TradingLogger()
+
+    def set_target_coin(self, target_coin):
+        """대상 코인 변경 (객체 재생성 없이)"""
+        self.target_coin = target_coin
     
+    @cycle_cached(key=lambda self, coin_symbol=None: coin_symbol or self.target_coin)
     def get_investment_status(self, coin_symbol=None):
         """현재 투자 상태 조회"""
         try:
             target_coin = coin_symbol or self.target_coin
             coin_currency = target_coin.replace('KRW-', '')
             
-            # 전체 잔고 조회 및 요약 출력
-            balances = self.upbit.get_balances()
+            # 전체 잔고 (스냅샷) 및 요약 출력
+            balances = self.account.balances
             self._log_balances_summary(balances, target_coin)
             
-            # KRW 잔고
-            krw_balance = self.upbit.get_balance("KRW")
+            # KRW / 코인 잔고
+            krw_balance = self.account.balance("KRW")
+            coin_balance = self.account.balance(coin_currency)
             
-            # 코인 잔고
-            try:
-                coin_balance = self.upbit.get_balance(coin_currency) or 0
-            except Exception as balance_error:
-                print(f"[WARNING] Balance error for {coin_currency}: {balance_error}")
-                coin_balance = 0
-            
-            # 현재 코인 가격
-            try:
-                current_price = pyupbit.get_current_price(target_coin)
-                if current_price is None:
-                    current_price = 0
-            except Exception as price_error:
-                print(f"[WARNING] Price error for {target_coin}: {price_error}")
-                current_price = 0
+            # 현재 코인 가격 (실패 시 마지막 확인 시세)
+            prices, _ = fetch_prices([target_coin], market=self.market)
+            current_price = prices.get(target_coin, 0)
             
             # 코인 평가금액
             coin_value = coin_balance * current_price if coin_balance else 0
@@ -48,29 +50,21 @@ class PortfolioManager:
             # 총 자산 (KRW + 코인 평가금액)
             total_asset = krw_balance + coin_value
             
-            # 미체결 주문 조회
-            pending_orders = self.upbit.get_order(target_coin, state="wait")
+            # 미체결 주문 수
+            pending_orders_count = self.account.pending_orders_count(target_coin)
             
             investment_status = {
                 "target_coin": target_coin,
                 "coin_currency": coin_currency,
                 "krw_balance": krw_balance,
                 "coin_balance": coin_balance,
-                "coin_avg_buy_price": None,
+                "coin_avg_buy_price": self.account.avg_buy_price(coin_currency),
                 "coin_current_price": current_price,  
                 "coin_value": coin_value,
                 "total_asset": total_asset,
-                "pending_orders_count": len(pending_orders) if pending_orders else 0
+                "pending_orders_count": pending_orders_count
             }
             
-            # 코인 평균 매수가 찾기
-            for balance_info in balances:
-                if balance_info['currency'] == coin_currency:
-                    investment_status["coin_avg_buy_price"] = float(
-                        balance_info.get('avg_buy_price', 0)
-                    )
-                    break
-            
             return investment_status
             
         except Exception as e:
@@ -106,10 +100,11 @@ class PortfolioManager:
         except Exception as e:
             print(f"[WARNING] Error showing balance summary: {e}")
 
+    @cycle_cached(key=lambda self: ())
     def get_comprehensive_investment_status(self):
         """모든 지원되는 코인에 대한 종합적인 투자 상태를 조회합니다."""
         try:
-            balances = self.upbit.get_balances()
+            balances = self.account.balances
             self.logger.log_debug(f"Fetched balances: {balances}")
             krw_balance = 0
             total_coin_value = 0
@@ -122,6 +117,8 @@ class PortfolioManager:
                     break
             self.logger.log_debug(f"KRW Balance: {krw_balance}")
 
+            # 보유 코인 목록 확정 후 시세는 한 번에 조회
+            holdings = []
             for coin_symbol in TradingConfig.SUPPORTED_COINS:
                 coin_currency = coin_symbol.replace('KRW-', '')
                 coin_balance = 0
@@ -132,48 +129,34 @@ class PortfolioManager:
                         coin_balance = float(balance['balance'])
                         avg_buy_price = float(balance.get('avg_buy_price', 0))
                         break
-                self.logger.log_debug(f"Processing {coin_symbol}: Balance={coin_balance}, Avg Buy Price={avg_buy_price}")
-
+                
                 if coin_balance > 0:
-                    import time
-                    current_price = None
-                    
-                    # Try to get price with retry logic
-                    for attempt in range(4):  # 0, 1, 2, 3 (4 attempts total)
-                        try:
-                            current_price = pyupbit.get_current_price(coin_symbol)
-                            self.logger.log_debug(f"Current price for {coin_symbol} (attempt {attempt + 1}): {current_price}")
-                            
-                            # If we got a valid price, break out of retry loop
-                            if current_price is not None and current_price > 0:
-                                break
-                                
-                            # If price is invalid and we have more attempts, retry after delay
-                            if attempt < 3:
-                                delay = (attempt + 1) * 0.5  # 0.5s, 1s, 1.5s delays
-                                self.logger.log_debug(f"Invalid price ({current_price}), retrying {coin_symbol} after {delay}s delay...")
-                                time.sleep(delay)
-                            
-                        except Exception as e:
-                            self.logger.log_warning(f"Failed to get current price for {coin_symbol} (attempt {attempt + 1}): {e}")
-                            if attempt < 3:
-                                time.sleep((attempt + 1) * 0.5)
-
-                    if current_price is None or current_price == 0:
-                        self.logger.log_warning(f"Current price for {coin_symbol} is invalid ({current_price}) after all retries. Skipping this coin.")
-                        continue
-                    
-                    coin_value = coin_balance * current_price
-                    total_coin_value += coin_value
-                    all_coins_status.append({
-                        "symbol": coin_symbol,
-                        "balance": coin_balance,
-                        "avg_buy_price": avg_buy_price,
-                        "current_price": current_price,
-                        "value": coin_value
-                    })
+                    holdings.append((coin_symbol, coin_balance, avg_buy_price))
                 else:
                     self.logger.log_debug(f"No balance for {coin_symbol}. Skipping.")
+            
+            prices, stale = fetch_prices([symbol for symbol, _, _ in holdings], market=self.market)
+            if stale:
+                self.logger.log_warning(f"Using last known prices for: {', '.join(stale)}")
+            
+            for coin_symbol, coin_balance, avg_buy_price in holdings:
+                current_price = prices.get(coin_symbol)
+                self.logger.log_debug(f"Processing {coin_symbol}: Balance={coin_balance}, Avg Buy Price={avg_buy_price}, Price={current_price}")
+                
+                if not current_price:
+                    self.logger.log_warning(f"Current price for {coin_symbol} is unavailable. Skipping this coin.")
+                    continue
+                
+                coin_value = coin_balance * current_price
+                total_coin_value += coin_value
+                all_coins_status.append({
+                    "symbol": coin_symbol,
+                    "balance": coin_balance,
+                    "avg_buy_price": avg_buy_price,
+                    "current_price": current_price,
+                    "value": coin_value,
+                    "price_is_stale": coin_symbol in stale
+                })
 
             total_asset = krw_balance + total_coin_value
             
@@ -200,6 +183,19 @@ class PortfolioManager:
             current_price = status["coin_current_price"]
             coin_name = status["coin_currency"]
             
+            # 로컬 원장이 있으면 체결 기반 평균단가/실현손익 사용
+            position = self.ledger.position(status["target_coin"]) if self.ledger else None
+            if position:
+                pnl = position.to_dict(current_price)
+                profit_loss = pnl["unrealized_pnl"]
+                profit_rate = ((current_price - position.avg_price) / position.avg_price) * 100 if position.avg_price else 0
+                return {
+                    "profit_loss": profit_loss,
+                    "profit_rate": profit_rate,
+                    "realized_pnl": pnl["realized_pnl"],
+                    "message": f"{'수익' if profit_loss > 0 else '손실'}: {abs(profit_loss):,.0f}원 ({profit_rate:+.2f}%), 실현손익: {pnl['realized_pnl']:+,.0f}원"
+                }
+            
             if not coin_balance or not avg_buy_price:
                 return {
                     "profit_loss": 0,
@@ -224,12 +220,8 @@ class PortfolioManager:
     def can_buy(self, amount):
         """매수 가능 여부 확인"""
         try:
-            status = self.get_investment_status()
-            if not status:
-                return False
-            
             return (
-                status["krw_balance"] >= amount and 
+                self.account.balance("KRW") >= amount and 
                 amount >= TradingConfig.MIN_TRADE_AMOUNT
             )
             
@@ -0,0 +1,242 @@
+# trading/protective_monitor.py
+import time
+import queue
+import threading
+from config.settings import TradingConfig
+from utils.lazy import lazy_import
+from data.price_table import get_price_table
+
+pyupbit = lazy_import("pyupbit")
+
+
+def _percent(value):
+    """'5', '5%', 5, '-5%' 형태의 기준값을 양수 비율(%)로 변환 (해석 불가 시 None)"""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = abs(float(str(value).strip().rstrip('%')))
+    except ValueError:
+        return None
+    return number if number > 0 else None
+
+
+class ProtectiveRule:
+    """마켓 하나의 손절/익절/트레일링 스탑 기준 (진입가 대비 %)"""
+
+    def __init__(self, stop_loss=None, take_profit=None, trailing_stop=None):
+        self.stop_loss = _percent(stop_loss)
+        self.take_profit = _percent(take_profit)
+        self.trailing_stop = _percent(trailing_stop)
+
+    @classmethod
+    def from_risk_management(cls, risk_management):
+        risk_management = risk_management or {}
+        return cls(
+            risk_management.get("stop_loss"),
+            risk_management.get("take_profit"),
+            risk_management.get("trailing_stop")
+        )
+
+    @property
+    def is_empty(self):
+        return self.stop_loss is None and self.take_profit is None and self.trailing_stop is None
+
+    def evaluate(self, price, entry_price, peak_price):
+        """발동 사유 반환 (없으면 None)"""
+        if not entry_price:
+            return None
+        change = (price / entry_price - 1) * 100
+        if self.stop_loss is not None and change <= -self.stop_loss:
+            return f"손절 ({change:+.2f}% <= -{self.stop_loss}%)"
+        if self.take_profit is not None and change >= self.take_profit:
+            return f"익절 ({change:+.2f}% >= +{self.take_profit}%)"
+        if self.trailing_stop is not None and peak_price and peak_price > entry_price:
+            drop = (price / peak_price - 1) * 100
+            if drop <= -self.trailing_stop:
+                return f"트레일링 스탑 (고점 {peak_price:,.0f}원 대비 {drop:+.2f}%)"
+        return None
+
+    def to_dict(self):
+        return {
+            "stop_loss": self.stop_loss,
+            "take_profit": self.take_profit,
+            "trailing_stop": self.trailing_stop
+        }
+
+
+class ProtectiveMonitor:
+    """AI 사이클과 별도로 보유 포지션의 손절/익절/트레일링 스탑을 감시
+
+    시세 테이블 구독 콜백에서 틱마다 규칙을 평가하므로(딕셔너리 조회 몇 번)
+    어떤 경로로든 시세가 갱신되면 바로 판단한다. 자체 스레드는 보유 마켓
+    시세를 PROTECTIVE_POLL_INTERVAL마다 조회해 테이블에 넣고, 발동된
+    청산을 TradeExecutor로 실행한다 (콜백 스레드에서 주문하지 않음).
+
+    executor_factory: callable(market) -> TradeExecutor
+    """
+
+    def __init__(self, account, executor_factory, ledger=None, price_table=None, market=None,
+                 poll_interval=None):
+        self.account = account
+        self.executor_factory = executor_factory
+        self.ledger = ledger
+        self.price_table = price_table or get_price_table()
+        self.market = market or pyupbit
+        self.poll_interval = poll_interval or TradingConfig.PROTECTIVE_POLL_INTERVAL
+        self._lock = threading.Lock()
+        # AI 결정에 규칙이 없는 보유 마켓에 적용 (마켓별 규칙과 별도, 설정값으로 고정)
+        self._default_rule = ProtectiveRule(**TradingConfig.PROTECTIVE_DEFAULT_RULE)
+        self._rules = {}
+        self._peaks = {}  # 마켓별 트레일링 스탑 고점 (_lock으로 보호)
+        self._pending = set()
+        self._cooldown_until = {}
+        self._triggers = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+        self.exits = []
+
+    def set_rules(self, risk_management, market=None):
+        """AI 결정의 risk_management 반영 (market이 없으면 규칙이 없는 보유 마켓의 기본값을 교체)"""
+        rule = ProtectiveRule.from_risk_management(risk_management)
+        with self._lock:
+            if market is None:
+                self._default_rule = rule
+            else:
+                self._rules[market] = rule
+
+    def rule_for(self, market):
+        with self._lock:
+            rule = self._rules.get(market)
+            return rule if rule is not None and not rule.is_empty else self._default_rule
+
+    def _entry_price(self, market, item):
+        """진입가: 원장 평균 단가(수수료 포함) → 스냅샷 평균 매수가"""
+        if self.ledger is not None:
+            position = self.ledger.position(market)
+            if position is not None and position.avg_price:
+                return position.avg_price
+        return float(item.get("avg_buy_price", 0))
+
+    def _held_markets(self):
+        """스냅샷 기준 보유 마켓 (I/O 없음)"""
+        balances = self.account.peek() or {}
+        return [
+            f"KRW-{currency}" for currency, item in balances.items()
+            if currency != "KRW" and float(item.get("balance", 0)) > 0
+        ]
+
+    def on_price(self, ticker, price, timestamp=None):
+        """시세 테이블 콜백: 규칙 평가 후 발동 시 청산 대기열에 추가"""
+        balances = self.account.peek()
+        item = (balances or {}).get(ticker.replace("KRW-", ""))
+        if not item or float(item.get("balance", 0)) <= 0:
+            with self._lock:
+                self._peaks.pop(ticker, None)
+            return
+
+        rule = self.rule_for(ticker)
+        if rule.is_empty:
+            return
+
+        with self._lock:
+            peak = max(self._peaks.get(ticker, price), price)
+            self._peaks[ticker] = peak
+            if ticker in self._pending or time.time() < self._cooldown_until.get(ticker, 0):
+                return
+        reason = rule.evaluate(price, self._entry_price(ticker, item), peak)
+        if reason:
+            with self._lock:
+                self._pending.add(ticker)
+            self._triggers.put((ticker, price, reason, time.time()))
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.price_table.subscribe(self.on_price)
+        self._thread = threading.Thread(target=self._run, name="protective-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self.price_table.unsubscribe(self.on_price)
+
+    def _run(self):
+        next_poll = time.monotonic()
+        while not self._stop.is_set():
+            timeout = max(0.0, next_poll - time.monotonic())
+            try:
+                trigger = self._triggers.get(timeout=timeout)
+            except queue.Empty:
+                trigger = None
+
+            if trigger is not None:
+                self._exit(*trigger)
+                continue
+            self._poll_prices()
+            next_poll = time.monotonic() + self.poll_interval
+
+    def _poll_prices(self):
+        """보유 마켓 시세 조회 → 시세 테이블 갱신 (구독 콜백에서 규칙 평가)"""
+        markets = [m for m in self._held_markets() if not self.rule_for(m).is_empty]
+        if not markets:
+            return
+        try:
+            prices = self.market.get_current_price(markets if len(markets) > 1 else markets[0])
+            if not isinstance(prices, dict):
+                prices = {markets[0]: prices}
+            self.price_table.update_many({m: p for m, p in prices.items() if p})
+        except Exception as e:
+            print(f"[WARNING] 보호 주문 시세 조회 실패: {e}")
+
+    def _exit(self, market, price, reason, detected_at):
+        """발동된 규칙을 TradeExecutor로 청산"""
+        try:
+            executor = self.executor_factory(market)
+            success = executor.exit_position(reason)
+            self.exits.append({
+                "market": market,
+                "price": price,
+                "reason": reason,
+                "success": bool(success),
+                "reaction_ms": round((time.time() - detected_at) * 1000, 1),
+                "timestamp": time.time()
+            })
+            del self.exits[:-TradingConfig.ORDER_HISTORY_SIZE]
+        except Exception as e:
+            print(f"[ERROR] 보호 주문 청산 오류 ({market}): {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(market)
+                # 체결 후 잔고가 반영될 때까지 같은 마켓 재발동 방지
+                self._cooldown_until[market] = time.time() + TradingConfig.PROTECTIVE_EXIT_COOLDOWN
+                self._peaks.pop(market, None)
+
+    def snapshot_state(self):
+        """체크포인트용 상태 (규칙과 트레일링 스탑 고점)"""
+        with self._lock:
+            return {
+                "default_rule": self._default_rule.to_dict(),
+                "rules": {market: rule.to_dict() for market, rule in self._rules.items()},
+                "peaks": dict(self._peaks)
+            }
+
+    def restore_state(self, state):
+        """체크포인트 복원 - 재시작 직후 첫 AI 결정 전에도 마켓별 보호 기준 유지 (기본 규칙은 설정값)"""
+        with self._lock:
+            if not self._rules:
+                self._rules = {market: ProtectiveRule(**rule) for market, rule in state.get("rules", {}).items()}
+            for market, peak in state.get("peaks", {}).items():
+                self._peaks[market] = max(self._peaks.get(market, peak), peak)
+
+    def status(self):
+        with self._lock:
+            rules = {market: rule.to_dict() for market, rule in self._rules.items()}
+            default = self._default_rule.to_dict()
+            peaks = dict(self._peaks)
+        return {
+            "default_rule": default,
+            "rules": rules,
+            "peaks": peaks,
+            "recent_exits": self.exits[-5:]
+        }
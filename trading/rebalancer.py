@@ -0,0 +1,201 @@
+# trading/rebalancer.py
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import TradingConfig
+from utils.lazy import lazy_import
+from data.price_table import fetch_prices, get_price_table
+from utils.cycle_cache import invalidate_cycle_cache
+
+pyupbit = lazy_import("pyupbit")
+
+
+class _RateLimiter:
+    """초당 요청 수 제한 (스레드 간 공유, 요청 간 최소 간격 유지)"""
+
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second if per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class Rebalancer:
+    """목표 비중으로 포트폴리오를 한 사이클 안에 재조정
+
+    목표와의 차이가 허용 범위(REBALANCE_DRIFT_THRESHOLD) 이내거나 최소 주문
+    금액 미만인 코인은 건드리지 않는다. 매도를 먼저 동시에 제출해 체결까지
+    기다린 뒤, 확보된 현금 안에서 매수를 동시에 제출한다. 모든 주문은 초당
+    주문 제한 안에서 나가고 주문 추적기로 종료 상태까지 확인한다.
+
+    목표 비중에 없는 보유 코인은 그대로 두며, 0을 지정하면 전량 매도한다.
+    """
+
+    def __init__(self, upbit_client, account, order_tracker, risk_engine, ledger=None, market=None):
+        self.upbit = upbit_client
+        self.account = account
+        self.orders = order_tracker
+        self.risk = risk_engine
+        self.ledger = ledger
+        self.market = market or pyupbit
+        self.fee_rate = TradingConfig.TRADING_FEE_RATE
+        self.min_notional = TradingConfig.MIN_TRADE_AMOUNT
+        self._limiter = _RateLimiter(TradingConfig.REBALANCE_ORDERS_PER_SECOND)
+
+    @staticmethod
+    def normalize_weights(target_weights):
+        """목표 비중 정리: 숫자 변환, 단일 코인 한도 적용, 합계 1 초과 시 비례 축소"""
+        weights = {}
+        for market, weight in (target_weights or {}).items():
+            try:
+                weight = float(weight)
+            except (TypeError, ValueError):
+                continue
+            if market.startswith("KRW-") and weight >= 0:
+                weights[market] = min(weight, TradingConfig.MAX_SINGLE_COIN_EXPOSURE)
+        total = sum(weights.values())
+        if total > 1:
+            weights = {market: weight / total for market, weight in weights.items()}
+        return weights
+
+    def plan(self, target_weights):
+        """목표 비중 → 최소 주문 목록
+
+        반환: {"equity", "current_weights", "target_weights", "sells", "buys", "stale_prices"}
+        sells: [{"market", "volume", "notional"}], buys: [{"market", "krw_amount"}]
+        """
+        weights = self.normalize_weights(target_weights)
+        balances = self.account.balances
+        holdings = {
+            f"KRW-{item['currency']}": float(item.get("balance", 0))
+            for item in balances if item["currency"] != "KRW" and float(item.get("balance", 0)) > 0
+        }
+        markets = list(dict.fromkeys(list(holdings) + list(weights)))
+        prices, stale = fetch_prices(markets, market=self.market)
+
+        cash = self.account.balance("KRW")
+        values = {market: holdings.get(market, 0.0) * prices.get(market, 0.0) for market in markets}
+        equity = cash + sum(values.values())
+
+        sells, buys = [], []
+        tolerance = max(self.min_notional, equity * TradingConfig.REBALANCE_DRIFT_THRESHOLD)
+        for market, weight in weights.items():
+            price = prices.get(market)
+            if not price:
+                continue
+            delta = weight * equity - values.get(market, 0.0)
+            if weight == 0 and holdings.get(market):
+                # 0 비중은 잔량 없이 전량 매도
+                sells.append({"market": market, "volume": holdings[market], "notional": values[market]})
+            elif delta <= -tolerance:
+                volume = min(holdings.get(market, 0.0), -delta / price)
+                sells.append({"market": market, "volume": volume, "notional": volume * price})
+            elif delta >= tolerance:
+                buys.append({"market": market, "krw_amount": delta})
+
+        # 매수 총액이 (현금 + 매도 대금)을 넘지 않도록 비례 축소
+        available = cash + sum(s["notional"] for s in sells) * (1 - self.fee_rate)
+        required = sum(b["krw_amount"] for b in buys) * (1 + self.fee_rate)
+        if required > available > 0:
+            scale = available / required
+            for buy in buys:
+                buy["krw_amount"] *= scale
+        buys = [b for b in buys if b["krw_amount"] >= self.min_notional]
+
+        return {
+            "equity": equity,
+            "current_weights": {m: round(v / equity, 4) for m, v in values.items() if equity > 0 and v > 0},
+            "target_weights": weights,
+            "sells": sells,
+            "buys": buys,
+            "stale_prices": stale
+        }
+
+    def rebalance(self, target_weights):
+        """계획 수립 → 매도 동시 실행 → 잔고 갱신 → 매수 동시 실행"""
+        started = time.monotonic()
+        plan = self.plan(target_weights)
+        if not plan["sells"] and not plan["buys"]:
+            print("리밸런싱 불필요 (목표 비중 허용 범위 이내)")
+            return {"plan": plan, "orders": [], "success": True, "elapsed": time.monotonic() - started}
+
+        print(f"리밸런싱: 매도 {len(plan['sells'])}건, 매수 {len(plan['buys'])}건 "
+              f"(총자산 {plan['equity']:,.0f}원)")
+
+        results = self._run_batch([("ask", s["market"], s["volume"]) for s in plan["sells"]])
+
+        if plan["buys"]:
+            # 매도 체결 반영된 잔고로 매수 금액 재확인
+            self.account.invalidate()
+            cash = self.account.balance("KRW")
+            required = sum(b["krw_amount"] for b in plan["buys"]) * (1 + self.fee_rate)
+            # 수수료/반올림 오차로 마지막 매수가 잔고 부족이 되지 않도록 약간 여유를 둠
+            scale = min(1.0, cash * 0.999 / required) if required > 0 else 0.0
+            buys = [(b["market"], b["krw_amount"] * scale) for b in plan["buys"]]
+            results += self._run_batch([("bid", market, amount) for market, amount in buys if amount >= self.min_notional])
+
+        self.account.invalidate()
+        invalidate_cycle_cache("PortfolioManager.")
+
+        filled = [r for r in results if r["filled"]]
+        print(f"리밸런싱 완료: {len(filled)}/{len(results)}건 체결, {time.monotonic() - started:.2f}초")
+        return {
+            "plan": plan,
+            "orders": results,
+            "success": bool(results) and len(filled) == len(results),
+            "elapsed": time.monotonic() - started
+        }
+
+    def _run_batch(self, orders):
+        """주문 묶음을 동시에 제출하고 모두 종료될 때까지 대기"""
+        if not orders:
+            return []
+        workers = min(len(orders), TradingConfig.REBALANCE_MAX_CONCURRENCY)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda order: self._place(*order), orders))
+
+    def _place(self, side, market, amount):
+        """주문 1건: 사전 점검 → 제출 (요청 제한) → 체결 확인"""
+        label = "매도" if side == "ask" else "매수"
+        result = {"market": market, "side": side, "amount": amount, "filled": False}
+        try:
+            if side == "ask":
+                check = self.risk.check_order(market, side, volume=amount)
+            else:
+                check = self.risk.check_order(market, side, krw_amount=amount)
+            if not check:
+                result["error"] = "; ".join(check.reasons)
+                print(f"{label} 건너뜀 ({market}): {result['error']}")
+                return result
+
+            self._limiter.acquire()
+            if side == "ask":
+                response = self.upbit.sell_market_order(market, amount)
+            else:
+                response = self.upbit.buy_market_order(market, amount)
+            if not isinstance(response, dict) or "uuid" not in response:
+                result["error"] = f"주문 실패: {response}"
+                print(f"{label} 실패 ({market}): {response}")
+                return result
+
+            self.risk.record_order(market, side, check.notional, amount if side == "ask" else None)
+            if self.ledger is not None:
+                self.ledger.record_order(response, market=market, side=side)
+            tracked = self.orders.track(response, market, side, arrival_price=get_price_table().get(market))
+            tracked = self.orders.wait(tracked.uuid, TradingConfig.REBALANCE_ORDER_TIMEOUT)
+
+            result.update(tracked.to_dict())
+            result["filled"] = tracked.is_filled
+            price = f"{tracked.avg_price:,.2f}원" if tracked.avg_price else "N/A"
+            print(f"{label} {market}: {tracked.state}, {tracked.executed_volume:.8f} @ {price}")
+        except Exception as e:
+            result["error"] = str(e)
+            print(f"{label} 오류 ({market}): {e}")
+        return result
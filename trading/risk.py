@@ -0,0 +1,152 @@
+# trading/risk.py
+import time
+import threading
+from datetime import date
+from config.settings import TradingConfig
+from data.price_table import get_price_table
+
+
+class RiskCheckResult:
+    """주문 사전 점검 결과"""
+
+    def __init__(self, reasons=None, notional=0.0):
+        self.reasons = reasons or []
+        self.notional = notional
+
+    @property
+    def approved(self):
+        return not self.reasons
+
+    def __bool__(self):
+        return self.approved
+
+    def __repr__(self):
+        return f"RiskCheckResult(approved={self.approved}, reasons={self.reasons})"
+
+
+class PreTradeRiskEngine:
+    """캐시된 계좌 스냅샷 기반 주문 사전 리스크 점검 (I/O 없음)
+
+    스냅샷 이후 이 엔진을 통과한 주문 금액/수량은 예약분으로 잡아두고,
+    스냅샷이 새로 채워지면 예약분을 초기화한다. 일일 거래 금액은 원장이
+    있으면 오늘 체결분으로 시작하므로 재시작해도 한도가 초기화되지 않는다.
+    """
+
+    def __init__(self, account, limits=None, price_table=None, ledger=None):
+        self.account = account
+        self.limits = {**TradingConfig.RISK_LIMITS, **(limits or {})}
+        self.price_table = price_table or get_price_table()
+        self.fee_rate = TradingConfig.TRADING_FEE_RATE
+        self._lock = threading.Lock()
+        self._turnover_day = date.today()
+        self._daily_turnover = ledger.daily_turnover(self._turnover_day) if ledger is not None else 0.0
+        self._reserved_at = 0
+        self._reserved_krw = 0.0
+        self._reserved_volume = {}
+
+    def _price(self, market, balances):
+        """시세 테이블 → 평균 매수가 순으로 가격 추정"""
+        price = self.price_table.get(market, max_age=TradingConfig.PRICE_STALE_MAX_AGE)
+        if price:
+            return price
+        item = balances.get(market.replace('KRW-', ''))
+        return float(item.get('avg_buy_price', 0)) if item else 0.0
+
+    def _sync_reservations(self):
+        """스냅샷이 갱신됐으면 예약분 초기화, 날짜가 바뀌면 일일 회전율 초기화"""
+        if self.account.fetched_at != self._reserved_at:
+            self._reserved_at = self.account.fetched_at
+            self._reserved_krw = 0.0
+            self._reserved_volume = {}
+        today = date.today()
+        if today != self._turnover_day:
+            self._turnover_day = today
+            self._daily_turnover = 0.0
+
+    def check_order(self, market, side, krw_amount=None, volume=None, reduce_only=False):
+        """주문 점검 (side: 'bid' 매수 금액 / 'ask' 매도 수량)
+
+        reduce_only: 손절/익절 같은 포지션 축소 매도 - 잔고만 확인하고 주문 금액/
+        일일 거래 한도는 적용하지 않음 (한도 때문에 청산이 막히지 않도록)
+        """
+        with self._lock:
+            self._sync_reservations()
+            balances = self.account.peek()
+            if balances is None:
+                return RiskCheckResult(["계좌 스냅샷 없음"])
+
+            currency = market.replace('KRW-', '')
+            price = self._price(market, balances)
+            reasons = []
+
+            if side == "bid":
+                notional = krw_amount or 0.0
+                available_krw = float(balances.get('KRW', {}).get('balance', 0)) - self._reserved_krw
+                if available_krw < notional * (1 + self.fee_rate):
+                    reasons.append(f"KRW 잔고 부족 (가용 {available_krw:,.0f}원, 필요 {notional * (1 + self.fee_rate):,.0f}원)")
+            else:
+                volume = volume or 0.0
+                notional = volume * price
+                held = float(balances.get(currency, {}).get('balance', 0)) - self._reserved_volume.get(market, 0.0)
+                if volume > held + 1e-12:
+                    reasons.append(f"{currency} 잔고 부족 (보유 {held:.8f}, 매도 {volume:.8f})")
+                if reduce_only:
+                    return RiskCheckResult(reasons, notional)
+                if price <= 0:
+                    reasons.append(f"{market} 시세 없음")
+
+            if notional < self.limits["min_notional"]:
+                reasons.append(f"최소 주문 금액 미달 ({notional:,.0f}원 < {self.limits['min_notional']:,.0f}원)")
+
+            max_order = self.limits.get("max_order_krw")
+            if max_order and notional > max_order:
+                reasons.append(f"1회 주문 한도 초과 ({notional:,.0f}원 > {max_order:,.0f}원)")
+
+            max_turnover = self.limits.get("max_daily_turnover")
+            if max_turnover and self._daily_turnover + notional > max_turnover:
+                reasons.append(f"일일 거래 한도 초과 (누적 {self._daily_turnover:,.0f}원 + {notional:,.0f}원)")
+
+            if side == "bid" and price > 0:
+                exposure = self._post_trade_exposure(market, notional, price, balances)
+                max_exposure = self.limits["max_coin_exposure"]
+                if exposure > max_exposure:
+                    reasons.append(f"{currency} 비중 한도 초과 (주문 후 {exposure:.0%} > {max_exposure:.0%})")
+
+            return RiskCheckResult(reasons, notional)
+
+    def _post_trade_exposure(self, market, notional, price, balances):
+        """매수 후 해당 코인의 총자산 대비 비중"""
+        total = 0.0
+        coin_value = 0.0
+        for currency, item in balances.items():
+            amount = float(item.get('balance', 0)) + float(item.get('locked', 0))
+            if currency == 'KRW':
+                total += amount
+                continue
+            if amount <= 0:
+                continue
+            value = amount * self._price(f"KRW-{currency}", balances)
+            total += value
+            if currency == market.replace('KRW-', ''):
+                coin_value = value
+        # 매수는 현금을 코인으로 바꾸므로 총자산은 수수료만큼만 줄어듦
+        total -= notional * self.fee_rate
+        return (coin_value + notional) / total if total > 0 else 1.0
+
+    def record_order(self, market, side, notional, volume=None):
+        """통과한 주문을 예약분/일일 회전율에 반영"""
+        with self._lock:
+            self._sync_reservations()
+            self._daily_turnover += notional
+            if side == "bid":
+                self._reserved_krw += notional * (1 + self.fee_rate)
+            elif volume:
+                self._reserved_volume[market] = self._reserved_volume.get(market, 0.0) + volume
+
+    def status(self):
+        return {
+            "daily_turnover": self._daily_turnover,
+            "reserved_krw": self._reserved_krw,
+            "limits": dict(self.limits),
+            "checked_at": time.time()
+        }
@@ -0,0 +1,296 @@
+# trading/supervisor.py
+import os
+import json
+import time
+import queue
+import threading
+import multiprocessing
+from config.settings import TradingConfig, load_env
+from data.price_table import fetch_prices
+from data.shared_feed import SharedPriceFeed, SharedFeedMarket
+from utils.circuit_breaker import open_breakers
+
+TRADER_MODES = ("ai_full_auto", "single_coin")
+
+
+def load_supervisor_config(path):
+    """설정 파일 로드
+
+    {
+      "traders": [
+        {
+          "name": "btc-single",
+          "mode": "single_coin",             # ai_full_auto / single_coin
+          "access_key_env": "SUB1_ACCESS",   # 하위 계정 키를 담은 환경변수 이름 (생략 시 기본 계정)
+          "secret_key_env": "SUB1_SECRET",
+          "log_dir": "logs/btc-single",      # 생략 시 logs/<name>
+          "settings": {"TARGET_COIN": "KRW-BTC", "TRADE_INTERVAL": 60}
+        }
+      ]
+    }
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    traders = config.get("traders") or []
+    names = set()
+    for index, spec in enumerate(traders):
+        spec.setdefault("name", f"trader-{index + 1}")
+        spec.setdefault("mode", "ai_full_auto")
+        spec.setdefault("settings", {})
+        if spec["mode"] not in TRADER_MODES:
+            raise ValueError(f"알 수 없는 트레이더 모드 ({spec['name']}): {spec['mode']}")
+        if spec["name"] in names:
+            raise ValueError(f"트레이더 이름 중복: {spec['name']}")
+        names.add(spec["name"])
+    if not traders:
+        raise ValueError("설정 파일에 traders가 없습니다.")
+    return config
+
+
+# RISK_LIMITS 항목 중 다른 설정값을 클래스 정의 시점에 복사해 둔 것
+_DERIVED_RISK_LIMITS = {"min_notional": "MIN_TRADE_AMOUNT", "max_coin_exposure": "MAX_SINGLE_COIN_EXPOSURE"}
+
+
+def _apply_settings(spec):
+    """트레이더별 설정을 자식 프로세스의 TradingConfig에 반영"""
+    settings = spec.get("settings", {})
+    for key, value in settings.items():
+        if not hasattr(TradingConfig, key):
+            print(f"[WARNING] 알 수 없는 설정 무시 ({spec['name']}): {key}")
+            continue
+        if key == "RISK_LIMITS":
+            # 일부 한도만 지정해도 나머지는 기본값 유지
+            value = {**TradingConfig.RISK_LIMITS, **value}
+        setattr(TradingConfig, key, value)
+    # 원본 설정을 덮어썼으면 파생 한도도 맞춤 (RISK_LIMITS에 직접 지정한 값이 우선)
+    limits = dict(TradingConfig.RISK_LIMITS)
+    for limit, source in _DERIVED_RISK_LIMITS.items():
+        if source in settings and limit not in settings.get("RISK_LIMITS", {}):
+            limits[limit] = getattr(TradingConfig, source)
+    TradingConfig.RISK_LIMITS = limits
+    load_env()
+    for env_name, attr in (("access_key_env", "UPBIT_ACCESS_KEY"), ("secret_key_env", "UPBIT_SECRET_KEY")):
+        if spec.get(env_name):
+            setattr(TradingConfig, attr, os.getenv(spec[env_name]))
+    # 계정별 원장/저장소가 섞이지 않도록 트레이더마다 분리
+    if "DATA_STORE_DIR" not in spec.get("settings", {}):
+        TradingConfig.DATA_STORE_DIR = os.path.join(TradingConfig.DATA_STORE_DIR, spec["name"])
+
+
+def _collect_metrics(name, trader, market):
+    """트레이더 1개의 현재 지표 (스냅샷/원장 기준, 추가 I/O 없음)"""
+    balances = trader.account.peek() or {}
+    prices = {ticker: price for ticker, (price, _) in market.feed.read().items()}
+    krw = 0.0
+    coin_value = 0.0
+    for currency, item in balances.items():
+        amount = float(item.get("balance", 0)) + float(item.get("locked", 0))
+        if currency == "KRW":
+            krw += amount
+        else:
+            price = prices.get(f"KRW-{currency}") or float(item.get("avg_buy_price", 0))
+            coin_value += amount * price
+
+    scheduler = getattr(trader, "scheduler", None)
+    cycle = scheduler.stats().get("ai_cycle", {}) if scheduler is not None else {}
+    orders = trader.order_tracker.stats()
+    return {
+        "name": name,
+        "pid": os.getpid(),
+        "timestamp": time.time(),
+        "krw_balance": krw,
+        "coin_value": coin_value,
+        "equity": krw + coin_value,
+        "cycles": cycle.get("runs", 0),
+        "cycle_failures": cycle.get("failures", 0),
+        "filled_orders": orders["filled_orders"],
+        "open_orders": orders["open_orders"],
+        "protective_exits": len(trader.protective_monitor.exits),
+        "feed_hits": market.hits,
+        "feed_misses": market.misses,
+        "open_circuits": open_breakers(),
+        **trader.ledger.totals()
+    }
+
+
+def _run_trader(spec, feed_name, tickers, metrics_queue, stop_event):
+    """자식 프로세스 진입점: 설정 반영 → 공유 시세 연결 → 트레이더 실행"""
+    _apply_settings(spec)
+    # main이 이 모듈을 import하므로 순환 import를 피해 여기서 import
+    from main import AIFullAutoTrader, SingleCoinTrader
+
+    feed = SharedPriceFeed.attach(feed_name, tickers)
+    market = SharedFeedMarket(feed)
+    trader_class = AIFullAutoTrader if spec["mode"] == "ai_full_auto" else SingleCoinTrader
+    # 트레이더끼리 같은 로그 파일에 쓰지 않도록 기본값도 이름별로 분리
+    trader = trader_class(market=market, log_dir=spec.get("log_dir") or os.path.join("logs", spec["name"]))
+
+    def report():
+        while not stop_event.wait(TradingConfig.SUPERVISOR_METRICS_INTERVAL):
+            try:
+                metrics_queue.put(_collect_metrics(spec["name"], trader, market))
+            except Exception as e:
+                print(f"[WARNING] 지표 보고 실패 ({spec['name']}): {e}")
+        scheduler = getattr(trader, "scheduler", None)
+        if scheduler is not None:
+            scheduler.stop()
+
+    threading.Thread(target=report, name="metrics-reporter", daemon=True).start()
+    try:
+        trader.run_continuous()
+    finally:
+        metrics_queue.put(_collect_metrics(spec["name"], trader, market))
+        feed.shm.close()
+
+
+class Supervisor:
+    """여러 트레이더 설정을 각각 별도 프로세스로 실행
+
+    시세는 감독 프로세스 한 곳에서만 업비트로 조회해 공유 메모리 시세판에
+    기록하고, 트레이더 프로세스는 그 시세판을 시세 출처로 쓴다. 트레이더는
+    주기적으로 지표를 큐로 보내며 감독 프로세스가 이를 모아 출력한다.
+    비정상 종료된 트레이더는 SUPERVISOR_MAX_RESTARTS회까지 다시 띄운다.
+    """
+
+    def __init__(self, config):
+        self.specs = config["traders"]
+        self.tickers = self._feed_tickers(self.specs)
+        self._ctx = multiprocessing.get_context("spawn")
+        self._metrics_queue = self._ctx.Queue()
+        self._stop_event = self._ctx.Event()
+        self.feed = None
+        self.processes = {}
+        self.restarts = {spec["name"]: 0 for spec in self.specs}
+        self.metrics = {}
+
+    @staticmethod
+    def _feed_tickers(specs):
+        tickers = list(TradingConfig.SUPPORTED_COINS)
+        for spec in specs:
+            settings = spec.get("settings", {})
+            tickers += settings.get("SUPPORTED_COINS", [])
+            target = settings.get("TARGET_COIN")
+            if target and target != "AI_AUTO":
+                tickers.append(target)
+        return list(dict.fromkeys(tickers))
+
+    def start(self):
+        self.feed = SharedPriceFeed.create(self.tickers)
+        self._refresh_feed()
+        for spec in self.specs:
+            self._spawn(spec)
+
+    def _spawn(self, spec):
+        process = self._ctx.Process(
+            target=_run_trader,
+            args=(spec, self.feed.name, self.tickers, self._metrics_queue, self._stop_event),
+            name=f"trader-{spec['name']}",
+            daemon=False
+        )
+        process.start()
+        self.processes[spec["name"]] = process
+        print(f"트레이더 시작: {spec['name']} ({spec['mode']}, pid {process.pid})")
+
+    def _refresh_feed(self):
+        prices, _ = fetch_prices(self.tickers)
+        if prices:
+            self.feed.write(prices)
+
+    def run(self):
+        """stop 또는 Ctrl+C까지 시세 갱신/지표 집계/프로세스 감시"""
+        self.start()
+        next_feed = next_report = time.monotonic()
+        try:
+            while not self._stop_event.is_set():
+                now = time.monotonic()
+                if now >= next_feed:
+                    try:
+                        self._refresh_feed()
+                    except Exception as e:
+                        print(f"[WARNING] 공유 시세 갱신 실패: {e}")
+                    next_feed = now + TradingConfig.PRICE_REFRESH_INTERVAL
+                if now >= next_report:
+                    if self.metrics:
+                        self.print_report()
+                    next_report = now + TradingConfig.SUPERVISOR_REPORT_INTERVAL
+                self._check_processes()
+                self._drain_metrics(timeout=max(0.0, min(next_feed, next_report) - time.monotonic()))
+        except KeyboardInterrupt:
+            print("\n감독 프로세스 종료 중...")
+        finally:
+            self.stop()
+
+    def _drain_metrics(self, timeout):
+        try:
+            item = self._metrics_queue.get(timeout=timeout)
+        except queue.Empty:
+            return
+        while True:
+            self.metrics[item["name"]] = item
+            try:
+                item = self._metrics_queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def _check_processes(self):
+        for spec in self.specs:
+            process = self.processes.get(spec["name"])
+            if process is None or process.is_alive() or self._stop_event.is_set():
+                continue
+            if process.exitcode == 0:
+                continue
+            if self.restarts[spec["name"]] >= TradingConfig.SUPERVISOR_MAX_RESTARTS:
+                if self.processes.pop(spec["name"], None) is not None:
+                    print(f"[ERROR] 트레이더 재시작 한도 초과 ({spec['name']}, exit {process.exitcode})")
+                continue
+            self.restarts[spec["name"]] += 1
+            print(f"[WARNING] 트레이더 비정상 종료 ({spec['name']}, exit {process.exitcode}) - 재시작 "
+                  f"{self.restarts[spec['name']]}/{TradingConfig.SUPERVISOR_MAX_RESTARTS}")
+            self._spawn(spec)
+
+    def stop(self):
+        self._stop_event.set()
+        deadline = time.monotonic() + TradingConfig.SUPERVISOR_STOP_TIMEOUT
+        for name, process in self.processes.items():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                print(f"[WARNING] 트레이더 강제 종료: {name}")
+                process.terminate()
+                process.join()
+        self._drain_metrics(timeout=0)
+        if self.metrics:
+            self.print_report()
+        if self.feed is not None:
+            self.feed.close()
+            self.feed = None
+
+    def aggregate(self):
+        """트레이더별 최신 지표 + 전체 합계"""
+        traders = dict(self.metrics)
+        keys = ("equity", "krw_balance", "coin_value", "realized_pnl", "fees", "cycles", "cycle_failures",
+                "filled_orders", "open_orders", "protective_exits", "feed_hits", "feed_misses")
+        totals = {key: sum(m.get(key, 0) for m in traders.values()) for key in keys}
+        totals["running"] = sum(1 for p in self.processes.values() if p.is_alive())
+        totals["restarts"] = sum(self.restarts.values())
+        return {"traders": traders, "totals": totals}
+
+    def print_report(self):
+        summary = self.aggregate()
+        print("\n" + "=" * 60)
+        print(f"트레이더 집계 ({summary['totals']['running']}/{len(self.specs)} 실행 중)")
+        print("=" * 60)
+        for name, m in sorted(summary["traders"].items()):
+            print(f"{name:<16} 총자산 {m['equity']:>14,.0f}원  실현손익 {m['realized_pnl']:>+12,.0f}원  "
+                  f"사이클 {m['cycles']:>4}  체결 {m['filled_orders']:>3}")
+        totals = summary["totals"]
+        hit_rate = totals["feed_hits"] / max(1, totals["feed_hits"] + totals["feed_misses"])
+        print(f"{'합계':<16} 총자산 {totals['equity']:>14,.0f}원  실현손익 {totals['realized_pnl']:>+12,.0f}원  "
+              f"사이클 {totals['cycles']:>4}  체결 {totals['filled_orders']:>3}")
+        print(f"공유 시세 적중률 {hit_rate:.0%}, 재시작 {totals['restarts']}회")
+        tripped = sorted({c for m in summary["traders"].values() for c in m.get("open_circuits", [])})
+        if tripped:
+            print(f"차단 중인 외부 API: {', '.join(tripped)}")
+
+
+def run_supervisor(config_path):
+    Supervisor(load_supervisor_config(config_path)).run()
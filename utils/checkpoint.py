@@ -0,0 +1,96 @@
+# utils/checkpoint.py
+import os
+import gzip
+import json
+import time
+import threading
+from config.settings import TradingConfig
+
+CHECKPOINT_VERSION = 1
+
+
+class CheckpointManager:
+    """메모리 상태를 주기적으로 압축 파일에 저장하고 재시작 시 복원
+
+    컴포넌트마다 이름과 (snapshot, restore) 함수 쌍을 등록한다.
+    snapshot()은 JSON으로 직렬화 가능한 값을 돌려주고, restore(state)는 그 값을
+    받아 상태를 되살린다. 저장은 임시 파일에 쓴 뒤 교체하므로 저장 도중
+    종료돼도 이전 체크포인트가 남는다. 너무 오래된 체크포인트는 복원하지 않는다.
+    """
+
+    def __init__(self, path=None, max_age=None):
+        self.path = path or os.path.join(TradingConfig.DATA_STORE_DIR, TradingConfig.CHECKPOINT_FILE)
+        self.max_age = max_age if max_age is not None else TradingConfig.CHECKPOINT_MAX_AGE
+        self._providers = {}
+        self._lock = threading.Lock()
+        self.last_saved_at = 0
+        self.last_size = 0
+
+    def register(self, name, snapshot, restore):
+        self._providers[name] = (snapshot, restore)
+
+    def save(self):
+        """등록된 모든 상태 저장 (저장한 바이트 수 반환, 실패 시 0)"""
+        states = {}
+        for name, (snapshot, _) in self._providers.items():
+            try:
+                states[name] = snapshot()
+            except Exception as e:
+                print(f"[WARNING] 체크포인트 상태 수집 실패 ({name}): {e}")
+
+        payload = {"version": CHECKPOINT_VERSION, "saved_at": time.time(), "states": states}
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "wb") as raw:
+                    with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=5) as f:
+                        f.write(json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8"))
+                    raw.flush()
+                    os.fsync(raw.fileno())
+                os.replace(tmp_path, self.path)
+                self.last_saved_at = payload["saved_at"]
+                self.last_size = os.path.getsize(self.path)
+                return self.last_size
+            except (OSError, TypeError, ValueError) as e:
+                print(f"[WARNING] 체크포인트 저장 실패: {e}")
+                return 0
+
+    def load(self):
+        """체크포인트 파일 읽기 (없거나 손상/오래됐으면 None)"""
+        try:
+            if not os.path.exists(self.path):
+                return None
+            with gzip.open(self.path, "rb") as f:
+                payload = json.loads(f.read().decode("utf-8"))
+        except (OSError, ValueError, EOFError) as e:
+            print(f"[WARNING] 체크포인트 읽기 실패: {e}")
+            return None
+
+        if payload.get("version") != CHECKPOINT_VERSION:
+            return None
+        age = time.time() - payload.get("saved_at", 0)
+        if self.max_age and age > self.max_age:
+            print(f"체크포인트가 오래되어 복원하지 않음 ({age / 60:.0f}분 전)")
+            return None
+        return payload
+
+    def restore(self):
+        """저장된 상태를 등록된 컴포넌트에 복원 (복원한 이름 목록 반환)"""
+        payload = self.load()
+        if payload is None:
+            return []
+
+        restored = []
+        for name, state in payload.get("states", {}).items():
+            provider = self._providers.get(name)
+            if provider is None or state is None:
+                continue
+            try:
+                provider[1](state)
+                restored.append(name)
+            except Exception as e:
+                print(f"[WARNING] 체크포인트 복원 실패 ({name}): {e}")
+        age = time.time() - payload["saved_at"]
+        print(f"체크포인트 복원 ({age:.0f}초 전 저장): {', '.join(restored) if restored else '없음'}")
+        return restored
@@ -0,0 +1,189 @@
+# utils/circuit_breaker.py
+import time
+import threading
+from collections import deque
+from config.settings import TradingConfig
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """차단기가 열려 있어 호출하지 않음"""
+
+    def __init__(self, name, retry_in):
+        super().__init__(f"{name} 차단 중 ({retry_in:.0f}초 후 재시도)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """외부 API 1곳의 서킷 브레이커 (closed → open → half_open → closed)
+
+    최근 window건의 호출 결과로 실패율과 지연 호출 비율을 계산해, 둘 중 하나가
+    기준을 넘으면 open으로 바꾼다. open인 동안은 호출하지 않고 바로
+    CircuitOpenError를 내므로 호출하는 쪽은 타임아웃을 기다리지 않고 캐시나
+    기본값으로 넘어간다. open_seconds가 지나면 half_open에서 시험 호출을
+    half_open_calls건 허용하고, 모두 정상(지연 없이 성공)이면 닫고 하나라도
+    실패하면 다시 연다.
+    """
+
+    def __init__(self, name, window=None, min_calls=None, failure_rate=None,
+                 slow_call_seconds=None, slow_call_rate=None, open_seconds=None,
+                 half_open_calls=None, clock=time.monotonic):
+        self.name = name
+        self.window = window or TradingConfig.CIRCUIT_WINDOW
+        self.min_calls = min_calls or TradingConfig.CIRCUIT_MIN_CALLS
+        self.failure_rate = failure_rate or TradingConfig.CIRCUIT_FAILURE_RATE
+        self.slow_call_seconds = slow_call_seconds  # None이면 지연 기준 없음
+        self.slow_call_rate = slow_call_rate or TradingConfig.CIRCUIT_SLOW_CALL_RATE
+        self.open_seconds = open_seconds or TradingConfig.CIRCUIT_OPEN_SECONDS
+        self.half_open_calls = half_open_calls or TradingConfig.CIRCUIT_HALF_OPEN_CALLS
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=self.window)  # (성공 여부, 지연 여부)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0  # half_open에서 진행 중인 시험 호출
+        self._probe_successes = 0
+        self.rejected = 0
+        self.opened_count = 0
+        self.last_reason = None
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and self.clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+            self._probe_successes = 0
+        return self._state
+
+    def retry_in(self):
+        """open 상태가 끝나기까지 남은 시간 (초)"""
+        with self._lock:
+            if self._current_state() != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.open_seconds - self.clock())
+
+    def allow(self):
+        """지금 호출해도 되는지 (half_open이면 시험 호출 자리를 차지함)"""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._probes < self.half_open_calls - self._probe_successes:
+                self._probes += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def call(self, func, *args, **kwargs):
+        """차단기를 거쳐 호출 (열려 있으면 CircuitOpenError, 예외는 실패로 기록 후 그대로 전달)"""
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_in())
+        started = self.clock()
+        succeeded = False
+        try:
+            result = func(*args, **kwargs)
+            succeeded = True
+            return result
+        finally:
+            self.record(succeeded, self.clock() - started)
+
+    def record(self, succeeded, latency=0.0):
+        """allow()로 허용받은 호출 1건의 결과 기록"""
+        slow = self.slow_call_seconds is not None and latency >= self.slow_call_seconds
+        with self._lock:
+            state = self._current_state()
+            if state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                if not succeeded or slow:
+                    self._trip("시험 호출 실패" if not succeeded else f"시험 호출 지연 {latency:.1f}초")
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_calls:
+                        self._close()
+                return
+            if state == OPEN:
+                # 열리기 전에 시작된 호출의 늦은 결과
+                return
+
+            self._outcomes.append((succeeded, slow))
+            if len(self._outcomes) < self.min_calls:
+                return
+            failure_rate, slow_rate = self._rates()
+            if failure_rate >= self.failure_rate:
+                self._trip(f"실패율 {failure_rate:.0%} (최근 {len(self._outcomes)}건)")
+            elif slow_rate >= self.slow_call_rate:
+                self._trip(f"{self.slow_call_seconds}초 초과 지연 {slow_rate:.0%} (최근 {len(self._outcomes)}건)")
+
+    def _rates(self):
+        total = len(self._outcomes)
+        if not total:
+            return 0.0, 0.0
+        failures = sum(1 for succeeded, _ in self._outcomes if not succeeded)
+        slow = sum(1 for succeeded, slow in self._outcomes if succeeded and slow)
+        return failures / total, slow / total
+
+    def _trip(self, reason):
+        self._state = OPEN
+        self._opened_at = self.clock()
+        self._probes = 0
+        self._probe_successes = 0
+        self._outcomes.clear()
+        self.opened_count += 1
+        self.last_reason = reason
+        print(f"[WARNING] 외부 API 차단 ({self.name}): {reason}, {self.open_seconds}초 동안 대체 데이터 사용")
+
+    def _close(self):
+        self._state = CLOSED
+        self._outcomes.clear()
+        print(f"외부 API 차단 해제 ({self.name}): 시험 호출 정상")
+
+    def stats(self):
+        with self._lock:
+            state = self._current_state()
+            failure_rate, slow_rate = self._rates()
+            return {
+                "state": state,
+                "calls": len(self._outcomes),
+                "failure_rate": round(failure_rate, 3),
+                "slow_rate": round(slow_rate, 3),
+                "rejected": self.rejected,
+                "opened_count": self.opened_count,
+                "retry_in": round(max(0.0, self._opened_at + self.open_seconds - self.clock()), 1) if state == OPEN else 0.0,
+                "last_reason": self.last_reason
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """엔드포인트별 공용 차단기 (CIRCUIT_OVERRIDES의 설정 적용, 이름별 1회 생성)"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, **TradingConfig.CIRCUIT_OVERRIDES.get(name, {}))
+            _breakers[name] = breaker
+        return breaker
+
+
+def breaker_states():
+    """{이름: 상태 정보} - 지금까지 만들어진 모든 차단기"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.stats() for breaker in breakers}
+
+
+def open_breakers():
+    """닫혀 있지 않은 차단기 이름 목록"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [breaker.name for breaker in breakers if breaker.state != CLOSED]
@@ -0,0 +1,143 @@
+# utils/cycle_cache.py
+import threading
+import functools
+import contextvars
+from concurrent.futures import Future
+
+_current_cache = contextvars.ContextVar("cycle_cache", default=None)
+
+
+class CycleCache:
+    """한 거래 사이클 동안만 유효한 호출 결과 캐시
+
+    with 블록 안에서 cycle_cached로 표시된 메서드의 동일 호출은 한 번만
+    실행되고, 동시에 들어온 같은 호출은 먼저 시작한 호출의 결과를 기다린다
+    (single-flight). 블록을 벗어나면 캐시는 버려진다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results = {}
+        self._inflight = {}
+        self._token = None
+        self.hits = 0
+        self.misses = 0
+        self.inflight_waits = 0
+
+    def __enter__(self):
+        self._token = _current_cache.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_cache.reset(self._token)
+        self._token = None
+        return False
+
+    @property
+    def saved_calls(self):
+        """실제 호출 없이 처리된 횟수"""
+        return self.hits + self.inflight_waits
+
+    def get_or_call(self, key, func):
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+                return self._results[key]
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self.inflight_waits += 1
+                is_leader = False
+            else:
+                future = Future()
+                self._inflight[key] = future
+                self.misses += 1
+                is_leader = True
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            value = func()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            # 실패(None) 결과는 같은 사이클 내 재시도를 막지 않도록 저장하지 않음
+            if value is not None:
+                self._results[key] = value
+        future.set_result(value)
+        return value
+
+    def invalidate(self, prefix=None):
+        """prefix로 시작하는 이름의 캐시 항목 제거 (None이면 전체)"""
+        with self._lock:
+            if prefix is None:
+                self._results.clear()
+            else:
+                for key in [k for k in self._results if k[0].startswith(prefix)]:
+                    del self._results[key]
+
+    def stats(self):
+        return {
+            "calls": self.hits + self.misses + self.inflight_waits,
+            "executed": self.misses,
+            "cache_hits": self.hits,
+            "inflight_waits": self.inflight_waits,
+            "saved_calls": self.saved_calls
+        }
+
+
+def current_cycle_cache():
+    """현재 컨텍스트의 사이클 캐시 (없으면 None)"""
+    return _current_cache.get()
+
+
+def invalidate_cycle_cache(prefix=None):
+    """현재 사이클 캐시 무효화 (주문 체결 등 상태 변경 후 호출)"""
+    cache = _current_cache.get()
+    if cache is not None:
+        cache.invalidate(prefix)
+
+
+def cycle_cached(key=None, name=None):
+    """사이클 캐시 사용 데코레이터
+
+    key: 호출 인자를 받아 캐시 키를 반환하는 함수. None을 반환하면 캐시하지 않는다.
+         지정하지 않으면 전체 인자를 키로 사용한다.
+    """
+    def decorator(func):
+        cache_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = _current_cache.get()
+            if cache is None:
+                return func(*args, **kwargs)
+
+            if key is not None:
+                call_key = key(*args, **kwargs)
+                if call_key is None:
+                    return func(*args, **kwargs)
+            else:
+                call_key = (args, tuple(sorted(kwargs.items())))
+
+            try:
+                hash(call_key)
+            except TypeError:
+                return func(*args, **kwargs)
+
+            return cache.get_or_call((cache_name, call_key), lambda: func(*args, **kwargs))
+
+        return wrapper
+    return decorator
+
+
+def submit_in_context(executor, func, *args, **kwargs):
+    """현재 컨텍스트(사이클 캐시 포함)를 유지한 채 스레드 풀에 작업 제출"""
+    ctx = contextvars.copy_context()
+    return executor.submit(ctx.run, func, *args, **kwargs)
@@ -0,0 +1,95 @@
+# utils/deadline.py
+import time
+import threading
+import contextvars
+from config.settings import TradingConfig
+
+_current_deadline = contextvars.ContextVar("cycle_deadline", default=None)
+
+
+class Deadline:
+    """한 사이클 전체의 시간 예산
+
+    with 블록 안의 외부 호출은 고정 타임아웃 대신 remaining_timeout()으로
+    남은 시간만 받는다. 뉴스처럼 없어도 되는 보강 데이터는 allows()로 남은
+    시간을 확인해 부족하면 건너뛰고 degrade()로 기록한다. CycleCache와 같이
+    contextvars로 전달되므로 submit_in_context로 넘긴 스레드 작업에도 적용된다.
+    """
+
+    def __init__(self, budget, clock=time.monotonic):
+        self.budget = budget
+        self.clock = clock
+        self.started_at = clock()
+        self.expires_at = self.started_at + budget
+        self._lock = threading.Lock()
+        self._degraded = []
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current_deadline.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_deadline.reset(self._token)
+        self._token = None
+        return False
+
+    def remaining(self):
+        return max(0.0, self.expires_at - self.clock())
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    @property
+    def elapsed(self):
+        return self.clock() - self.started_at
+
+    def timeout(self, default):
+        """호출 1건의 타임아웃: 기본값과 남은 시간 중 작은 값 (최소 DEADLINE_MIN_TIMEOUT)"""
+        return max(TradingConfig.DEADLINE_MIN_TIMEOUT, min(default, self.remaining()))
+
+    def allows(self, seconds):
+        """남은 시간이 seconds 이상인지"""
+        return self.remaining() >= seconds
+
+    def degrade(self, stage, reason):
+        """시간 부족/실패로 생략하거나 축소한 단계 기록"""
+        with self._lock:
+            self._degraded.append({"stage": stage, "reason": reason, "at": round(self.elapsed, 2)})
+
+    @property
+    def degraded(self):
+        with self._lock:
+            return list(self._degraded)
+
+    def summary(self):
+        return {
+            "budget": self.budget,
+            "elapsed": round(self.elapsed, 2),
+            "degraded": self.degraded
+        }
+
+
+def current_deadline():
+    """현재 컨텍스트의 사이클 마감 (없으면 None)"""
+    return _current_deadline.get()
+
+
+def remaining_timeout(default):
+    """현재 사이클 마감 기준 호출 타임아웃 (마감이 없으면 기본값)"""
+    deadline = _current_deadline.get()
+    return default if deadline is None else deadline.timeout(default)
+
+
+def time_allows(seconds):
+    """남은 시간이 seconds 이상인지 (마감이 없으면 항상 True)"""
+    deadline = _current_deadline.get()
+    return deadline is None or deadline.allows(seconds)
+
+
+def degrade(stage, reason):
+    """현재 사이클에 생략/축소 단계 기록 (마감이 없으면 무시)"""
+    deadline = _current_deadline.get()
+    if deadline is not None:
+        deadline.degrade(stage, reason)
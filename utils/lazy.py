@@ -0,0 +1,53 @@
+# utils/lazy.py
+import sys
+import importlib
+import threading
+
+
+class _LazyModule:
+    """첫 속성 접근 시 실제로 import되는 모듈 대리 객체
+
+    pyupbit(pandas 포함), openai, numpy, requests처럼 import 비용이 큰 모듈을
+    모듈 수준에서 바로 불러오지 않고, 그 모듈을 실제로 쓰는 경로에서만
+    불러오도록 한다.
+    """
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with self.__dict__["_lock"]:
+                module = self.__dict__["_module"]
+                if module is None:
+                    module = importlib.import_module(self.__dict__["_name"])
+                    self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_import(name):
+    """모듈 지연 import (이미 로드된 모듈이면 그대로 반환)"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return _LazyModule(name)
+
+
+def is_loaded(module):
+    """실제 모듈이 로드됐는지 (lazy_import 결과 또는 일반 모듈)"""
+    if isinstance(module, _LazyModule):
+        return module.__dict__["_module"] is not None
+    return True
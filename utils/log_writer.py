@@ -0,0 +1,256 @@
+# utils/log_writer.py
+import os
+import sys
+import time
+import queue
+import atexit
+import threading
+from config.settings import TradingConfig
+
+FSYNC_POLICIES = ("none", "batch", "interval")
+
+
+class LogWriter:
+    """로그를 대기열에 넣고 백그라운드 스레드가 모아서 파일에 기록
+
+    매매 스레드는 (파일 경로, 텍스트)를 대기열에 넣기만 하고 바로 돌아온다.
+    기록 스레드는 batch_size건이 모이거나 flush_interval이 지나면 파일별로
+    한 번씩만 열어 이어 쓰고, fsync_policy에 따라 디스크에 동기화한다.
+    대기열이 debug_drop_ratio 이상 차면 디버그 로그는 버리고, 가득 차면
+    거래/에러 로그는 put_timeout만큼 기다린 뒤 직접 기록한다.
+    """
+
+    def __init__(self, max_queue=None, batch_size=None, flush_interval=None,
+                 fsync_policy=None, fsync_interval=None, debug_drop_ratio=None, put_timeout=None):
+        self.max_queue = max_queue or TradingConfig.LOG_QUEUE_SIZE
+        self.batch_size = batch_size or TradingConfig.LOG_BATCH_SIZE
+        self.flush_interval = flush_interval or TradingConfig.LOG_FLUSH_INTERVAL
+        self.fsync_policy = fsync_policy or TradingConfig.LOG_FSYNC_POLICY
+        if self.fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"알 수 없는 fsync 정책: {self.fsync_policy}")
+        self.fsync_interval = fsync_interval if fsync_interval is not None else TradingConfig.LOG_FSYNC_INTERVAL
+        self.debug_drop_ratio = debug_drop_ratio or TradingConfig.LOG_DEBUG_DROP_RATIO
+        self.put_timeout = put_timeout if put_timeout is not None else TradingConfig.LOG_PUT_TIMEOUT
+
+        self._queue = queue.Queue(maxsize=self.max_queue)
+        self._file_lock = threading.Lock()  # 기록 스레드와 직접 기록이 겹치지 않도록
+        self._last_fsync = time.monotonic()
+        self._unsynced = set()  # interval 정책에서 아직 fsync하지 않은 파일
+        self._closed = False
+        self.written = 0
+        self.dropped = 0
+        self.direct_writes = 0
+        self.batches = 0
+        self.max_batch = 0
+
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, path, text, droppable=False):
+        """기록 요청 (대기열에 넣었거나 직접 기록했으면 True, 버렸으면 False)"""
+        if self._closed:
+            self._write_direct(path, text)
+            return True
+
+        if droppable:
+            if self._queue.qsize() >= self.max_queue * self.debug_drop_ratio:
+                self.dropped += 1
+                return False
+            try:
+                self._queue.put_nowait((path, text))
+            except queue.Full:
+                self.dropped += 1
+                return False
+            return True
+
+        try:
+            self._queue.put((path, text), timeout=self.put_timeout)
+        except queue.Full:
+            # 기록 스레드가 밀려 있어도 거래/에러 로그는 잃지 않음
+            self._write_direct(path, text)
+        return True
+
+    def _write_direct(self, path, text):
+        self.direct_writes += 1
+        self._write_batch([(path, text)], force_fsync=False)
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._sync_idle()
+                continue
+
+            # 배치 수집: batch_size건, flush_interval 경과, flush 요청(Event), 종료(None) 중 먼저 오는 것까지
+            batch = []
+            flushed = None
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    flushed = item
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write_batch(batch, force_fsync=stop)
+                self.batches += 1
+                self.max_batch = max(self.max_batch, len(batch))
+            if flushed is not None:
+                flushed.set()
+            if stop:
+                return
+
+    def _write_batch(self, batch, force_fsync):
+        """파일별로 묶어 한 번씩 열어 기록"""
+        by_path = {}
+        for path, text in batch:
+            by_path.setdefault(path, []).append(text)
+
+        with self._file_lock:
+            for path, texts in by_path.items():
+                try:
+                    with open(path, "a", encoding="utf-8") as f:
+                        f.write("".join(texts))
+                        if self.fsync_policy == "batch":
+                            f.flush()
+                            os.fsync(f.fileno())
+                    self.written += len(texts)
+                except OSError as e:
+                    print(f"로그 기록 실패 ({path}, {len(texts)}건): {e}")
+            if self.fsync_policy == "interval":
+                self._unsynced.update(by_path)
+                if force_fsync or time.monotonic() - self._last_fsync >= self.fsync_interval:
+                    self._sync_unsynced()
+
+    def _sync_unsynced(self):
+        """interval 정책: 마지막 fsync 이후 기록한 파일을 디스크에 동기화"""
+        for path in self._unsynced:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                print(f"로그 동기화 실패 ({path}): {e}")
+        self._unsynced.clear()
+        self._last_fsync = time.monotonic()
+
+    def _sync_idle(self):
+        # 배치가 없어도 interval이 지난 미동기화 파일은 맞춰 둠
+        with self._file_lock:
+            if self._unsynced and time.monotonic() - self._last_fsync >= self.fsync_interval:
+                self._sync_unsynced()
+
+    def flush(self, timeout=None):
+        """지금까지 요청한 로그가 모두 기록될 때까지 대기 (기록됐으면 True)"""
+        if self._closed or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout=None):
+        """남은 로그를 기록하고 기록 스레드 종료 (이후 기록 요청은 직접 기록)"""
+        if self._closed:
+            return
+        timeout = timeout if timeout is not None else TradingConfig.LOG_CLOSE_TIMEOUT
+        self._closed = True
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "direct_writes": self.direct_writes,
+            "batches": self.batches,
+            "max_batch": self.max_batch
+        }
+
+
+_default_writer = None
+_default_writer_lock = threading.Lock()
+
+
+def get_default_writer():
+    """프로세스 공용 로그 기록기 (처음 호출 시 생성, 종료 시 남은 로그 기록)"""
+    global _default_writer
+    if _default_writer is None:
+        with _default_writer_lock:
+            if _default_writer is None:
+                _default_writer = LogWriter()
+                atexit.register(_default_writer.close)
+    return _default_writer
+
+
+def _benchmark(calls=20000):
+    """매매 스레드 쪽 로그 1건 비용 비교: 직접 기록(열기/쓰기/닫기) vs 대기열 기록"""
+    import tempfile
+    from utils.logger import TradingLogger
+
+    def percentiles(samples):
+        samples = sorted(samples)
+        pick = lambda q: samples[min(len(samples) - 1, int(len(samples) * q))] / 1000
+        return f"p50 {pick(0.5):6.1f}us  p99 {pick(0.99):7.1f}us  mean {sum(samples) / len(samples) / 1000:6.1f}us"
+
+    message = "Fetched balances: " + repr([{"currency": "KRW", "balance": "1000000.0", "locked": "0.0"}] * 5)
+    with tempfile.TemporaryDirectory() as log_dir:
+        path = os.path.join(log_dir, "direct.log")
+        samples = []
+        for _ in range(calls):
+            started = time.perf_counter_ns()
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] [DEBUG] {message}\n")
+            samples.append(time.perf_counter_ns() - started)
+        print(f"direct open/write/close : {percentiles(samples)}")
+
+        for policy in FSYNC_POLICIES:
+            writer = LogWriter(fsync_policy=policy)
+            logger = TradingLogger(log_dir, writer=writer)
+            samples = []
+            for _ in range(calls):
+                started = time.perf_counter_ns()
+                logger.log_debug(message)
+                samples.append(time.perf_counter_ns() - started)
+            flush_started = time.perf_counter()
+            writer.close()
+            stats = writer.stats()
+            print(f"queued (fsync={policy:<8}): {percentiles(samples)}  "
+                  f"drain {time.perf_counter() - flush_started:.2f}s, batches {stats['batches']}, "
+                  f"written {stats['written']}, dropped {stats['dropped']}")
+
+        # 대기열이 작을 때 디버그 로그는 버리고 에러 로그는 모두 기록되는지
+        writer = LogWriter(max_queue=100, flush_interval=0.05)
+        logger = TradingLogger(log_dir, writer=writer)
+        for i in range(calls):
+            logger.log_debug(message)
+            if i % 100 == 0:
+                logger.log_error(f"error {i}")
+        writer.close()
+        stats = writer.stats()
+        print(f"backpressure (queue 100): written {stats['written']}, dropped debug {stats['dropped']}, "
+              f"direct writes {stats['direct_writes']}")
+
+
+if __name__ == "__main__":
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -3,25 +3,102 @@ import os
 import time
 import json
 from datetime import datetime
+from config.settings import TradingConfig
+
+
+def iter_log_records(file_path):
+    """로그 파일의 기록을 하나씩 읽기 (JSON Lines, 이전 형식인 JSON 배열 파일도 지원)
+
+    JSON Lines는 한 줄씩 읽으므로 파일 크기와 무관하게 메모리를 적게 쓴다.
+    쓰다가 중단된 마지막 줄처럼 깨진 줄은 건너뛴다.
+    """
+    if not os.path.exists(file_path):
+        return
+    with open(file_path, "r", encoding="utf-8") as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        if first == "[":
+            # 이전 형식: 파일 전체가 하나의 JSON 배열
+            for record in json.load(f):
+                yield record
+            return
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def migrate_legacy_log(legacy_path, jsonl_path=None):
+    """이전 형식(JSON 배열) 로그를 JSON Lines로 변환 (변환한 기록 수 반환)
+
+    배열의 기록을 기존 .jsonl 기록 앞에 두어 시간 순서를 유지하고, 임시
+    파일에 쓴 뒤 교체한다. 원본은 지우지 않고 .migrated를 붙여 남긴다.
+    """
+    jsonl_path = jsonl_path or f"{legacy_path}l"
+    if not os.path.exists(legacy_path):
+        return 0
+    with open(legacy_path, "r", encoding="utf-8") as f:
+        records = json.load(f)
+    if not isinstance(records, list):
+        records = [records]
+
+    tmp_path = f"{jsonl_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=True) + "\n")
+        if os.path.exists(jsonl_path):
+            with open(jsonl_path, "r", encoding="utf-8") as current:
+                for line in current:
+                    if line.strip():
+                        f.write(line if line.endswith("\n") else line + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, jsonl_path)
+    os.replace(legacy_path, f"{legacy_path}.migrated")
+    return len(records)
+
 
 class TradingLogger:
     """거래 로깅 클래스"""
     
-    def __init__(self, log_dir="logs"):
+    def __init__(self, log_dir="logs", writer=None):
         self.log_dir = log_dir
+        if writer is None:
+            # 모듈 수준 import는 python -m utils.log_writer 실행 시 모듈이 두 번 로드됨
+            from utils.log_writer import get_default_writer
+            writer = get_default_writer()
+        self.writer = writer  # 파일 기록은 백그라운드 스레드가 담당
         self._ensure_log_dir()
         
         # 로그 파일 경로
         today = datetime.now().strftime("%Y%m%d")
-        self.trade_log_file = os.path.join(log_dir, f"trades_{today}.json")
-        self.analysis_log_file = os.path.join(log_dir, f"analysis_{today}.json")
+        self.trade_log_file = os.path.join(log_dir, f"trades_{today}.jsonl")
+        self.analysis_log_file = os.path.join(log_dir, f"analysis_{today}.jsonl")
         self.error_log_file = os.path.join(log_dir, f"errors_{today}.log")
+        self._migrate_legacy_logs()
     
     def _ensure_log_dir(self):
         """로그 디렉토리 생성"""
         if not os.path.exists(self.log_dir):
             os.makedirs(self.log_dir)
     
+    def _migrate_legacy_logs(self):
+        """오늘 날짜의 이전 형식(.json) 로그가 있으면 .jsonl로 변환"""
+        for jsonl_path in (self.trade_log_file, self.analysis_log_file):
+            legacy_path = jsonl_path[:-1]
+            try:
+                migrated = migrate_legacy_log(legacy_path, jsonl_path)
+                if migrated:
+                    print(f"로그 형식 변환: {legacy_path} -> {jsonl_path} ({migrated}건)")
+            except (OSError, ValueError) as e:
+                print(f"로그 형식 변환 실패 ({legacy_path}): {e}")
+    
     def log_trade(self, trade_type, amount, price, recommendation, result):
         """거래 로그 기록"""
         try:
@@ -35,7 +112,7 @@ class TradingLogger:
                 "success": result is not None
             }
             
-            self._append_json_log(self.trade_log_file, trade_log)
+            self._append_jsonl(self.trade_log_file, trade_log)
             
         except Exception as e:
             self.log_error(f"거래 로그 기록 실패: {e}")
@@ -111,7 +188,7 @@ class TradingLogger:
                 "fear_greed_index": fear_greed_value
             }
             
-            self._append_json_log(self.analysis_log_file, analysis_log)
+            self._append_jsonl(self.analysis_log_file, analysis_log)
             
         except Exception as e:
             self.log_error(f"분석 로그 기록 실패: {e}")
@@ -124,7 +201,7 @@ class TradingLogger:
                     "recommendation": {"action": "hold", "confidence": 5, "justification": "Simplified logging due to error"},
                     "fear_greed_index": fear_greed_value
                 }
-                self._append_json_log(self.analysis_log_file, minimal_log)
+                self._append_jsonl(self.analysis_log_file, minimal_log)
             except Exception as e2:
                 print(f"Minimal logging also failed: {e2}")
     
@@ -134,20 +211,18 @@ class TradingLogger:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             error_log = f"[{timestamp}] {error_message}\n"
             
-            with open(self.error_log_file, "a", encoding="utf-8") as f:
-                f.write(error_log)
+            self.writer.write(self.error_log_file, error_log)
                 
         except Exception as e:
             print(f"에러 로그 기록 실패: {e}")
 
     def log_debug(self, debug_message):
-        """디버그 로그 기록"""
+        """디버그 로그 기록 (기록 대기열이 밀리면 버려질 수 있음)"""
         try:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             debug_log = f"[{timestamp}] [DEBUG] {debug_message}\n"
             
-            with open(self.error_log_file, "a", encoding="utf-8") as f:
-                f.write(debug_log)
+            self.writer.write(self.error_log_file, debug_log, droppable=True)
                 
         except Exception as e:
             print(f"디버그 로그 기록 실패: {e}")
@@ -158,28 +233,15 @@ class TradingLogger:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             warning_log = f"[{timestamp}] [WARNING] {warning_message}\n"
             
-            with open(self.error_log_file, "a", encoding="utf-8") as f:
-                f.write(warning_log)
+            self.writer.write(self.error_log_file, warning_log)
                 
         except Exception as e:
             print(f"경고 로그 기록 실패: {e}")
     
-    def _append_json_log(self, file_path, log_data):
-        """JSON 로그 파일에 데이터 추가"""
+    def _append_jsonl(self, file_path, log_data):
+        """JSON Lines 로그 파일 끝에 기록 1줄 추가 (기존 내용은 읽지 않음)"""
         try:
-            # 기존 데이터 읽기
-            if os.path.exists(file_path):
-                with open(file_path, "r", encoding="utf-8") as f:
-                    logs = json.load(f)
-            else:
-                logs = []
-            
-            # 새 데이터 추가
-            logs.append(log_data)
-            
-            # 파일에 저장
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(logs, f, ensure_ascii=True, indent=2)
+            self.writer.write(file_path, json.dumps(log_data, ensure_ascii=True) + "\n")
                 
         except Exception as e:
             print(f"JSON 로그 저장 실패: {e}")
@@ -228,29 +290,33 @@ class TradingLogger:
         print("=" * 50)
     
     def get_daily_summary(self):
-        """일일 거래 요약"""
+        """일일 거래 요약 (로그를 한 줄씩 읽으며 집계)"""
         try:
-            if not os.path.exists(self.trade_log_file):
-                return None
+            self.writer.flush(TradingConfig.LOG_CLOSE_TIMEOUT)  # 대기 중인 거래 로그까지 포함
+            summary = {
+                "total_trades": 0,
+                "successful_trades": 0,
+                "buy_count": 0,
+                "sell_count": 0,
+                "total_buy_amount": 0,
+                "total_sell_amount": 0
+            }
             
-            with open(self.trade_log_file, "r", encoding="utf-8") as f:
-                trades = json.load(f)
+            for trade in iter_log_records(self.trade_log_file):
+                summary["total_trades"] += 1
+                if not trade.get("success"):
+                    continue
+                summary["successful_trades"] += 1
+                if trade.get("trade_type") == "buy":
+                    summary["buy_count"] += 1
+                    summary["total_buy_amount"] += trade.get("amount") or 0
+                elif trade.get("trade_type") == "sell":
+                    summary["sell_count"] += 1
+                    summary["total_sell_amount"] += trade.get("amount") or 0
             
-            if not trades:
+            if not summary["total_trades"]:
                 return None
             
-            buy_trades = [t for t in trades if t["trade_type"] == "buy" and t["success"]]
-            sell_trades = [t for t in trades if t["trade_type"] == "sell" and t["success"]]
-            
-            summary = {
-                "total_trades": len(trades),
-                "successful_trades": len([t for t in trades if t["success"]]),
-                "buy_count": len(buy_trades),
-                "sell_count": len(sell_trades),
-                "total_buy_amount": sum(t["amount"] for t in buy_trades),
-                "total_sell_amount": sum(t["amount"] for t in sell_trades)
-            }
-            
             return summary
             
         except Exception as e:
@@ -0,0 +1,147 @@
+# utils/pipeline.py
+import time
+import queue
+import threading
+
+QUEUE_POLICIES = ("block", "drop_oldest", "drop_new")
+_STOP = object()  # 종료 시 대기 중인 단계 스레드를 깨우는 표식
+_PUT_POLL = 0.1  # block 정책에서 종료 여부를 확인하는 간격 (초)
+
+
+class Stage:
+    """파이프라인 단계
+
+    func(item)의 반환값이 다음 단계로 넘어가며, None이면 그 항목은 여기서 끝난다.
+    입력 큐는 maxsize로 제한되고, 가득 찼을 때의 처리는 policy로 정한다.
+      block       - 앞 단계가 자리가 날 때까지 대기 (역압)
+      drop_oldest - 대기 중인 가장 오래된 항목을 버리고 새 항목을 넣음 (최신 우선)
+      drop_new    - 새 항목을 버림 (이미 대기 중인 작업이 있으면 건너뜀)
+    """
+
+    def __init__(self, name, func, maxsize=1, policy="block"):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"알 수 없는 큐 정책: {policy}")
+        self.name = name
+        self.func = func
+        self.maxsize = maxsize
+        self.policy = policy
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.processed = 0
+        self.failures = 0
+        self.dropped = 0
+        self.busy_time = 0.0
+        self.last_duration = 0.0
+        self.busy = False
+
+    def put(self, item, stop=None):
+        """정책에 따라 입력 큐에 넣기 (넣었으면 True, block 대기 중 stop이 설정되면 버림)"""
+        if self.policy == "block":
+            while True:
+                try:
+                    self.queue.put(item, timeout=_PUT_POLL)
+                    return True
+                except queue.Full:
+                    if stop is not None and stop.is_set():
+                        self.dropped += 1
+                        return False
+        while True:
+            try:
+                self.queue.put_nowait(item)
+                return True
+            except queue.Full:
+                if self.policy == "drop_new":
+                    self.dropped += 1
+                    return False
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def stats(self):
+        return {
+            "processed": self.processed,
+            "failures": self.failures,
+            "dropped": self.dropped,
+            "queued": self.queue.qsize(),
+            "busy": self.busy,
+            "last_duration": round(self.last_duration, 3),
+            "busy_time": round(self.busy_time, 3)
+        }
+
+
+class Pipeline:
+    """단계별 전용 스레드 + 단계 사이 제한 큐로 구성된 파이프라인
+
+    각 단계가 동시에 다른 항목을 처리하므로 느린 단계(LLM 호출 등)가 도는
+    동안 앞 단계는 다음 항목을 준비할 수 있다.
+    """
+
+    def __init__(self, stages, name="pipeline"):
+        self.stages = list(stages)
+        self.name = name
+        self._threads = []
+        self._stopping = threading.Event()
+
+    def start(self):
+        if self._threads:
+            return
+        self._stopping.clear()
+        for index, stage in enumerate(self.stages):
+            thread = threading.Thread(
+                target=self._worker, args=(index,), name=f"{self.name}-{stage.name}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, item):
+        """첫 단계에 항목 투입 (첫 단계 큐 정책 적용)"""
+        if self._stopping.is_set():
+            return False
+        return self.stages[0].put(item, self._stopping)
+
+    def stop(self, timeout=None):
+        """진행 중인 항목까지 처리한 뒤 종료 (대기 중인 항목과 다음 단계로 넘길 결과는 버림)
+
+        큐가 가득 차 있어도 막히지 않도록 종료 표식은 비어 있는 큐에만 넣고,
+        각 단계 스레드는 항목을 꺼낼 때마다 종료 이벤트를 확인한다.
+        """
+        if not self._threads:
+            return
+        self._stopping.set()
+        for stage in self.stages:
+            try:
+                stage.queue.put_nowait(_STOP)
+            except queue.Full:
+                pass
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def stats(self):
+        return {stage.name: stage.stats() for stage in self.stages}
+
+    def _worker(self, index):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        while True:
+            item = stage.queue.get()
+            if item is _STOP or self._stopping.is_set():
+                return
+
+            stage.busy = True
+            started = time.monotonic()
+            try:
+                result = stage.func(item)
+            except Exception as e:
+                stage.failures += 1
+                result = None
+                print(f"[ERROR] 파이프라인 단계 오류 ({stage.name}): {e}")
+            finally:
+                stage.last_duration = time.monotonic() - started
+                stage.busy_time += stage.last_duration
+                stage.processed += 1
+                stage.busy = False
+
+            if result is not None and next_stage is not None and not self._stopping.is_set():
+                next_stage.put(result, self._stopping)
@@ -0,0 +1,200 @@
+# utils/scheduler.py
+import math
+import time
+import threading
+
+POLICIES = ("skip", "catch_up")
+
+
+class ScheduledTask:
+    """주기 실행 작업
+
+    실행 시각은 시작 기준 시각 + k x interval로 계산하므로 실행 시간이 주기에
+    누적되지 않는다 (drift-free). 실행이 다음 예정 시각을 넘기면 overrun으로
+    기록하고 policy에 따라 처리한다.
+      skip     - 놓친 회차를 건너뛰고 다음 예정 시각부터 실행
+      catch_up - 놓친 회차를 곧바로 연달아 실행 (최대 max_catch_up회)
+    background=True면 전용 스레드에서 실행되어 다른 작업을 막지 않는다.
+    """
+
+    def __init__(self, name, func, interval, policy="skip", background=False, max_catch_up=3):
+        if policy not in POLICIES:
+            raise ValueError(f"알 수 없는 overrun 정책: {policy}")
+        self.name = name
+        self.func = func
+        self.interval = float(interval)
+        self.policy = policy
+        self.background = background
+        self.max_catch_up = max_catch_up
+        self.next_run = 0.0
+        self.triggered = False
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.last_duration = 0.0
+        self.max_lateness = 0.0
+
+    def stats(self):
+        return {
+            "interval": self.interval,
+            "policy": self.policy,
+            "runs": self.runs,
+            "failures": self.failures,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "last_duration": round(self.last_duration, 3),
+            "max_lateness": round(self.max_lateness, 3)
+        }
+
+
+class Scheduler:
+    """단조 시계 기반 다중 주기 스케줄러
+
+    작업마다 주기가 다르고(시세 수 초, 뉴스 수 분, 공포탐욕지수 하루 등),
+    trigger()로 예정 시각 전에 즉시 실행할 수도 있다. 벽시계 정렬(align)을
+    쓰면 첫 실행을 분/시 경계(+offset)에 맞춰 캔들 마감 직후에 돌릴 수 있다.
+    """
+
+    def __init__(self, clock=time.monotonic, wall_clock=time.time):
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.tasks = {}
+        self._cond = threading.Condition()
+        self._stopped = False
+
+    def add(self, name, func, interval, policy="skip", background=False, align=False, offset=0.0,
+            run_immediately=True, max_catch_up=3):
+        """작업 등록 (interval 초 주기)"""
+        task = ScheduledTask(name, func, interval, policy, background, max_catch_up)
+        now = self.clock()
+        if align:
+            wall = self.wall_clock()
+            next_wall = (math.floor((wall - offset) / interval) + 1) * interval + offset
+            task.next_run = now + (next_wall - wall)
+        else:
+            task.next_run = now if run_immediately else now + interval
+        with self._cond:
+            self.tasks[name] = task
+            self._cond.notify_all()
+        return task
+
+    def trigger(self, name):
+        """예정 시각과 관계없이 다음 루프에서 즉시 실행"""
+        with self._cond:
+            task = self.tasks.get(name)
+            if task is not None:
+                task.triggered = True
+                self._cond.notify_all()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def wait_idle(self, name, timeout=None):
+        """작업이 실행 중이면 끝날 때까지 대기 (끝났거나 실행 중이 아니면 True)"""
+        deadline = None if timeout is None else self.clock() + timeout
+        with self._cond:
+            task = self.tasks.get(name)
+            while task is not None and task.running:
+                remaining = None if deadline is None else deadline - self.clock()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def stats(self):
+        with self._cond:
+            return {name: task.stats() for name, task in self.tasks.items()}
+
+    def _due(self, now):
+        # 실행 중인 백그라운드 작업은 끝난 뒤 overrun 처리하므로 제외
+        return [
+            task for task in self.tasks.values()
+            if not task.running and (task.triggered or task.next_run <= now)
+        ]
+
+    def run_pending(self):
+        """실행 시각이 된 작업 실행 (실행한 작업 수 반환)"""
+        with self._cond:
+            due = sorted(self._due(self.clock()), key=lambda t: (not t.triggered, t.next_run))
+        for task in due:
+            self._dispatch(task)
+        return len(due)
+
+    def run(self):
+        """stop()까지 예정 시각마다 작업 실행 (호출한 스레드에서 동작)"""
+        with self._cond:
+            self._stopped = False
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    now = self.clock()
+                    if self._due(now):
+                        break
+                    idle = [t.next_run for t in self.tasks.values() if not t.running]
+                    timeout = min(idle) - now if idle else None
+                    self._cond.wait(timeout)
+                if self._stopped:
+                    return
+            self.run_pending()
+
+    def _dispatch(self, task):
+        now = self.clock()
+        with self._cond:
+            if task.running:
+                return
+            triggered = task.triggered
+            task.triggered = False
+            task.running = True
+
+        if not triggered:
+            task.max_lateness = max(task.max_lateness, now - task.next_run)
+
+        if task.background:
+            threading.Thread(
+                target=self._execute, args=(task, triggered), name=f"task-{task.name}", daemon=True
+            ).start()
+        else:
+            self._execute(task, triggered)
+
+    def _execute(self, task, triggered):
+        started = self.clock()
+        try:
+            task.func()
+        except Exception as e:
+            task.failures += 1
+            print(f"[ERROR] 예약 작업 실패 ({task.name}): {e}")
+        finally:
+            finished = self.clock()
+            with self._cond:
+                task.runs += 1
+                task.running = False
+                task.last_duration = finished - started
+                if triggered:
+                    # 즉시 실행은 현재 회차를 대신하므로 주기 기준점을 다시 잡음
+                    task.next_run = started + task.interval
+                else:
+                    self._advance(task, finished)
+                self._cond.notify_all()
+
+    def _advance(self, task, now):
+        """다음 예정 시각 계산 (overrun 정책 적용)"""
+        next_run = task.next_run + task.interval
+        if next_run > now:
+            task.next_run = next_run
+            return
+
+        task.overruns += 1
+        missed = int((now - next_run) // task.interval) + 1
+        print(f"[WARNING] 예약 작업 지연 ({task.name}): 실행 {task.last_duration:.1f}초로 {missed}회차 초과 ({task.policy})")
+        if task.policy == "catch_up":
+            # 놓친 회차는 바로 이어서 실행하되 너무 밀리면 나머지는 버림
+            extra = max(0, missed - task.max_catch_up)
+            task.skipped += extra
+            task.next_run = next_run + extra * task.interval
+        else:
+            task.skipped += missed
+            task.next_run = next_run + missed * task.interval
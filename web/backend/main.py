@@ -5,7 +5,7 @@ import json
 import os
 import glob
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 import asyncio
 from pathlib import Path
 
@@ -50,24 +50,69 @@ def get_log_files(log_type: str, days: int = 30) -> List[str]:
     files = []
     for i in range(days):
         date = (datetime.now() - timedelta(days=i)).strftime("%Y%m%d")
-        file_pattern = f"{log_type}_{date}.json"
-        file_path = log_dir / file_pattern
-        if file_path.exists():
-            files.append(str(file_path))
+        # JSON Lines (current) and JSON array files written before the bot was upgraded
+        for extension in ("jsonl", "json"):
+            file_path = log_dir / f"{log_type}_{date}.{extension}"
+            if file_path.exists():
+                files.append(str(file_path))
     
     return files
 
+def iter_log_records(file_path: str) -> Iterator[Dict]:
+    """Stream records from a log file, either JSON Lines or a legacy JSON array"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        if first == '[':
+            logs = json.load(f)
+            for record in logs if isinstance(logs, list) else [logs]:
+                yield record
+            return
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # The bot may be in the middle of appending this line
+                continue
+
+def read_last_record(file_path: str, block_size: int = 8192) -> Optional[Dict]:
+    """Read only the last record of a JSON Lines file (falls back to a full read for legacy files)"""
+    if not file_path.endswith(".jsonl"):
+        last = None
+        for record in iter_log_records(file_path):
+            last = record
+        return last
+    
+    with open(file_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+            lines = [line for line in data.split(b"\n") if line.strip()]
+            # The first line may be cut off unless we reached the start of the file
+            candidates = lines if position == 0 else lines[1:]
+            for line in reversed(candidates):
+                try:
+                    return json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+    return None
+
 def load_json_logs(file_paths: List[str]) -> List[Dict]:
-    """Load and combine JSON log files"""
+    """Load and combine log files"""
     all_logs = []
     for file_path in file_paths:
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                logs = json.load(f)
-                if isinstance(logs, list):
-                    all_logs.extend(logs)
-                else:
-                    all_logs.append(logs)
+            all_logs.extend(iter_log_records(file_path))
         except Exception as e:
             print(f"Error loading {file_path}: {e}")
     
@@ -119,9 +164,8 @@ async def get_current_portfolio():
         # For now, return latest analysis data
         analysis_files = get_log_files("analysis", 1)
         if analysis_files:
-            latest_analysis = load_json_logs(analysis_files)
-            if latest_analysis:
-                latest = latest_analysis[-1]
+            latest = read_last_record(analysis_files[0])
+            if latest:
                 return {
                     "total_asset": latest.get('total_asset', 0),
                     "current_price": latest.get('current_price', 0),
@@ -198,7 +242,7 @@ async def debug_logs():
         "cwd": str(Path.cwd()),
         "log_dir": str(log_dir),
         "exists": log_dir.exists(),
-        "files": [str(f) for f in log_dir.glob("*.json")] if log_dir.exists() else []
+        "files": [str(f) for f in log_dir.glob("*.json*")] if log_dir.exists() else []
     }
     
     if log_dir.exists():